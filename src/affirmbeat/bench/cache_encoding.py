@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from affirmbeat.core.cache import CACHE_ENCODINGS, read_encoded, write_encoded
+from affirmbeat.providers.music_placeholder import PlaceholderMusicProvider
+from affirmbeat.providers.tts_dummy import DummyTTSProvider
+
+
+def _sample_audio(kind: str, sample_rate: int, duration_sec: float) -> np.ndarray:
+    if kind == "tts":
+        text = " ".join(["calm"] * max(1, int(duration_sec / 0.35)))
+        return DummyTTSProvider(sample_rate).synthesize(text, None, {"rate": 1.0})
+    return PlaceholderMusicProvider(sample_rate).generate("", duration_sec, 0, None)
+
+
+def _best_of(repeats: int, func) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_cache_encoding_benchmark(
+    sample_rate: int = 48_000,
+    tts_sec: float = 3.0,
+    music_sec: float = 30.0,
+    repeats: int = 5,
+    workdir: Path | None = None,
+) -> dict[str, Any]:
+    samples = {
+        "tts": _sample_audio("tts", sample_rate, tts_sec),
+        "music": _sample_audio("music", sample_rate, music_sec),
+    }
+    results: dict[str, Any] = {
+        "sample_rate": sample_rate,
+        "repeats": repeats,
+        "entries": {},
+    }
+    with tempfile.TemporaryDirectory(dir=workdir) as tmpdir:
+        root = Path(tmpdir)
+        for kind, audio in samples.items():
+            rows: dict[str, Any] = {}
+            for encoding in CACHE_ENCODINGS:
+                path = root / f"{kind}.{encoding}"
+                write_sec = _best_of(repeats, lambda: write_encoded(path, audio, sample_rate))
+                # "load" is the time until an array is usable; "touch" forces every
+                # sample into memory, which is what a memory-mapped read defers.
+                load_sec = _best_of(repeats, lambda: read_encoded(path))
+                touch_sec = _best_of(repeats, lambda: float(np.asarray(read_encoded(path)).sum()))
+                rows[encoding] = {
+                    "bytes": path.stat().st_size,
+                    "write_sec": write_sec,
+                    "load_sec": load_sec,
+                    "load_and_touch_sec": touch_sec,
+                }
+            results["entries"][kind] = {
+                "frames": int(audio.shape[0]),
+                "channels": 1 if audio.ndim == 1 else int(audio.shape[1]),
+                "float32_bytes": int(audio.astype(np.float32).nbytes),
+                "encodings": rows,
+            }
+    return results
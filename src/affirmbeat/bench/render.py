@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+from affirmbeat import __version__
+from affirmbeat.core.paths import cache_dir
+from affirmbeat.core.project import (
+    Affirmation,
+    MusicConfig,
+    Project,
+    RenderConfig,
+    ScriptConfig,
+    TTSConfig,
+    VoiceTrack,
+)
+
+# Synthetic sessions covering the common shapes: one voice, a dense overlap
+# mode, and a long multi-track session over a looped music file. Durations
+# are in seconds and scaled by ``scale``.
+REFERENCE_PROJECTS: dict[str, dict[str, Any]] = {
+    "single_10min": {
+        "duration_sec": 600,
+        "mode": "single",
+        "voice_tracks": 0,
+        "music": "placeholder",
+        "streaming": False,
+    },
+    "triple_stack_30min": {
+        "duration_sec": 1800,
+        "mode": "triple_stack",
+        "voice_tracks": 0,
+        "music": "placeholder",
+        "streaming": False,
+    },
+    "multitrack_2h_file_music": {
+        "duration_sec": 7200,
+        "mode": "lead_whisper",
+        "voice_tracks": 3,
+        "music": "file",
+        "streaming": True,
+    },
+}
+
+_LINES = [
+    "I am calm and steady.",
+    "I breathe in slowly and let go.",
+    "My mind is clear and focused.",
+    "I welcome rest and quiet.",
+    "I trust myself to grow.",
+    "Every breath brings me back to the present.",
+]
+# Dummy TTS speaks 0.35 s per word.
+_SEC_PER_WORD = 0.35
+_MUSIC_FILE_SEC = 45.0
+_MUSIC_FILE_RATE = 44_100
+
+
+def _lines_for(duration_sec: float, repeat_each: int, gap_ms: int) -> list[str]:
+    average = sum(len(line.split()) for line in _LINES) / len(_LINES) * _SEC_PER_WORD
+    per_line = (average + gap_ms / 1000.0) * repeat_each
+    count = max(1, math.ceil(duration_sec / per_line))
+    return [f"{_LINES[i % len(_LINES)]} ({i})" for i in range(count)]
+
+
+def _write_music_file(path: Path) -> None:
+    # A gently modulated noise bed at 44.1 kHz so the file provider resamples.
+    rng = np.random.default_rng(0)
+    frames = int(_MUSIC_FILE_SEC * _MUSIC_FILE_RATE)
+    t = np.arange(frames) / _MUSIC_FILE_RATE
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 0.1 * t)
+    audio = rng.standard_normal((frames, 2)) * 0.05 * envelope[:, None]
+    sf.write(path, audio.astype(np.float32), _MUSIC_FILE_RATE)
+
+
+def reference_project(
+    name: str,
+    root: Path,
+    scale: float = 1.0,
+    sample_rate: int = 48_000,
+    streaming: bool | None = None,
+) -> Project:
+    spec = REFERENCE_PROJECTS[name]
+    # Project durations are whole seconds.
+    duration_sec = max(1, round(spec["duration_sec"] * scale))
+    script = ScriptConfig(mode=spec["mode"], repeat_each=2, gap_ms=600)
+    affirmations: list[Affirmation] = []
+    voice_tracks: list[VoiceTrack] = []
+    if spec["voice_tracks"]:
+        for index in range(spec["voice_tracks"]):
+            voice_tracks.append(
+                VoiceTrack(
+                    id=f"voice{index + 1}",
+                    lines=_lines_for(duration_sec, script.repeat_each, script.gap_ms),
+                    pan=(index - (spec["voice_tracks"] - 1) / 2) * 0.4,
+                    start_offset_ms=index * 1500,
+                )
+            )
+    else:
+        lines = _lines_for(duration_sec, script.repeat_each, script.gap_ms)
+        affirmations = [Affirmation(id=f"a{i}", text=line) for i, line in enumerate(lines)]
+    if spec["music"] == "file":
+        music_path = root / "music.wav"
+        _write_music_file(music_path)
+        # Crossfaded chunks keep the bed streamable; "single" would make the
+        # whole session one chunk, loaded in full.
+        music = MusicConfig(provider="file", prompt=str(music_path), build_mode="loop_crossfade")
+    else:
+        music = MusicConfig(provider="placeholder", chunk_sec=30)
+    return Project(
+        project_id=f"bench-{name}",
+        sample_rate=sample_rate,
+        duration_sec=duration_sec,
+        affirmations=affirmations,
+        voice_tracks=voice_tracks,
+        script=script,
+        tts=TTSConfig(provider="dummy"),
+        music=music,
+        render=RenderConfig(streaming=spec["streaming"] if streaming is None else streaming),
+    )
+
+
+def _bytes_under(path: Path) -> tuple[int, int]:
+    if not path.exists():
+        return 0, 0
+    sizes = [item.stat().st_size for item in path.rglob("*") if item.is_file()]
+    return sum(sizes), len(sizes)
+
+
+def _peak_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def measure_render(project_path: Path) -> dict[str, Any]:
+    from affirmbeat.render.renderer import render_project
+
+    started = time.perf_counter()
+    output = render_project(project_path)
+    wall_sec = time.perf_counter() - started
+    report = json.loads((output / "render_report.json").read_text())
+    output_bytes, output_files = _bytes_under(output)
+    cache_bytes, cache_files = _bytes_under(cache_dir(project_path))
+    return {
+        "wall_sec": wall_sec,
+        "stages": report.get("timings", {}),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "bytes_written": output_bytes + cache_bytes,
+        "output_bytes": output_bytes,
+        "output_files": output_files,
+        "cache_bytes": cache_bytes,
+        "cache_files": cache_files,
+    }
+
+
+def run_render_benchmark(
+    names: list[str] | None = None,
+    scale: float = 1.0,
+    sample_rate: int = 48_000,
+    streaming: bool | None = None,
+    workdir: Path | None = None,
+) -> dict[str, Any]:
+    names = names or list(REFERENCE_PROJECTS)
+    unknown = [name for name in names if name not in REFERENCE_PROJECTS]
+    if unknown:
+        raise ValueError(
+            f"Unknown reference project(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(REFERENCE_PROJECTS)}."
+        )
+    results: dict[str, Any] = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "sample_rate": sample_rate,
+        "projects": {},
+    }
+    for name in names:
+        with tempfile.TemporaryDirectory(dir=workdir) as tmpdir:
+            root = Path(tmpdir)
+            project = reference_project(name, root, scale, sample_rate, streaming)
+            project_path = root / "project.json"
+            project_path.write_text(json.dumps(project.model_dump(), indent=2), encoding="utf-8")
+            # Each render runs in a fresh interpreter with a cold cache so peak
+            # RSS belongs to that project alone.
+            completed = subprocess.run(
+                [sys.executable, "-m", "affirmbeat.bench.render", str(project_path)],
+                capture_output=True,
+                text=True,
+                env={**os.environ, "AFFIRMBEAT_CACHE_DIR": str(root / "cache")},
+            )
+            if completed.returncode != 0:
+                raise RuntimeError(f"Benchmark render of {name} failed:\n{completed.stderr}")
+            measured = json.loads(completed.stdout.strip().splitlines()[-1])
+        results["projects"][name] = {
+            "duration_sec": project.duration_sec,
+            "mode": project.script.mode,
+            "voice_tracks": len(project.voice_tracks),
+            "music": project.music.provider,
+            "streaming": project.render.streaming,
+            **measured,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(measure_render(Path(sys.argv[1]))))
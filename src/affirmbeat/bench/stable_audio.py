@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from affirmbeat.providers.music_stable_audio import StableAudioOpenProvider, acquire_stable_audio_model
+
+BASE_SETTINGS: list[dict[str, Any]] = [
+    {"name": "baseline", "inference_mode": False, "precision": "fp32", "compile": False},
+    {"name": "inference_mode", "inference_mode": True, "precision": "fp32", "compile": False},
+    {"name": "bf16", "inference_mode": True, "precision": "bf16", "compile": False},
+    {"name": "compile", "inference_mode": True, "precision": "fp32", "compile": True},
+]
+
+
+def benchmark_settings(threads: list[int] | None = None) -> list[dict[str, Any]]:
+    settings = [dict(setting, torch_threads=None) for setting in BASE_SETTINGS]
+    for count in threads or []:
+        settings.append(
+            {
+                "name": f"inference_mode_threads_{count}",
+                "inference_mode": True,
+                "precision": "fp32",
+                "compile": False,
+                "torch_threads": count,
+            }
+        )
+    return settings
+
+
+def _model_sample_rate(config: Any) -> int:
+    # Render at the model's own rate so resampling doesn't skew the timings.
+    if isinstance(config, dict):
+        return int(config.get("sample_rate", 44_100))
+    return int(getattr(config, "sample_rate", 44_100))
+
+
+def run_stable_audio_benchmark(
+    model_id: str = "stabilityai/stable-audio-open-1.0",
+    device: str | None = None,
+    duration_sec: float = 10.0,
+    steps: int = 20,
+    repeats: int = 1,
+    threads: list[int] | None = None,
+    settings: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    loaded = acquire_stable_audio_model(model_id, device)
+    results: dict[str, Any] = {
+        "model_id": model_id,
+        "device": loaded.device,
+        "duration_sec": duration_sec,
+        "steps": steps,
+        "repeats": repeats,
+        "settings": [],
+    }
+    for setting in settings or benchmark_settings(threads):
+        options = {key: value for key, value in setting.items() if key != "name"}
+        provider = StableAudioOpenProvider(
+            _model_sample_rate(loaded.config),
+            model_id=model_id,
+            device=device,
+            steps=steps,
+            **options,
+        )
+        # The first call includes one-off costs (compilation, kernel selection)
+        # and is reported separately from the steady-state timings.
+        started = time.perf_counter()
+        provider.generate("ambient pad", duration_sec, 0, None)
+        first_call_sec = time.perf_counter() - started
+        best = first_call_sec
+        for seed in range(1, max(1, repeats) + 1):
+            started = time.perf_counter()
+            provider.generate("ambient pad", duration_sec, seed, None)
+            best = min(best, time.perf_counter() - started)
+        results["settings"].append(
+            {
+                "name": setting.get("name", "custom"),
+                **options,
+                "first_call_sec": first_call_sec,
+                "best_sec": best,
+                "audio_sec_per_sec": duration_sec / best if best > 0 else None,
+            }
+        )
+    return results
@@ -6,11 +6,18 @@ import uuid
 
 import typer
 
+from affirmbeat.core.cache import CACHE_POLICIES, open_cache
 from affirmbeat.core.project import Affirmation, Project, TextGenConfig, VoiceTrack
+from affirmbeat.render.export import EXPORT_CONTAINERS, EXPORT_SUBTYPES
 from affirmbeat.render.renderer import render_project
+from affirmbeat.render.timing import TRACE_FORMATS
 from affirmbeat.script.textgen import generate_tracks
 
 app = typer.Typer(help="AffirmBeat Studio CLI")
+cache_app = typer.Typer(help="Inspect and maintain the TTS/music render cache.")
+app.add_typer(cache_app, name="cache")
+bench_app = typer.Typer(help="Performance benchmarks.")
+app.add_typer(bench_app, name="bench")
 SUPPORTED_MODES = ("single", "triple_stack", "lead_whisper", "call_response")
 
 
@@ -313,7 +320,214 @@ def generate_tracks_cmd(
 
 
 @app.command()
-def render(project_path: Path) -> None:
-    """Render project to WAV outputs."""
-    output = render_project(project_path)
+def render(
+    project_path: Path,
+    streaming: bool | None = typer.Option(
+        None,
+        "--streaming/--in-memory",
+        help="Render in fixed-size blocks instead of holding the session in RAM.",
+    ),
+    block_sec: float | None = typer.Option(None, "--block-sec", help="Streaming block size in seconds."),
+    tts_workers: int | None = typer.Option(
+        None,
+        "--tts-workers",
+        min=1,
+        help="Parallel TTS synthesis jobs for cache misses.",
+    ),
+    music_workers: int | None = typer.Option(
+        None,
+        "--music-workers",
+        min=1,
+        help="Parallel music chunk generation and prefetch jobs.",
+    ),
+    profile_memory: bool | None = typer.Option(
+        None,
+        "--profile-memory/--no-profile-memory",
+        help="Record peak traced memory per stage (slower).",
+    ),
+    trace: str | None = typer.Option(
+        None,
+        "--trace",
+        help="Also write a span trace: chrome (render_trace.json) or jsonl.",
+    ),
+    audio_format: str | None = typer.Option(
+        None,
+        "--format",
+        help="Output container: wav, flac, ogg (Vorbis) or opus.",
+    ),
+    subtype: str | None = typer.Option(
+        None,
+        "--subtype",
+        help="Sample format for wav/flac: PCM_16, PCM_24 or FLOAT (wav only).",
+    ),
+    stems: str | None = typer.Option(
+        None,
+        "--stems",
+        help="Stems to write: all, none, or a comma-separated list of track ids/music/binaural.",
+    ),
+) -> None:
+    """Render project to audio outputs."""
+    if trace is not None and trace not in TRACE_FORMATS:
+        raise typer.BadParameter(f"--trace must be one of: {', '.join(TRACE_FORMATS)}.")
+    if audio_format is not None and audio_format not in EXPORT_CONTAINERS:
+        raise typer.BadParameter(f"--format must be one of: {', '.join(EXPORT_CONTAINERS)}.")
+    if subtype is not None and subtype not in EXPORT_SUBTYPES:
+        raise typer.BadParameter(f"--subtype must be one of: {', '.join(EXPORT_SUBTYPES)}.")
+    stem_selection: str | list[str] | None = stems
+    if stems is not None and stems not in ("all", "none"):
+        stem_selection = [name.strip() for name in stems.split(",") if name.strip()]
+    output = render_project(
+        project_path,
+        streaming=streaming,
+        block_sec=block_sec,
+        tts_workers=tts_workers,
+        music_workers=music_workers,
+        profile_memory=profile_memory,
+        trace=trace,
+        audio_format=audio_format,
+        subtype=subtype,
+        stems=stem_selection,
+    )
     typer.echo(f"Rendered to {output}")
+
+
+def _open_project_cache(project_path: Path, max_mb: float | None = None, policy: str | None = None):
+    project = Project.model_validate(json.loads(project_path.read_text()))
+    if max_mb is not None:
+        project.cache.max_mb = max_mb
+    if policy is not None:
+        if policy not in CACHE_POLICIES:
+            raise typer.BadParameter(f"policy must be one of: {', '.join(CACHE_POLICIES)}.")
+        project.cache.policy = policy
+    return open_cache(project, project_path)
+
+
+@cache_app.command("stats")
+def cache_stats(project_path: Path) -> None:
+    """Show cache size, entry counts and budget."""
+    cache = _open_project_cache(project_path)
+    typer.echo(json.dumps(cache.stats(), indent=2))
+
+
+@cache_app.command("prune")
+def cache_prune(
+    project_path: Path,
+    max_mb: float | None = typer.Option(None, "--max-mb", help="Budget to prune down to (defaults to cache.max_mb)."),
+    policy: str | None = typer.Option(None, "--policy", help="Eviction policy: lru or lfu."),
+) -> None:
+    """Evict cache entries until the cache fits its byte budget."""
+    cache = _open_project_cache(project_path, max_mb=max_mb, policy=policy)
+    if cache.max_bytes is None:
+        raise typer.BadParameter("Set cache.max_mb in the project or pass --max-mb.")
+    result = cache.prune()
+    cache.flush()
+    typer.echo(
+        f"Evicted {result['evicted']} entries ({result['freed_bytes']} bytes); "
+        f"{cache.total_bytes()} bytes remain."
+    )
+
+
+@cache_app.command("verify")
+def cache_verify(
+    project_path: Path,
+    fix: bool = typer.Option(False, "--fix", help="Drop missing/corrupt entries and index orphan files."),
+) -> None:
+    """Check cache files against the index."""
+    cache = _open_project_cache(project_path)
+    result = cache.verify(fix=fix)
+    for label, entries in result.items():
+        typer.echo(f"{label}: {len(entries)}")
+        for entry_id in entries:
+            typer.echo(f"  {entry_id}")
+    if not fix and (result["missing"] or result["corrupt"]):
+        raise typer.Exit(code=1)
+
+
+def _emit_json(result: dict, output: Path | None) -> None:
+    payload = json.dumps(result, indent=2)
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(payload)
+        typer.echo(f"Wrote {output}")
+    else:
+        typer.echo(payload)
+
+
+@bench_app.command("cache-encoding")
+def bench_cache_encoding(
+    sample_rate: int = typer.Option(48_000, "--sample-rate"),
+    tts_sec: float = typer.Option(3.0, "--tts-sec", help="Length of the synthetic TTS line."),
+    music_sec: float = typer.Option(30.0, "--music-sec", help="Length of the synthetic music chunk."),
+    repeats: int = typer.Option(5, "--repeats", min=1),
+    output: Path | None = typer.Option(None, "--output", help="Write results JSON here."),
+) -> None:
+    """Compare size and load time of the wav/flac/npy cache encodings."""
+    from affirmbeat.bench.cache_encoding import run_cache_encoding_benchmark
+
+    result = run_cache_encoding_benchmark(
+        sample_rate=sample_rate,
+        tts_sec=tts_sec,
+        music_sec=music_sec,
+        repeats=repeats,
+    )
+    _emit_json(result, output)
+
+
+@bench_app.command("render")
+def bench_render(
+    projects: str = typer.Option(
+        "",
+        "--projects",
+        help="Comma-separated reference projects (default: all).",
+    ),
+    scale: float = typer.Option(1.0, "--scale", min=0.0, help="Multiply reference durations."),
+    sample_rate: int = typer.Option(48_000, "--sample-rate"),
+    streaming: bool | None = typer.Option(
+        None,
+        "--streaming/--in-memory",
+        help="Override each reference project's render mode.",
+    ),
+    output: Path | None = typer.Option(None, "--output", help="Write results JSON here."),
+) -> None:
+    """Render the synthetic reference projects and report per-stage timings."""
+    from affirmbeat.bench.render import run_render_benchmark
+
+    names = [name.strip() for name in projects.split(",") if name.strip()]
+    try:
+        result = run_render_benchmark(
+            names=names or None,
+            scale=scale,
+            sample_rate=sample_rate,
+            streaming=streaming,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    _emit_json(result, output)
+
+
+@bench_app.command("stable-audio")
+def bench_stable_audio(
+    model_id: str = typer.Option("stabilityai/stable-audio-open-1.0", "--model-id"),
+    device: str | None = typer.Option(None, "--device"),
+    duration_sec: float = typer.Option(10.0, "--duration-sec", help="Length of each generated clip."),
+    steps: int = typer.Option(20, "--steps", min=1),
+    repeats: int = typer.Option(1, "--repeats", min=1),
+    threads: str = typer.Option("", "--threads", help="Comma-separated torch thread counts to compare."),
+    output: Path | None = typer.Option(None, "--output", help="Write results JSON here."),
+) -> None:
+    """Compare Stable Audio Open throughput across torch CPU settings."""
+    from affirmbeat.bench.stable_audio import run_stable_audio_benchmark
+
+    try:
+        thread_counts = [int(value) for value in threads.split(",") if value.strip()]
+    except ValueError as exc:
+        raise typer.BadParameter("--threads must be a comma-separated list of integers.") from exc
+    result = run_stable_audio_benchmark(
+        model_id=model_id,
+        device=device,
+        duration_sec=duration_sec,
+        steps=steps,
+        repeats=repeats,
+        threads=thread_counts,
+    )
+    _emit_json(result, output)
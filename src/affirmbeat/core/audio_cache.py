@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class AudioLRUCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def put(self, key: str, audio: np.ndarray) -> np.ndarray:
+        # Entries are shared between clips (and renders), so freeze them.
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        audio.setflags(write=False)
+        if audio.nbytes > self.max_bytes:
+            return audio
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous.nbytes
+            self._entries[key] = audio
+            self.bytes += audio.nbytes
+            while self.bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+        return audio
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_PROCESS_CACHE: AudioLRUCache | None = None
+_PROCESS_CACHE_LOCK = threading.Lock()
+
+
+def process_audio_cache(max_bytes: int = 512 * 1024 * 1024) -> AudioLRUCache:
+    global _PROCESS_CACHE
+    with _PROCESS_CACHE_LOCK:
+        if _PROCESS_CACHE is None:
+            _PROCESS_CACHE = AudioLRUCache(max_bytes)
+        return _PROCESS_CACHE
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+from affirmbeat.core.paths import cache_dir
+from affirmbeat.core.project import Project
+
+INDEX_NAME = "index.json"
+CACHE_POLICIES = ("lru", "lfu")
+CACHE_ENCODINGS = ("wav", "flac", "npy")
+_AUDIO_SUFFIXES = {".wav", ".flac", ".npy"}
+
+
+def write_encoded(path: Path, audio: np.ndarray, sample_rate: int) -> None:
+    if path.suffix == ".npy":
+        np.save(path, np.ascontiguousarray(audio, dtype=np.float32))
+    elif path.suffix == ".flac":
+        sf.write(path, audio, sample_rate, format="FLAC", subtype="PCM_16")
+    else:
+        sf.write(path, audio, sample_rate)
+
+
+def read_encoded(path: Path) -> np.ndarray:
+    if path.suffix == ".npy":
+        # Memory-mapped and read-only: large music chunks are paged in lazily.
+        return np.load(path, mmap_mode="r")
+    audio, _ = sf.read(path, dtype="float32")
+    return audio
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CacheStore:
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int | None = None,
+        policy: str = "lru",
+        encoding: str = "wav",
+    ) -> None:
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy {policy!r}. Supported: {', '.join(CACHE_POLICIES)}.")
+        if encoding not in CACHE_ENCODINGS:
+            raise ValueError(f"Unknown cache encoding {encoding!r}. Supported: {', '.join(CACHE_ENCODINGS)}.")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.encoding = encoding
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._touched: set[str] = set()
+        self._removed: set[str] = set()
+        self._entries: dict[str, dict[str, Any]] = self._load_index()
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_NAME
+
+    def _read_index_file(self) -> dict[str, dict[str, Any]] | None:
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        entries = data.get("entries") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else None
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        entries = self._read_index_file()
+        if entries is not None:
+            return entries
+        # No index yet: adopt whatever an older version left on disk.
+        return {entry_id: entry for entry_id, entry in self._scan_files()}
+
+    def _scan_files(self) -> list[tuple[str, dict[str, Any]]]:
+        found: list[tuple[str, dict[str, Any]]] = []
+        if not self.root.exists():
+            return found
+        for namespace_dir in sorted(p for p in self.root.iterdir() if p.is_dir()):
+            for path in sorted(namespace_dir.iterdir()):
+                if not path.is_file() or path.suffix not in _AUDIO_SUFFIXES:
+                    continue
+                stat = path.stat()
+                entry_id = f"{namespace_dir.name}/{path.stem}"
+                found.append(
+                    (
+                        entry_id,
+                        {
+                            "file": f"{namespace_dir.name}/{path.name}",
+                            "size": stat.st_size,
+                            "created": stat.st_mtime,
+                            "last_access": stat.st_mtime,
+                            "hits": 0,
+                        },
+                    )
+                )
+        return found
+
+    def contains(self, namespace: str, key: str) -> str | None:
+        entry_id = f"{namespace}/{key}"
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return None
+            # Reserved for the running render so budget pruning leaves it alone.
+            self._touched.add(entry_id)
+            return Path(entry["file"]).name
+
+    def touch(self, namespace: str, key: str) -> Path | None:
+        # Records a use of an entry the caller already holds in memory, so
+        # eviction order and the running render's protection stay accurate
+        # without reading the file.
+        entry_id = f"{namespace}/{key}"
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return None
+            entry["last_access"] = time.time()
+            entry["hits"] = int(entry.get("hits", 0)) + 1
+            self._touched.add(entry_id)
+            return self.root / entry["file"]
+
+    def lookup(self, namespace: str, key: str) -> Path | None:
+        entry_id = f"{namespace}/{key}"
+        with self._lock:
+            if self.touch(namespace, key) is None:
+                self.misses += 1
+                return None
+            entry = self._entries[entry_id]
+            self.hits += 1
+            self.bytes_read += int(entry.get("size", 0))
+            return self.root / entry["file"]
+
+    def read_audio(self, namespace: str, key: str) -> tuple[np.ndarray, str] | None:
+        path = self.lookup(namespace, key)
+        if path is None:
+            return None
+        try:
+            audio = read_encoded(path)
+        except Exception:
+            # The index pointed at a file that vanished or is corrupt.
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            self.remove(namespace, key)
+            return None
+        return audio, path.name
+
+    def write_audio(self, namespace: str, key: str, audio: np.ndarray, sample_rate: int) -> Path:
+        relative = f"{namespace}/{key}.{self.encoding}"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            previous = self._entries.get(f"{namespace}/{key}")
+        write_encoded(path, audio, sample_rate)
+        if previous is not None and previous["file"] != relative:
+            (self.root / previous["file"]).unlink(missing_ok=True)
+        self._record(f"{namespace}/{key}", relative, path)
+        return path
+
+    def entry_path(self, namespace: str, key: str, suffix: str) -> Path:
+        path = self.root / namespace / f"{key}{suffix}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def record_file(self, namespace: str, key: str, path: Path, digest: bool = True) -> None:
+        # For entries written in place (e.g. streamed to disk block by block)
+        # rather than through write_audio. Without ``digest`` the entry is not
+        # hashed, which saves a full re-read of large files; verify() then only
+        # checks its size.
+        self._record(f"{namespace}/{key}", path.relative_to(self.root).as_posix(), path, digest)
+
+    def _record(self, entry_id: str, relative: str, path: Path, digest: bool = True) -> None:
+        size = path.stat().st_size
+        now = time.time()
+        with self._lock:
+            self._entries[entry_id] = {
+                "file": relative,
+                "size": size,
+                "created": now,
+                "last_access": now,
+                "hits": 0,
+                "sha256": _file_digest(path) if digest else None,
+            }
+            self._removed.discard(entry_id)
+            self._touched.add(entry_id)
+            self.bytes_written += size
+        if self.max_bytes is not None:
+            self.prune(self.max_bytes, protect_touched=True)
+
+    def remove(self, namespace: str, key: str) -> None:
+        self._remove_entry(f"{namespace}/{key}")
+
+    def _remove_entry(self, entry_id: str) -> int:
+        with self._lock:
+            entry = self._entries.pop(entry_id, None)
+            self._removed.add(entry_id)
+            self._touched.discard(entry_id)
+        if entry is None:
+            return 0
+        (self.root / entry["file"]).unlink(missing_ok=True)
+        return int(entry.get("size", 0))
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(int(entry.get("size", 0)) for entry in self._entries.values())
+
+    def _eviction_order(self) -> list[str]:
+        with self._lock:
+            items = list(self._entries.items())
+        if self.policy == "lfu":
+            items.sort(key=lambda item: (int(item[1].get("hits", 0)), float(item[1].get("last_access", 0.0))))
+        else:
+            items.sort(key=lambda item: float(item[1].get("last_access", 0.0)))
+        return [entry_id for entry_id, _ in items]
+
+    def prune(self, max_bytes: int | None = None, protect_touched: bool = False) -> dict[str, int]:
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        evicted = 0
+        freed = 0
+        if budget is None:
+            return {"evicted": 0, "freed_bytes": 0}
+        total = self.total_bytes()
+        for entry_id in self._eviction_order():
+            if total <= budget:
+                break
+            # Entries used by the running render are only evicted by an explicit prune.
+            if protect_touched and entry_id in self._touched:
+                continue
+            size = self._remove_entry(entry_id)
+            total -= size
+            freed += size
+            evicted += 1
+        self.evictions += evicted
+        return {"evicted": evicted, "freed_bytes": freed}
+
+    def verify(self, fix: bool = False) -> dict[str, list[str]]:
+        missing: list[str] = []
+        corrupt: list[str] = []
+        with self._lock:
+            entries = list(self._entries.items())
+        for entry_id, entry in entries:
+            path = self.root / entry["file"]
+            if not path.exists():
+                missing.append(entry_id)
+                continue
+            expected = entry.get("sha256")
+            if path.stat().st_size != entry.get("size") or (expected and _file_digest(path) != expected):
+                corrupt.append(entry_id)
+        known = {entry["file"] for _, entry in entries}
+        orphans = [(entry_id, entry) for entry_id, entry in self._scan_files() if entry["file"] not in known]
+        if fix:
+            for entry_id in missing + corrupt:
+                self._remove_entry(entry_id)
+            with self._lock:
+                for entry_id, entry in orphans:
+                    entry["sha256"] = _file_digest(self.root / entry["file"])
+                    self._entries[entry_id] = entry
+                    self._removed.discard(entry_id)
+            self.flush()
+        return {
+            "missing": missing,
+            "corrupt": corrupt,
+            "orphans": [entry_id for entry_id, _ in orphans],
+        }
+
+    def stats(self) -> dict[str, Any]:
+        namespaces: dict[str, dict[str, int]] = {}
+        with self._lock:
+            for entry_id, entry in self._entries.items():
+                bucket = namespaces.setdefault(entry_id.split("/", 1)[0], {"entries": 0, "bytes": 0})
+                bucket["entries"] += 1
+                bucket["bytes"] += int(entry.get("size", 0))
+            return {
+                "root": str(self.root),
+                "policy": self.policy,
+                "max_bytes": self.max_bytes,
+                "entries": len(self._entries),
+                "bytes": sum(bucket["bytes"] for bucket in namespaces.values()),
+                "namespaces": namespaces,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+                "evictions": self.evictions,
+            }
+
+    def flush(self) -> None:
+        with self._lock:
+            # Merge entries another process added since we loaded the index.
+            on_disk = self._read_index_file() or {}
+            for entry_id, entry in on_disk.items():
+                if entry_id not in self._entries and entry_id not in self._removed:
+                    self._entries[entry_id] = entry
+            payload = json.dumps({"version": 1, "entries": self._entries}, indent=2)
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(payload)
+            os.replace(tmp_path, self.index_path)
+
+
+def open_cache(project: Project, project_path: Path) -> CacheStore:
+    max_bytes = None
+    if project.cache.max_mb is not None:
+        max_bytes = int(project.cache.max_mb * 1024 * 1024)
+    return CacheStore(
+        cache_dir(project_path),
+        max_bytes=max_bytes,
+        policy=project.cache.policy,
+        encoding=project.cache.encoding,
+    )
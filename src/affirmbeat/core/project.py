@@ -28,6 +28,7 @@ class TTSConfig(BaseModel):
     voice: str | None = None
     rate: float = 1.0
     model_path: str | None = None
+    piper_backend: Literal["auto", "python", "server", "subprocess"] = "auto"
 
 
 class VoiceTrack(BaseModel):
@@ -65,6 +66,10 @@ class MusicConfig(BaseModel):
     sigma_min: float | None = None
     sigma_max: float | None = None
     sampler: str | None = None
+    torch_threads: int | None = Field(default=None, ge=1)
+    inference_mode: bool = True
+    precision: Literal["fp32", "bf16"] = "fp32"
+    compile: bool = False
 
     @model_validator(mode="after")
     def validate_crossfade_chunk(self) -> "MusicConfig":
@@ -77,6 +82,14 @@ class MusicConfig(BaseModel):
         return self
 
 
+class BinauralRamp(BaseModel):
+    # Glide linearly from the value in effect at start_sec to the targets.
+    start_sec: float = Field(ge=0)
+    duration_sec: float = Field(default=0.0, ge=0)
+    beat_hz: float | None = None
+    carrier_hz: float | None = None
+
+
 class BinauralConfig(BaseModel):
     enabled: bool = True
     carrier_hz: float = 220.0
@@ -84,11 +97,49 @@ class BinauralConfig(BaseModel):
     gain_db: float = -30.0
     fade_in_ms: int = 10_000
     fade_out_ms: int = 10_000
+    ramps: list[BinauralRamp] = Field(default_factory=list)
 
 
 class MixConfig(BaseModel):
     master_peak_db: float = -1.0
     target_lufs: float | None = None
+    limiter_lookahead_ms: float = Field(default=5.0, ge=0)
+    limiter_release_ms: float = Field(default=100.0, gt=0)
+    true_peak: bool = False
+
+
+class RenderConfig(BaseModel):
+    streaming: bool = False
+    block_sec: float = Field(default=5.0, gt=0)
+    tts_workers: int = Field(default=4, ge=1)
+    music_workers: int = Field(default=2, ge=1)
+    audio_cache_mb: int = Field(default=256, ge=0)
+    reuse_stems: bool = False
+    profile_memory: bool = False
+    trace: Literal["chrome", "jsonl"] | None = None
+
+
+class ExportConfig(BaseModel):
+    format: Literal["wav", "flac", "ogg", "opus"] = "wav"
+    subtype: Literal["PCM_16", "PCM_24", "FLOAT"] | None = None
+    stems: Literal["all", "none"] | list[str] = "all"
+    workers: int = Field(default=4, ge=1)
+
+    @model_validator(mode="after")
+    def validate_subtype(self) -> "ExportConfig":
+        if self.subtype is None:
+            return self
+        if self.format in ("ogg", "opus"):
+            raise ValueError("export.subtype only applies to wav and flac exports")
+        if self.format == "flac" and self.subtype == "FLOAT":
+            raise ValueError("export.subtype must be PCM_16 or PCM_24 for flac exports")
+        return self
+
+
+class CacheConfig(BaseModel):
+    max_mb: float | None = Field(default=None, gt=0)
+    policy: Literal["lru", "lfu"] = "lru"
+    encoding: Literal["wav", "flac", "npy"] = "wav"
 
 
 class Project(BaseModel):
@@ -102,4 +153,7 @@ class Project(BaseModel):
     music: MusicConfig = Field(default_factory=MusicConfig)
     binaural: BinauralConfig = Field(default_factory=BinauralConfig)
     mix: MixConfig = Field(default_factory=MixConfig)
+    render: RenderConfig = Field(default_factory=RenderConfig)
+    export: ExportConfig = Field(default_factory=ExportConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
     textgen: TextGenConfig | None = None
@@ -1,10 +1,185 @@
 from __future__ import annotations
 
+import math
+from typing import Iterable, Protocol
+
 import numpy as np
 
-from affirmbeat.dsp.fades import apply_fade
+from affirmbeat.dsp.fades import fade_envelope
 from affirmbeat.dsp.limiter import db_to_linear
 
+# Frames rendered per internal step, so float64 intermediates stay small even
+# when a whole session is requested at once.
+_STEP_FRAMES = 1 << 16
+
+
+class Ramp(Protocol):
+    start_sec: float
+    duration_sec: float
+    beat_hz: float | None
+    carrier_hz: float | None
+
+
+def _schedule(base: float, ramps: list[Ramp], field: str) -> list[tuple[float, float]]:
+    # Breakpoints (time_sec, hz) of a piecewise-linear frequency curve.
+    points = [(0.0, base)]
+    for ramp in ramps:
+        target = getattr(ramp, field)
+        if target is None:
+            continue
+        start = ramp.start_sec
+        current = _value_at(points, start)
+        points = [point for point in points if point[0] < start]
+        points.append((start, current))
+        points.append((start + ramp.duration_sec, target))
+    return points
+
+
+def _value_at(points: list[tuple[float, float]], time_sec: float, before: bool = False) -> float:
+    # With ``before`` a jump at exactly ``time_sec`` has not happened yet.
+    value = points[0][1]
+    for (t0, v0), (t1, v1) in zip(points, points[1:]):
+        if time_sec < t1 or (before and time_sec <= t1):
+            if t1 <= t0:
+                return v0
+            return v0 + (v1 - v0) * (time_sec - t0) / (t1 - t0)
+        value = v1
+    return value
+
+
+class _Phase:
+    # Phase in cycles of a piecewise-linear frequency curve, given as segment
+    # start times with the frequency at the start and end of each segment (the
+    # last one is held). It is evaluated analytically at any sample so blocks
+    # can be rendered in any order with continuous phase. Cycle counts are
+    # reduced modulo 1 at every breakpoint and at the start of every block,
+    # which keeps float64 exact to well below a microcycle over many hours.
+    def __init__(self, times: list[float], starts: list[float], ends: list[float]) -> None:
+        self._times = np.array(times, dtype=np.float64)
+        self._freqs = np.array(starts, dtype=np.float64)
+        spans = np.diff(self._times)
+        slopes = np.zeros(len(times), dtype=np.float64)
+        moving = spans > 0
+        slopes[:-1][moving] = (np.array(ends[:-1])[moving] - self._freqs[:-1][moving]) / spans[moving]
+        self._slopes = slopes
+        offsets = [0.0]
+        for index, span in enumerate(spans):
+            cycles = self._freqs[index] * span + 0.5 * self._slopes[index] * span * span
+            offsets.append((offsets[-1] + cycles) % 1.0)
+        self._offsets = np.array(offsets, dtype=np.float64)
+
+    def cycles(self, start: int, frames: int, sample_rate: int) -> np.ndarray:
+        output = np.empty(frames, dtype=np.float64)
+        done = 0
+        while done < frames:
+            first = start + done
+            time = first / sample_rate
+            segment = int(np.searchsorted(self._times, time, side="right")) - 1
+            count = frames - done
+            if segment + 1 < self._times.shape[0]:
+                boundary = int(math.ceil(self._times[segment + 1] * sample_rate))
+                count = max(1, min(count, boundary - first))
+            freq = self._freqs[segment]
+            slope = self._slopes[segment]
+            tau = time - self._times[segment]
+            # Exact phase at the first sample, then a short quadratic from
+            # there, whose small arguments keep full precision.
+            origin = (self._offsets[segment] + tau * (freq + 0.5 * slope * tau)) % 1.0
+            rate = freq + slope * tau
+            steps = np.arange(count, dtype=np.float64) / sample_rate
+            part = output[done : done + count]
+            np.multiply(steps, 0.5 * slope, out=part)
+            part += rate
+            part *= steps
+            part += origin
+            done += count
+        return output
+
+
+def _channel_phase(
+    carrier: list[tuple[float, float]],
+    beat: list[tuple[float, float]],
+    sign: float,
+) -> _Phase:
+    times = sorted({t for t, _ in carrier} | {t for t, _ in beat})
+    ends = times[1:] + times[-1:]
+    starts = [_value_at(carrier, t) + sign * _value_at(beat, t) for t in times]
+    stops = [_value_at(carrier, t, True) + sign * _value_at(beat, t, True) for t in ends]
+    return _Phase(times, starts, stops)
+
+
+class BinauralOscillator:
+    # Stereo beat with the left channel at carrier - beat / 2 and the right at
+    # carrier + beat / 2. Both frequencies may follow scheduled ramps.
+    def __init__(
+        self,
+        sample_rate: int,
+        total_samples: int,
+        carrier_hz: float,
+        beat_hz: float,
+        gain_db: float,
+        fade_in_ms: int,
+        fade_out_ms: int,
+        ramps: Iterable[Ramp] = (),
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.total_samples = total_samples
+        ramps = sorted(ramps, key=lambda ramp: ramp.start_sec)
+        carrier = _schedule(carrier_hz, ramps, "carrier_hz")
+        beat = _schedule(beat_hz, ramps, "beat_hz")
+        self._left = _channel_phase(carrier, beat, -0.5)
+        self._right = _channel_phase(carrier, beat, 0.5)
+        self._gain = db_to_linear(gain_db)
+        self._fade_in = int((fade_in_ms / 1000.0) * sample_rate)
+        self._fade_out = int((fade_out_ms / 1000.0) * sample_rate)
+
+    def render(self, start: int, frames: int) -> np.ndarray:
+        frames = max(0, min(frames, self.total_samples - start))
+        output = np.empty((frames, 2), dtype=np.float32)
+        fade_out_start = self.total_samples - self._fade_out
+        for offset in range(0, frames, _STEP_FRAMES):
+            count = min(_STEP_FRAMES, frames - offset)
+            first = start + offset
+            envelope = None
+            if first < self._fade_in or first + count > fade_out_start:
+                envelope = fade_envelope(first, count, self.total_samples, self._fade_in, self._fade_out)
+                envelope *= self._gain
+            for channel, phase in enumerate((self._left, self._right)):
+                wave = phase.cycles(first, count, self.sample_rate)
+                wave *= 2.0 * np.pi
+                np.sin(wave, out=wave)
+                if envelope is None:
+                    wave *= self._gain
+                else:
+                    wave *= envelope
+                output[offset : offset + count, channel] = wave
+        return output
+
+
+def render_binaural_block(
+    start: int,
+    frames: int,
+    total_samples: int,
+    sample_rate: int,
+    carrier_hz: float,
+    beat_hz: float,
+    gain_db: float,
+    fade_in_ms: int,
+    fade_out_ms: int,
+    ramps: Iterable[Ramp] = (),
+) -> np.ndarray:
+    oscillator = BinauralOscillator(
+        sample_rate,
+        total_samples,
+        carrier_hz,
+        beat_hz,
+        gain_db,
+        fade_in_ms,
+        fade_out_ms,
+        ramps,
+    )
+    return oscillator.render(start, frames)
+
 
 def generate_binaural(
     duration_sec: float,
@@ -14,18 +189,18 @@ def generate_binaural(
     gain_db: float,
     fade_in_ms: int,
     fade_out_ms: int,
+    ramps: Iterable[Ramp] = (),
 ) -> np.ndarray:
     total_samples = int(duration_sec * sample_rate)
-    if total_samples <= 0:
-        return np.zeros((0, 2), dtype=np.float32)
-    time = np.arange(total_samples, dtype=np.float32) / sample_rate
-    left_freq = carrier_hz - beat_hz / 2.0
-    right_freq = carrier_hz + beat_hz / 2.0
-    left = np.sin(2 * np.pi * left_freq * time)
-    right = np.sin(2 * np.pi * right_freq * time)
-    stereo = np.stack([left, right], axis=1)
-    stereo *= db_to_linear(gain_db)
-    fade_in_samples = int((fade_in_ms / 1000.0) * sample_rate)
-    fade_out_samples = int((fade_out_ms / 1000.0) * sample_rate)
-    stereo = apply_fade(stereo, fade_in_samples, fade_out_samples)
-    return stereo.astype(np.float32)
+    return render_binaural_block(
+        0,
+        total_samples,
+        total_samples,
+        sample_rate,
+        carrier_hz,
+        beat_hz,
+        gain_db,
+        fade_in_ms,
+        fade_out_ms,
+        ramps,
+    )
@@ -24,3 +24,29 @@ def equal_power_fade(fade_samples: int) -> tuple[np.ndarray, np.ndarray]:
     fade_in = np.sin(0.5 * np.pi * t)
     fade_out = np.cos(0.5 * np.pi * t)
     return fade_in, fade_out
+
+
+def fade_envelope(
+    start: int,
+    frames: int,
+    total_samples: int,
+    fade_in_samples: int,
+    fade_out_samples: int,
+) -> np.ndarray:
+    index = np.arange(start, start + frames, dtype=np.float64)
+    envelope = np.ones(frames, dtype=np.float64)
+    fade_in_samples = min(fade_in_samples, total_samples)
+    fade_out_samples = min(fade_out_samples, total_samples)
+    if fade_in_samples > 0:
+        mask = index < fade_in_samples
+        if mask.any():
+            step = np.pi / max(1, fade_in_samples - 1)
+            envelope[mask] *= 0.5 - 0.5 * np.cos(index[mask] * step)
+    if fade_out_samples > 0:
+        fade_start = total_samples - fade_out_samples
+        mask = index >= fade_start
+        if mask.any():
+            step = np.pi / max(1, fade_out_samples - 1)
+            position = index[mask] - fade_start
+            envelope[mask] *= 0.5 - 0.5 * np.cos(np.pi - position * step)
+    return envelope
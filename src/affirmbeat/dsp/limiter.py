@@ -1,20 +1,168 @@
 from __future__ import annotations
 
+import math
+
 import numpy as np
+from scipy.ndimage import minimum_filter1d
+from scipy.signal import firwin, lfilter, lfilter_zi, upfirdn
+
+_TRUE_PEAK_OVERSAMPLE = 4
+_TRUE_PEAK_TAPS = 49
+# Whole-session limiting is fed in blocks of this many samples so the hold,
+# release and smoothing temporaries stay block-sized.
+LIMITER_BLOCK_SAMPLES = 1 << 16
 
 
 def db_to_linear(db: float) -> float:
     return 10 ** (db / 20.0)
 
 
-def apply_peak_limiter(audio: np.ndarray, peak_db: float) -> np.ndarray:
+class _TruePeakDetector:
+    # Per-sample peak of the 4x oversampled signal over [n, n + 1). Output
+    # lags the input by ``latency`` samples.
+    def __init__(self) -> None:
+        factor = _TRUE_PEAK_OVERSAMPLE
+        self._h = firwin(_TRUE_PEAK_TAPS, 1.0 / factor, window=("kaiser", 5.0)) * factor
+        self._center = (_TRUE_PEAK_TAPS - 1) // 2
+        self.latency = -(-(self._center + factor) // factor)
+        self._history = np.zeros((self.latency + -(-self._center // factor), 1), dtype=np.float64)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        factor = _TRUE_PEAK_OVERSAMPLE
+        if self._history.shape[1] != block.shape[1]:
+            self._history = np.zeros((self._history.shape[0], block.shape[1]), dtype=np.float64)
+        ext = np.concatenate([self._history, block], axis=0)
+        keep = self._history.shape[0]
+        y = np.abs(upfirdn(self._h, ext, factor, 1, axis=0))
+        first = keep - self.latency
+        frames = block.shape[0]
+        offsets = self._center + factor * (first + np.arange(frames))
+        phases = np.stack([y[offsets + p] for p in range(factor)], axis=0).max(axis=0)
+        samples = np.abs(ext[first : first + frames])
+        self._history = ext[-keep:]
+        return np.maximum(phases, samples).max(axis=1)
+
+
+class LookaheadLimiter:
+    # Brick-wall limiter: the gain needed for each sample is held for the
+    # look-ahead window, released exponentially back towards unity and then
+    # smoothed with a moving average as long as the look-ahead, so the gain
+    # has fully reached its target when a peak comes out of the delay line.
+    # Blocks can be fed one at a time; the total output has the same length
+    # as the total input once flush() has been called.
+    def __init__(
+        self,
+        sample_rate: int,
+        ceiling_db: float,
+        lookahead_ms: float = 5.0,
+        release_ms: float = 100.0,
+        true_peak: bool = False,
+    ) -> None:
+        self.limit = db_to_linear(ceiling_db)
+        self._window = max(1, int(round(lookahead_ms / 1000.0 * sample_rate)) + 1)
+        self._log_release = -1.0 / max(1.0, release_ms / 1000.0 * sample_rate)
+        self._detector = _TruePeakDetector() if true_peak else None
+        detector_latency = self._detector.latency if self._detector is not None else 0
+        self.latency = self._window - 1 + detector_latency
+        self._gain_history = np.ones(self._window - 1, dtype=np.float64)
+        self._release_state = 0.0
+        self._box = np.full(self._window, 1.0 / self._window)
+        self._box_state = lfilter_zi(self._box, 1.0)
+        self._delay: np.ndarray | None = None
+        self._to_skip = self.latency
+        self.min_gain = 1.0
+        self.channels: int | None = None
+
+    def _target_gain(self, block: np.ndarray) -> np.ndarray:
+        if self._detector is not None:
+            peaks = self._detector.process(block.astype(np.float64))
+        else:
+            peaks = np.abs(block).max(axis=1).astype(np.float64)
+        gain = np.ones_like(peaks)
+        over = peaks > self.limit
+        gain[over] = self.limit / peaks[over]
+        return gain
+
+    def _release(self, held: np.ndarray) -> np.ndarray:
+        # u[n] = max(1 - held[n], a * u[n - 1]) with a = exp(log_release),
+        # evaluated with a cumulative max in the log domain.
+        with np.errstate(divide="ignore"):
+            log_depth = np.log(1.0 - held)
+            carried = math.log(self._release_state) if self._release_state > 0 else -np.inf
+        steps = np.arange(held.shape[0], dtype=np.float64)
+        ramp = steps * self._log_release
+        envelope = np.maximum.accumulate(np.maximum(log_depth - ramp, carried + self._log_release))
+        depth = np.exp(envelope + ramp)
+        self._release_state = float(depth[-1])
+        return 1.0 - depth
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim == 1:
+            block = block[:, None]
+        frames = block.shape[0]
+        if self._delay is None:
+            self.channels = block.shape[1]
+            self._delay = np.zeros((self.latency, block.shape[1]), dtype=np.float32)
+        if frames == 0:
+            return block
+        gain = self._target_gain(block)
+        gains = np.concatenate([self._gain_history, gain])
+        # Forward-looking minimum over the window: held[i] = min(gains[i : i + window]).
+        held = minimum_filter1d(gains, self._window, origin=-(self._window // 2))[:frames]
+        self._gain_history = gains[frames:]
+        smoothed, self._box_state = lfilter(self._box, 1.0, self._release(held), zi=self._box_state)
+
+        delayed = np.concatenate([self._delay, block], axis=0)
+        self._delay = delayed[frames:]
+        output = delayed[:frames] * smoothed[:, None].astype(np.float32)
+        np.clip(output, -self.limit, self.limit, out=output)
+        if self._to_skip:
+            skip = min(self._to_skip, frames)
+            output = output[skip:]
+            smoothed = smoothed[skip:]
+            self._to_skip -= skip
+        if smoothed.size:
+            self.min_gain = min(self.min_gain, float(smoothed.min()))
+        return output
+
+    def flush(self) -> np.ndarray:
+        if self._delay is None:
+            return np.zeros((0, 2), dtype=np.float32)
+        return self.process(np.zeros((self.latency, self._delay.shape[1]), dtype=np.float32))
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "latency_samples": self.latency,
+            "max_gain_reduction_db": -20.0 * math.log10(max(self.min_gain, 1e-12)),
+        }
+
+
+def limit_in_blocks(
+    limiter: LookaheadLimiter, audio: np.ndarray, block_samples: int = LIMITER_BLOCK_SAMPLES
+) -> np.ndarray:
+    audio = audio if audio.ndim == 2 else audio[:, None]
+    output = np.empty(audio.shape, dtype=np.float32)
+    written = 0
+    for start in range(0, audio.shape[0], max(1, block_samples)):
+        limited = limiter.process(audio[start : start + block_samples])
+        output[written : written + limited.shape[0]] = limited
+        written += limited.shape[0]
+    tail = limiter.flush()
+    output[written : written + tail.shape[0]] = tail
+    return output
+
+
+def apply_peak_limiter(
+    audio: np.ndarray,
+    peak_db: float,
+    sample_rate: int = 48_000,
+    lookahead_ms: float = 5.0,
+    release_ms: float = 100.0,
+    true_peak: bool = False,
+) -> np.ndarray:
     if audio.size == 0:
         return audio
-    peak = np.max(np.abs(audio))
-    if peak == 0:
-        return audio
-    limit = db_to_linear(peak_db)
-    if peak <= limit:
-        return audio
-    gain = limit / peak
-    return audio * gain
+    limiter = LookaheadLimiter(sample_rate, peak_db, lookahead_ms, release_ms, true_peak)
+    output = limit_in_blocks(limiter, audio)
+    return output[:, 0] if audio.ndim == 1 else output
@@ -1,17 +1,131 @@
 from __future__ import annotations
 
+import math
+
 import numpy as np
+from scipy.signal import sosfilt
+
+from affirmbeat.dsp.limiter import db_to_linear
+
+_BLOCK_SEC = 0.4
+_STEP_SEC = 0.1
+_ABSOLUTE_GATE_LUFS = -70.0
+_RELATIVE_GATE_LU = -10.0
+
+
+def _biquad(kind: str, sample_rate: int, fc: float, q: float, gain_db: float = 0.0) -> np.ndarray:
+    # RBJ cookbook designs, as used for the BS.1770 K-weighting curve.
+    A = 10 ** (gain_db / 40.0)
+    w0 = 2.0 * math.pi * fc / sample_rate
+    cos_w0 = math.cos(w0)
+    alpha = math.sin(w0) / (2.0 * q)
+    if kind == "high_shelf":
+        sqrt_a = math.sqrt(A)
+        b = [
+            A * ((A + 1) + (A - 1) * cos_w0 + 2 * sqrt_a * alpha),
+            -2 * A * ((A - 1) + (A + 1) * cos_w0),
+            A * ((A + 1) + (A - 1) * cos_w0 - 2 * sqrt_a * alpha),
+        ]
+        a = [
+            (A + 1) - (A - 1) * cos_w0 + 2 * sqrt_a * alpha,
+            2 * ((A - 1) - (A + 1) * cos_w0),
+            (A + 1) - (A - 1) * cos_w0 - 2 * sqrt_a * alpha,
+        ]
+    else:
+        b = [(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2]
+        a = [1 + alpha, -2 * cos_w0, 1 - alpha]
+    return np.array(b + a) / a[0]
+
+
+def k_weighting(sample_rate: int) -> np.ndarray:
+    return np.stack(
+        [
+            _biquad("high_shelf", sample_rate, 1500.0, 1 / math.sqrt(2), 4.0),
+            _biquad("high_pass", sample_rate, 38.0, 0.5),
+        ]
+    )
+
+
+class LoudnessMeter:
+    # ITU-R BS.1770 integrated loudness of a stereo (or mono) signal fed in
+    # blocks of any size. The K-weighting filter state is carried between
+    # blocks and only per-100 ms channel energies are kept, so an hour of
+    # audio costs a few hundred kilobytes.
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = sample_rate
+        self._sos = k_weighting(sample_rate)
+        self._step = int(round(_STEP_SEC * sample_rate))
+        self._steps_per_block = int(round(_BLOCK_SEC / _STEP_SEC))
+        self._zi: np.ndarray | None = None
+        self._partial: np.ndarray | None = None
+        self._partial_frames = 0
+        self._energies: list[np.ndarray] = []
+
+    def process(self, block: np.ndarray) -> None:
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        if block.shape[0] == 0:
+            return
+        if self._zi is None:
+            self._zi = np.zeros((self._sos.shape[0], 2, block.shape[1]))
+            self._partial = np.zeros(block.shape[1])
+        weighted, self._zi = sosfilt(self._sos, block, axis=0, zi=self._zi)
+        squared = weighted * weighted
+        pos = 0
+        # Finish the 100 ms step left open by the previous block.
+        if self._partial_frames:
+            take = min(self._step - self._partial_frames, squared.shape[0])
+            self._partial += squared[:take].sum(axis=0)
+            self._partial_frames += take
+            pos = take
+            if self._partial_frames == self._step:
+                self._energies.append(self._partial.copy())
+                self._partial[:] = 0.0
+                self._partial_frames = 0
+        whole = (squared.shape[0] - pos) // self._step
+        if whole:
+            steps = squared[pos : pos + whole * self._step].reshape(whole, self._step, -1).sum(axis=1)
+            self._energies.extend(steps)
+            pos += whole * self._step
+        if pos < squared.shape[0]:
+            self._partial += squared[pos:].sum(axis=0)
+            self._partial_frames = squared.shape[0] - pos
+
+    def integrated_loudness(self) -> float:
+        count = len(self._energies) - self._steps_per_block + 1
+        if count <= 0:
+            return float("-inf")
+        steps = np.asarray(self._energies)
+        # 400 ms blocks with 75 % overlap are sums of four consecutive steps.
+        cumulative = np.concatenate([np.zeros((1, steps.shape[1])), np.cumsum(steps, axis=0)])
+        block_len = self._step * self._steps_per_block
+        z = (cumulative[self._steps_per_block :] - cumulative[:count]) / block_len
+        power = z.sum(axis=1)
+        with np.errstate(divide="ignore"):
+            loudness = -0.691 + 10.0 * np.log10(power)
+        gated = loudness >= _ABSOLUTE_GATE_LUFS
+        if not gated.any():
+            return float("-inf")
+        relative = -0.691 + 10.0 * math.log10(power[gated].mean()) + _RELATIVE_GATE_LU
+        gated &= loudness > relative
+        if not gated.any():
+            return float("-inf")
+        return -0.691 + 10.0 * math.log10(power[gated].mean())
+
+
+def loudness_gain(loudness: float, target_lufs: float) -> float:
+    if not math.isfinite(loudness):
+        return 1.0
+    return db_to_linear(target_lufs - loudness)
+
 
-try:
-    import pyloudnorm as pyln
-except Exception:  # pragma: no cover - optional dependency behavior
-    pyln = None
+def measure_loudness(audio: np.ndarray, sample_rate: int) -> float:
+    meter = LoudnessMeter(sample_rate)
+    meter.process(audio)
+    return meter.integrated_loudness()
 
 
 def apply_loudness(audio: np.ndarray, sample_rate: int, target_lufs: float) -> np.ndarray:
-    if pyln is None:
-        return audio
-    meter = pyln.Meter(sample_rate)
-    loudness = meter.integrated_loudness(audio)
-    normalized = pyln.normalize.loudness(audio, loudness, target_lufs)
-    return normalized.astype(np.float32)
+    gain = loudness_gain(measure_loudness(audio, sample_rate), target_lufs)
+    return (audio * np.float32(gain)).astype(np.float32)
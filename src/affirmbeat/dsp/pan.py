@@ -4,11 +4,16 @@ import math
 import numpy as np
 
 
-def pan_mono_to_stereo(audio: np.ndarray, pan: float) -> np.ndarray:
+def pan_gains(pan: float, stereo: bool = False) -> tuple[float, float]:
+    # Constant-power law; stereo sources are normalized so pan 0 is unity.
     pan = max(-1.0, min(1.0, pan))
     angle = (pan + 1.0) * (math.pi / 4.0)
-    left_gain = math.cos(angle)
-    right_gain = math.sin(angle)
+    scale = math.sqrt(2.0) if stereo else 1.0
+    return math.cos(angle) * scale, math.sin(angle) * scale
+
+
+def pan_mono_to_stereo(audio: np.ndarray, pan: float) -> np.ndarray:
+    left_gain, right_gain = pan_gains(pan)
     left = audio * left_gain
     right = audio * right_gain
     return np.stack([left, right], axis=1)
@@ -18,10 +23,7 @@ def apply_pan(audio: np.ndarray, pan: float) -> np.ndarray:
     if audio.ndim == 1:
         return pan_mono_to_stereo(audio, pan)
     if audio.ndim == 2 and audio.shape[1] == 2:
-        pan = max(-1.0, min(1.0, pan))
-        angle = (pan + 1.0) * (math.pi / 4.0)
-        left_gain = math.cos(angle) * math.sqrt(2.0)
-        right_gain = math.sin(angle) * math.sqrt(2.0)
+        left_gain, right_gain = pan_gains(pan, stereo=True)
         stereo = audio.copy()
         stereo[:, 0] *= left_gain
         stereo[:, 1] *= right_gain
@@ -1,8 +1,29 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
+
 import numpy as np
-from scipy.signal import resample_poly
+from scipy.signal import firwin, upfirdn
+
+
+@lru_cache(maxsize=32)
+def _design(up: int, down: int) -> tuple[np.ndarray, int]:
+    # Same filter and alignment as scipy.signal.resample_poly's default
+    # (Kaiser window, beta 5), so both paths produce the same samples.
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+    n_pre_pad = down - half_len % down
+    n_pre_remove = (half_len + n_pre_pad) // down
+    h = np.concatenate([np.zeros(n_pre_pad), h])
+    h.setflags(write=False)
+    return h, n_pre_remove
+
+
+def _ratio(orig_sr: int, target_sr: int) -> tuple[int, int]:
+    gcd = math.gcd(orig_sr, target_sr)
+    return target_sr // gcd, orig_sr // gcd
 
 
 def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
@@ -10,15 +31,75 @@ def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarra
         return audio.astype(np.float32)
     if audio.size == 0:
         return audio.astype(np.float32)
-    if audio.ndim == 1:
-        audio = audio[:, None]
-    gcd = math.gcd(orig_sr, target_sr)
-    up = target_sr // gcd
-    down = orig_sr // gcd
-    resampled = []
-    for ch in range(audio.shape[1]):
-        resampled.append(resample_poly(audio[:, ch], up, down))
-    stacked = np.stack(resampled, axis=1)
-    if stacked.shape[1] == 1:
-        return stacked[:, 0].astype(np.float32)
-    return stacked.astype(np.float32)
+    up, down = _ratio(orig_sr, target_sr)
+    h, n_pre_remove = _design(up, down)
+    n_out = -(-audio.shape[0] * up // down)
+    # All channels go through one upfirdn call along the time axis.
+    y = upfirdn(h.astype(audio.dtype, copy=False), audio, up, down, axis=0)
+    return y[n_pre_remove : n_pre_remove + n_out].astype(np.float32, copy=False)
+
+
+class StreamingResampler:
+    # Feeds blocks of a signal through the same polyphase filter as
+    # resample_audio. Output lags the input by the filter's half length; the
+    # remainder is returned by flush(), and the concatenated output matches
+    # resampling the whole signal at once.
+    def __init__(self, orig_sr: int, target_sr: int) -> None:
+        self.up, self.down = _ratio(orig_sr, target_sr)
+        self._h, self._n_pre_remove = _design(self.up, self.down)
+        self._h32 = self._h.astype(np.float32)
+        self._tail_shape: tuple[int, ...] = ()
+        self._buffer: np.ndarray | None = None
+        self._buffer_start = 0
+        self._consumed = 0
+        self._next = self._n_pre_remove
+
+    @property
+    def passthrough(self) -> bool:
+        return self.up == self.down
+
+    def output_frames(self, input_frames: int) -> int:
+        return -(-input_frames * self.up // self.down)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float32)
+        if self.passthrough:
+            return block.copy()
+        if self._buffer is None:
+            self._tail_shape = block.shape[1:]
+            self._buffer = block[:0].copy()
+        self._buffer = np.concatenate([self._buffer, block], axis=0)
+        self._consumed += block.shape[0]
+        # Full-convolution output k needs inputs up to floor(k * down / up).
+        end = -(-self._consumed * self.up // self.down)
+        return self._emit(end, self._buffer)
+
+    def flush(self) -> np.ndarray:
+        if self.passthrough or self._buffer is None:
+            return np.zeros((0,) + self._tail_shape, dtype=np.float32)
+        end = self._n_pre_remove + self.output_frames(self._consumed)
+        tail = -(-self._h.shape[0] // self.up) + self.down
+        padded = np.concatenate(
+            [self._buffer, np.zeros((tail,) + self._buffer.shape[1:], dtype=np.float32)], axis=0
+        )
+        output = self._emit(end, padded)
+        self._buffer = None
+        return output
+
+    def _emit(self, end: int, signal: np.ndarray) -> np.ndarray:
+        start = self._next
+        if end <= start or signal.shape[0] == 0:
+            return np.zeros((0,) + signal.shape[1:], dtype=np.float32)
+        # The buffer always starts on a multiple of ``down`` input frames, so
+        # its upfirdn output lines up with the global output index.
+        offset = self._buffer_start * self.up // self.down
+        y = upfirdn(self._h32, signal, self.up, self.down, axis=0)
+        output = y[start - offset : end - offset].astype(np.float32, copy=False)
+        self._next = start + output.shape[0]
+        # Drop input no longer needed by any future output.
+        needed = max(0, (self._next * self.down - (self._h.shape[0] - 1)) // self.up)
+        needed -= needed % self.down
+        if self._buffer is not None and needed > self._buffer_start:
+            self._buffer = self._buffer[needed - self._buffer_start :]
+            self._buffer_start = needed
+        return output
@@ -21,3 +21,8 @@ class MusicProvider(Protocol):
         bpm: int | None,
     ) -> np.ndarray:
         ...
+
+
+class BatchTTSProvider(TTSProvider, Protocol):
+    def synthesize_many(self, texts: list[str], voice: str | None, settings: dict) -> list[np.ndarray]:
+        ...
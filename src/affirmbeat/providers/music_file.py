@@ -1,48 +1,135 @@
 from __future__ import annotations
 
+import threading
 import warnings
 from pathlib import Path
 
 import numpy as np
 import soundfile as sf
 
-from affirmbeat.dsp.resample import resample_audio
+from affirmbeat.core.cache import CacheStore
+from affirmbeat.core.hashing import hash_dict
+from affirmbeat.dsp.resample import StreamingResampler
+
+_BLOCK_FRAMES = 1 << 16
+
+
+def _to_stereo(block: np.ndarray) -> np.ndarray:
+    if block.shape[1] == 1:
+        return np.repeat(block, 2, axis=1)
+    return block[:, :2]
+
+
+def _write_block(output: np.ndarray, pos: int, block: np.ndarray) -> int:
+    take = min(block.shape[0], output.shape[0] - pos)
+    output[pos : pos + take] = block[:take]
+    return pos + take
+
+
+class _FileSource:
+    # Looping stereo view of a music file at the render sample rate. Files
+    # already at that rate are read straight from disk; others are resampled
+    # block by block once and kept (memory-mapped when a cache is available).
+    def __init__(self, file_path: Path, sample_rate: int, cache: CacheStore | None) -> None:
+        self.path = file_path
+        self._audio: np.ndarray | None = None
+        with sf.SoundFile(file_path) as handle:
+            native_sr = handle.samplerate
+            self.frames = handle.frames
+        if native_sr != sample_rate:
+            self._audio = self._load_resampled(native_sr, sample_rate, cache)
+            self.frames = self._audio.shape[0]
+
+    def _load_resampled(self, native_sr: int, sample_rate: int, cache: CacheStore | None) -> np.ndarray:
+        key = None
+        if cache is not None:
+            stat = self.path.stat()
+            key = hash_dict(
+                {
+                    "path": str(self.path.resolve()),
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sample_rate": sample_rate,
+                }
+            )
+            cached = cache.lookup("music_file", key)
+            if cached is not None:
+                try:
+                    return np.load(cached, mmap_mode="r")
+                except Exception:
+                    cache.remove("music_file", key)
+        resampler = StreamingResampler(native_sr, sample_rate)
+        path = None
+        with sf.SoundFile(self.path) as handle:
+            frames = resampler.output_frames(handle.frames)
+            if key is None:
+                audio = np.zeros((frames, 2), dtype=np.float32)
+            else:
+                path = cache.entry_path("music_file", key, ".npy")
+                audio = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(frames, 2))
+            pos = 0
+            blocks = handle.blocks(blocksize=_BLOCK_FRAMES, dtype="float32", always_2d=True)
+            for block in blocks:
+                pos = _write_block(audio, pos, resampler.process(_to_stereo(block)))
+            pos = _write_block(audio, pos, resampler.flush())
+        if path is None:
+            return audio
+        audio.flush()
+        del audio
+        cache.record_file("music_file", key, path)
+        return np.load(path, mmap_mode="r")
+
+    def _read_span(self, start: int, frames: int) -> np.ndarray:
+        if self._audio is not None:
+            return self._audio[start : start + frames]
+        with sf.SoundFile(self.path) as handle:
+            handle.seek(start)
+            return _to_stereo(handle.read(frames, dtype="float32", always_2d=True))
+
+    def read(self, start: int, frames: int) -> np.ndarray:
+        output = np.empty((frames, 2), dtype=np.float32)
+        pos = 0
+        while pos < frames:
+            offset = (start + pos) % self.frames
+            span = self._read_span(offset, min(frames - pos, self.frames - offset))
+            if span.shape[0] == 0:
+                break
+            output[pos : pos + span.shape[0]] = span
+            pos += span.shape[0]
+        output[pos:] = 0.0
+        return output
 
 
 class FileMusicProvider:
-    def __init__(self, sample_rate: int) -> None:
+    def __init__(self, sample_rate: int, cache: CacheStore | None = None) -> None:
         self.sample_rate = sample_rate
+        self.cache = cache
+        self._sources: dict[tuple[str, int], _FileSource] = {}
+        self._lock = threading.Lock()
+
+    def _source(self, file_path: Path) -> _FileSource:
+        key = (str(file_path.resolve()), file_path.stat().st_mtime_ns)
+        with self._lock:
+            source = self._sources.get(key)
+            if source is None:
+                try:
+                    source = _FileSource(file_path, self.sample_rate, self.cache)
+                except Exception as exc:
+                    raise RuntimeError(f"Failed to read music file: {file_path}") from exc
+                self._sources[key] = source
+        return source
 
     def generate(self, path: str, duration_sec: float, seed: int, bpm: int | None = None) -> np.ndarray:
         file_path = Path(path)
+        target_samples = int(duration_sec * self.sample_rate)
         if not file_path.exists():
             # Fallback for when the user hasn't provided the file yet
             warnings.warn(f"Music file not found: {path}. Using silence.")
-            return np.zeros((int(duration_sec * self.sample_rate), 2), dtype=np.float32)
+            return np.zeros((target_samples, 2), dtype=np.float32)
 
-        try:
-            audio, sr = sf.read(file_path, dtype="float32")
-        except Exception as exc:
-            raise RuntimeError(f"Failed to read music file: {file_path}") from exc
-
-        # Handle mono/stereo
-        if audio.ndim == 1:
-            audio = np.stack([audio, audio], axis=1)
-        elif audio.shape[1] > 2:
-            audio = audio[:, :2]
-
-        # Resample if needed
-        if sr != self.sample_rate:
-            audio = resample_audio(audio, sr, self.sample_rate)
-
-        # Loop to match duration
-        target_samples = int(duration_sec * self.sample_rate)
-        current_samples = audio.shape[0]
-        
-        if current_samples < target_samples:
-            # Simple tiling loop (crossfade looping is handled by the higher-level builder if configured)
-            # But here we just need to provide enough raw audio.
-            tile_count = (target_samples // current_samples) + 1
-            audio = np.tile(audio, (tile_count, 1))
-        
-        return audio[:target_samples]
+        source = self._source(file_path)
+        if source.frames == 0:
+            return np.zeros((target_samples, 2), dtype=np.float32)
+        # Every chunk starts at the top of the file and loops it as needed;
+        # crossfading between chunks is handled by the music bed.
+        return source.read(0, target_samples)
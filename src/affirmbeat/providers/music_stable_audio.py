@@ -1,14 +1,161 @@
 from __future__ import annotations
 
+import contextlib
 import inspect
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterator
 
 import numpy as np
 
 from affirmbeat.dsp.resample import resample_audio
 
 
+STABLE_AUDIO_PRECISIONS = ("fp32", "bf16")
+DEFAULT_MODEL_IDLE_SEC = 900.0
+DEFAULT_MAX_MODELS = 1
+
+
+@dataclass
+class LoadedModel:
+    model: Any
+    config: Any
+    device: str
+    last_used: float
+    compiled: Any | None = None
+
+    def compiled_model(self) -> Any:
+        if self.compiled is None:
+            import torch
+
+            self.compiled = torch.compile(self.model)
+        return self.compiled
+
+
+class _ModelRegistry:
+    def __init__(self, max_models: int, idle_sec: float) -> None:
+        self.max_models = max_models
+        self.idle_sec = idle_sec
+        self._models: OrderedDict[tuple[str, str], LoadedModel] = OrderedDict()
+        self._lock = threading.Lock()
+        self._reaper: threading.Thread | None = None
+
+    def acquire(self, model_id: str, device: str | None) -> LoadedModel:
+        resolved = _resolve_device(device)
+        key = (model_id, resolved)
+        with self._lock:
+            loaded = self._models.get(key)
+            if loaded is None:
+                # Loading under the lock makes a concurrent render wait for
+                # this load instead of pulling a second copy of the weights.
+                model, config = _load_pretrained(model_id, resolved)
+                loaded = LoadedModel(model=model, config=config, device=resolved, last_used=0.0)
+                self._models[key] = loaded
+                while len(self._models) > self.max_models:
+                    self._models.popitem(last=False)
+                self._start_reaper()
+            loaded.last_used = time.monotonic()
+            self._models.move_to_end(key)
+            return loaded
+
+    def evict_idle(self, idle_sec: float | None = None) -> int:
+        limit = self.idle_sec if idle_sec is None else idle_sec
+        now = time.monotonic()
+        with self._lock:
+            stale = [key for key, loaded in self._models.items() if now - loaded.last_used >= limit]
+            for key in stale:
+                del self._models[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def loaded(self) -> list[tuple[str, str]]:
+        with self._lock:
+            return list(self._models)
+
+    def _start_reaper(self) -> None:
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(target=self._reap, name="stable-audio-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(max(1.0, self.idle_sec / 4))
+            self.evict_idle()
+            with self._lock:
+                if not self._models:
+                    self._reaper = None
+                    return
+
+
+def _resolve_device(device: str | None) -> str:
+    if device:
+        return device
+    try:
+        import torch
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "stable-audio-tools and torch are required for stable_audio_open provider"
+        ) from exc
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _load_pretrained(model_id: str, device: str) -> tuple[Any, Any]:
+    try:
+        from stable_audio_tools import get_pretrained_model
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "stable-audio-tools and torch are required for stable_audio_open provider"
+        ) from exc
+    model, config = get_pretrained_model(model_id)
+    model = model.to(device)
+    model.eval()
+    return model, config
+
+
+_REGISTRY = _ModelRegistry(DEFAULT_MAX_MODELS, DEFAULT_MODEL_IDLE_SEC)
+
+
+def acquire_stable_audio_model(model_id: str, device: str | None = None) -> LoadedModel:
+    return _REGISTRY.acquire(model_id, device)
+
+
+def configure_model_registry(
+    max_models: int | None = None,
+    idle_sec: float | None = None,
+) -> None:
+    if max_models is not None:
+        _REGISTRY.max_models = max(1, max_models)
+    if idle_sec is not None:
+        _REGISTRY.idle_sec = max(0.0, idle_sec)
+
+
+def evict_idle_models(idle_sec: float | None = None) -> int:
+    return _REGISTRY.evict_idle(idle_sec)
+
+
+def loaded_models() -> list[tuple[str, str]]:
+    return _REGISTRY.loaded()
+
+
+def shutdown_stable_audio_models() -> None:
+    _REGISTRY.clear()
+
+
+def warm_up_stable_audio(model_id: str, device: str | None = None) -> None:
+    acquire_stable_audio_model(model_id, device)
+
+
 class StableAudioOpenProvider:
+    # One diffusion model per provider; concurrent generate() calls would only
+    # contend for the same device.
+    parallel_safe = False
+
     def __init__(
         self,
         sample_rate: int,
@@ -19,7 +166,15 @@ class StableAudioOpenProvider:
         sigma_min: float | None = None,
         sigma_max: float | None = None,
         sampler: str | None = None,
+        torch_threads: int | None = None,
+        inference_mode: bool = True,
+        precision: str = "fp32",
+        compile: bool = False,
     ) -> None:
+        if precision not in STABLE_AUDIO_PRECISIONS:
+            raise ValueError(
+                f"Unknown precision {precision!r}. Supported: {', '.join(STABLE_AUDIO_PRECISIONS)}."
+            )
         self.sample_rate = sample_rate
         self.model_id = model_id
         self.device = device
@@ -28,27 +183,24 @@ class StableAudioOpenProvider:
         self.sigma_min = sigma_min
         self.sigma_max = sigma_max
         self.sampler = sampler
+        self.torch_threads = torch_threads
+        self.inference_mode = inference_mode
+        self.precision = precision
+        self.compile = compile
         self._model = None
         self._config: Any | None = None
         self._device_in_use: str | None = None
+        self._generator_fn: Any | None = None
+        self._base_kwargs: dict[str, Any] = {}
+        self._generator_params: set[str] = set()
 
     def _load(self) -> None:
-        if self._model is not None:
-            return
-        try:
-            import torch
-            from stable_audio_tools import get_pretrained_model
-        except Exception as exc:  # pragma: no cover - optional dependency
-            raise RuntimeError(
-                "stable-audio-tools and torch are required for stable_audio_open provider"
-            ) from exc
-        model, config = get_pretrained_model(self.model_id)
-        device = self.device or ("cuda" if torch.cuda.is_available() else "cpu")
-        model = model.to(device)
-        model.eval()
-        self._model = model
-        self._config = config
-        self._device_in_use = device
+        loaded = acquire_stable_audio_model(self.model_id, self.device)
+        # Keep our own reference so a concurrent eviction only drops the
+        # registry's copy, never the model this provider is using.
+        self._model = loaded.compiled_model() if self.compile else loaded.model
+        self._config = loaded.config
+        self._device_in_use = loaded.device
 
     def _config_sample_rate(self) -> int | None:
         if self._config is None:
@@ -61,45 +213,76 @@ class StableAudioOpenProvider:
                 return int(sr)
         return None
 
+    @contextlib.contextmanager
+    def _torch_context(self) -> Iterator[None]:
+        try:
+            import torch
+        except Exception:  # pragma: no cover - optional dependency
+            yield
+            return
+        if self.torch_threads is not None:
+            # Process-wide setting; renders sharing a process share it too.
+            torch.set_num_threads(self.torch_threads)
+        with contextlib.ExitStack() as stack:
+            if self.inference_mode:
+                stack.enter_context(torch.inference_mode())
+            if self.precision == "bf16":
+                device_type = (self._device_in_use or "cpu").split(":")[0]
+                stack.enter_context(torch.autocast(device_type=device_type, dtype=torch.bfloat16))
+            yield
+
+    def _generator(self) -> tuple[Any, dict[str, Any], set[str]]:
+        # Resolving the generator's signature and the per-provider arguments
+        # only has to happen once; each call just adds seed and conditioning.
+        if self._generator_fn is None:
+            try:
+                from stable_audio_tools.inference.generation import generate_diffusion_cond
+            except Exception as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError("stable_audio_tools inference module not available") from exc
+            params = set(inspect.signature(generate_diffusion_cond).parameters)
+            step_param = "num_steps" if "num_steps" in params else "steps"
+            sampler_param = "sampler_type" if "sampler_type" in params else "sampler"
+            kwargs = {
+                step_param: int(self.steps),
+                sampler_param: self.sampler,
+                "sigma_min": self.sigma_min,
+                "sigma_max": self.sigma_max,
+                "guidance_scale": self.guidance_scale,
+            }
+            self._base_kwargs = {k: v for k, v in kwargs.items() if v is not None and k in params}
+            self._generator_params = params
+            self._generator_fn = generate_diffusion_cond
+        return self._generator_fn, self._base_kwargs, self._generator_params
+
     def generate(self, prompt: str, duration_sec: float, seed: int, bpm: int | None) -> np.ndarray:
+        # generate_diffusion_cond draws a whole batch's noise from one seed, so
+        # batched chunks would depend on their batch mates. Every chunk gets
+        # its own call and seed, which keeps each cache key's audio fixed.
         self._load()
-        try:
-            from stable_audio_tools.inference.generation import generate_diffusion_cond
-        except Exception as exc:  # pragma: no cover - optional dependency
-            raise RuntimeError("stable_audio_tools inference module not available") from exc
-
-        sig = inspect.signature(generate_diffusion_cond)
-        step_param = "num_steps" if "num_steps" in sig.parameters else "steps"
-        sampler_param = "sampler_type" if "sampler_type" in sig.parameters else "sampler"
-        kwargs = {
-            "model": self._model,
-            "config": self._config,
-            "device": self._device_in_use,
-            "seed": int(seed),
-            step_param: int(self.steps) if step_param in sig.parameters else None,
-            sampler_param: self.sampler if sampler_param in sig.parameters else None,
-            "sigma_min": self.sigma_min,
-            "sigma_max": self.sigma_max,
-            "guidance_scale": self.guidance_scale,
-        }
-        if "conditioning" in sig.parameters:
-            conditioning = [{"prompt": prompt, "seconds_total": float(duration_sec)}]
+        generate_diffusion_cond, base_kwargs, params = self._generator()
+        kwargs = dict(base_kwargs)
+        for name, value in (("model", self._model), ("config", self._config), ("device", self._device_in_use)):
+            if name in params and value is not None:
+                kwargs[name] = value
+        kwargs["seed"] = int(seed)
+        if "conditioning" in params:
+            item: dict[str, Any] = {"prompt": prompt, "seconds_total": float(duration_sec)}
             if bpm is not None:
-                conditioning[0]["bpm"] = int(bpm)
-            kwargs["conditioning"] = conditioning
-        elif "prompt" in sig.parameters:
+                item["bpm"] = int(bpm)
+            kwargs["conditioning"] = [item]
+        elif "prompt" in params:
             kwargs["prompt"] = prompt
-            if "seconds_total" in sig.parameters:
+            if "seconds_total" in params:
                 kwargs["seconds_total"] = float(duration_sec)
-        filtered = {k: v for k, v in kwargs.items() if v is not None and k in sig.parameters}
-        output = generate_diffusion_cond(**filtered)
+        with self._torch_context():
+            output = generate_diffusion_cond(**kwargs)
 
         result_sr = self._config_sample_rate()
         if isinstance(output, tuple) and len(output) == 2:
             output, result_sr = output
 
         if hasattr(output, "detach"):
-            output = output.detach().cpu().numpy()
+            output = output.detach().float().cpu().numpy()
         audio = np.asarray(output)
         if audio.ndim == 3:
             audio = audio[0]
@@ -4,15 +4,77 @@ import shutil
 import subprocess
 import tempfile
 from pathlib import Path
+from xml.sax.saxutils import escape
 
+import numpy as np
 import soundfile as sf
 
 from affirmbeat.dsp.resample import resample_audio
 
+# Lines in a batch are separated by an SSML break that is longer than any
+# pause espeak inserts inside a line, so the rendered batch can be split on it.
+_BATCH_BREAK_MS = 2000
+_MIN_SPLIT_GAP_MS = 1500
+_EDGE_PAD_MS = 50
+_SILENCE_THRESHOLD = 1e-3
+
+
+def _silent_runs(audio: np.ndarray, min_samples: int) -> list[tuple[int, int]]:
+    silent = np.abs(audio) < _SILENCE_THRESHOLD
+    if not silent.any():
+        return []
+    edges = np.diff(np.concatenate([[False], silent, [False]]).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = (ends - starts) >= min_samples
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+
+def trim_edges(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    # Batched and single-line results share a cache key, so both leave exactly
+    # the same edge pad around the speech whatever silence espeak added.
+    pad = int(_EDGE_PAD_MS / 1000.0 * sample_rate)
+    voiced = np.flatnonzero(np.abs(audio) >= _SILENCE_THRESHOLD)
+    if voiced.size == 0:
+        return np.zeros(0, dtype=np.float32)
+    trimmed = np.zeros(int(voiced[-1] - voiced[0]) + 1 + 2 * pad, dtype=np.float32)
+    trimmed[pad : trimmed.shape[0] - pad] = audio[voiced[0] : voiced[-1] + 1]
+    return trimmed
+
+
+def split_batch(
+    audio: np.ndarray,
+    count: int,
+    sample_rate: int,
+) -> list[tuple[int, int]] | None:
+    min_gap = int(_MIN_SPLIT_GAP_MS / 1000.0 * sample_rate)
+    pad = int(_EDGE_PAD_MS / 1000.0 * sample_rate)
+    gaps = [
+        (start, end)
+        for start, end in _silent_runs(audio, min_gap)
+        if start > 0 and end < audio.shape[0]
+    ]
+    if len(gaps) != count - 1:
+        return None
+    bounds: list[tuple[int, int]] = []
+    segment_start = 0
+    for gap_start, gap_end in gaps:
+        bounds.append((segment_start, gap_start + pad))
+        segment_start = gap_end - pad
+    bounds.append((segment_start, audio.shape[0]))
+    return bounds
+
 
 class EspeakTTSProvider:
-    def __init__(self, sample_rate: int) -> None:
+    def __init__(self, sample_rate: int, batch_size: int = 32) -> None:
         self.sample_rate = sample_rate
+        self.batch_size = max(1, batch_size)
+
+    def _binary(self) -> str:
+        binary = shutil.which("espeak") or shutil.which("espeak-ng")
+        if not binary:
+            raise RuntimeError("espeak binary not found in PATH")
+        return binary
 
     def list_voices(self) -> list[str]:
         binary = shutil.which("espeak") or shutil.which("espeak-ng")
@@ -27,10 +89,8 @@ class EspeakTTSProvider:
                 voices.append(parts[3])
         return voices
 
-    def synthesize(self, text: str, voice: str | None, settings: dict) -> object:
-        binary = shutil.which("espeak") or shutil.which("espeak-ng")
-        if not binary:
-            raise RuntimeError("espeak binary not found in PATH")
+    def _run(self, text: str, voice: str | None, settings: dict, ssml: bool) -> tuple[np.ndarray, int]:
+        binary = self._binary()
         rate = float(settings.get("rate", 1.0))
         speed_wpm = max(80, int(175 * rate))
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -38,9 +98,42 @@ class EspeakTTSProvider:
             cmd = [binary, "-s", str(speed_wpm), "-w", str(output_path)]
             if voice:
                 cmd += ["-v", voice]
-            cmd.append(text)
-            subprocess.run(cmd, check=True)
+            if ssml:
+                cmd += ["-m", "--stdin"]
+                subprocess.run(cmd, input=text.encode("utf-8"), check=True)
+            else:
+                cmd.append(text)
+                subprocess.run(cmd, check=True)
             audio, sr = sf.read(output_path, dtype="float32")
-            if sr != self.sample_rate:
-                audio = resample_audio(audio, sr, self.sample_rate)
-            return audio
+        if audio.ndim > 1:
+            audio = audio[:, 0]
+        return audio, int(sr)
+
+    def synthesize(self, text: str, voice: str | None, settings: dict) -> object:
+        audio, sr = self._run(text, voice, settings, ssml=False)
+        if sr != self.sample_rate:
+            audio = resample_audio(audio, sr, self.sample_rate)
+        return trim_edges(audio, self.sample_rate)
+
+    def synthesize_many(self, texts: list[str], voice: str | None, settings: dict) -> list[np.ndarray]:
+        results: list[np.ndarray] = []
+        for offset in range(0, len(texts), self.batch_size):
+            results.extend(self._synthesize_batch(texts[offset : offset + self.batch_size], voice, settings))
+        return results
+
+    def _synthesize_batch(self, texts: list[str], voice: str | None, settings: dict) -> list[np.ndarray]:
+        if len(texts) <= 1:
+            return [self.synthesize(text, voice, settings) for text in texts]
+        separator = f'<break time="{_BATCH_BREAK_MS}ms"/>'
+        document = "<speak>" + separator.join(escape(text) for text in texts) + "</speak>"
+        audio, sr = self._run(document, voice, settings, ssml=True)
+        bounds = split_batch(audio, len(texts), sr)
+        if bounds is None:
+            # A line produced its own long pause (or none at all); fall back to
+            # one process per line rather than guessing the boundaries.
+            return [self.synthesize(text, voice, settings) for text in texts]
+        if sr != self.sample_rate:
+            audio = resample_audio(audio, sr, self.sample_rate)
+            scale = self.sample_rate / sr
+            bounds = [(int(round(start * scale)), int(round(end * scale))) for start, end in bounds]
+        return [trim_edges(audio[start:end], self.sample_rate) for start, end in bounds]
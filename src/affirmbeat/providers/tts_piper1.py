@@ -1,37 +1,247 @@
 from __future__ import annotations
 
+import atexit
+import json
 import shutil
 import subprocess
 import tempfile
+import threading
+import warnings
 from pathlib import Path
+from typing import Any
 
+import numpy as np
 import soundfile as sf
 
 from affirmbeat.dsp.resample import resample_audio
 
+PIPER_BACKENDS = ("auto", "python", "server", "subprocess")
+
+_REGISTRY_LOCK = threading.Lock()
+_VOICES: dict[str, Any] = {}
+_SERVER_POOLS: dict[tuple[str, str, float], "_PiperServerPool"] = {}
+
+
+def _load_piper_voice(model: str) -> Any | None:
+    try:
+        from piper import PiperVoice
+    except Exception:
+        return None
+    with _REGISTRY_LOCK:
+        voice = _VOICES.get(model)
+        if voice is None:
+            voice = PiperVoice.load(model)
+            _VOICES[model] = voice
+    return voice
+
+
+def _synthesize_in_process(voice: Any, text: str, length_scale: float) -> tuple[np.ndarray, int]:
+    try:
+        from piper import SynthesisConfig
+    except Exception:
+        SynthesisConfig = None
+    if SynthesisConfig is not None:
+        chunks = list(voice.synthesize(text, syn_config=SynthesisConfig(length_scale=length_scale)))
+        sample_rate = int(chunks[0].sample_rate) if chunks else int(voice.config.sample_rate)
+        if not chunks:
+            return np.zeros(0, dtype=np.float32), sample_rate
+        audio = np.concatenate([chunk.audio_float_array for chunk in chunks])
+        return audio.astype(np.float32), sample_rate
+    # piper-tts < 1.3 only exposes raw int16 PCM.
+    raw = b"".join(voice.synthesize_stream_raw(text, length_scale=length_scale))
+    audio = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    return audio, int(voice.config.sample_rate)
+
+
+class _PiperServer:
+    def __init__(self, binary: str, model: str, length_scale: float) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="affirmbeat-piper-")
+        self._counter = 0
+        self.process = subprocess.Popen(
+            [
+                binary,
+                "--model",
+                model,
+                "--length_scale",
+                str(length_scale),
+                "--json-input",
+                "--output_dir",
+                self._tmpdir.name,
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+
+    def synthesize(self, text: str) -> tuple[np.ndarray, int]:
+        if self.process.poll() is not None:
+            raise RuntimeError(f"piper server exited with code {self.process.returncode}")
+        self._counter += 1
+        output_path = Path(self._tmpdir.name) / f"{self._counter}.wav"
+        assert self.process.stdin is not None and self.process.stdout is not None
+        self.process.stdin.write(json.dumps({"text": text, "output_file": str(output_path)}) + "\n")
+        self.process.stdin.flush()
+        if not self.process.stdout.readline():
+            raise RuntimeError("piper server closed its output")
+        try:
+            audio, sr = sf.read(output_path, dtype="float32")
+        finally:
+            output_path.unlink(missing_ok=True)
+        return audio, int(sr)
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            try:
+                if self.process.stdin is not None:
+                    self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except Exception:
+                self.process.kill()
+        self._tmpdir.cleanup()
+
+
+class _PiperServerPool:
+    def __init__(self, binary: str, model: str, length_scale: float, max_workers: int) -> None:
+        self.binary = binary
+        self.model = model
+        self.length_scale = length_scale
+        self.max_workers = max(1, max_workers)
+        self.broken = False
+        self._idle: list[_PiperServer] = []
+        self._count = 0
+        self._cond = threading.Condition()
+
+    def _acquire(self) -> _PiperServer:
+        with self._cond:
+            while not self._idle and self._count >= self.max_workers:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._count += 1
+        try:
+            return _PiperServer(self.binary, self.model, self.length_scale)
+        except Exception:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+    def synthesize(self, text: str) -> tuple[np.ndarray, int]:
+        server = self._acquire()
+        try:
+            result = server.synthesize(text)
+        except Exception:
+            server.close()
+            with self._cond:
+                self._count -= 1
+                self.broken = True
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._idle.append(server)
+            self._cond.notify()
+        return result
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+        for server in idle:
+            server.close()
+
+
+def _server_pool(binary: str, model: str, length_scale: float, max_workers: int) -> _PiperServerPool:
+    key = (binary, model, length_scale)
+    with _REGISTRY_LOCK:
+        pool = _SERVER_POOLS.get(key)
+        if pool is None:
+            pool = _PiperServerPool(binary, model, length_scale, max_workers)
+            _SERVER_POOLS[key] = pool
+        else:
+            pool.max_workers = max(pool.max_workers, max_workers)
+    return pool
+
+
+def shutdown_piper_workers() -> None:
+    with _REGISTRY_LOCK:
+        pools = list(_SERVER_POOLS.values())
+        _SERVER_POOLS.clear()
+        _VOICES.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(shutdown_piper_workers)
+
 
 class PiperTTSProvider:
-    def __init__(self, sample_rate: int, model_path: str | None = None) -> None:
+    def __init__(
+        self,
+        sample_rate: int,
+        model_path: str | None = None,
+        backend: str = "auto",
+        max_workers: int = 1,
+    ) -> None:
+        if backend not in PIPER_BACKENDS:
+            raise ValueError(
+                f"Unknown piper backend {backend!r}. Supported: {', '.join(PIPER_BACKENDS)}."
+            )
         self.sample_rate = sample_rate
         self.model_path = model_path
+        self.backend = backend
+        self.max_workers = max_workers
 
     def list_voices(self) -> list[str]:
         return []
 
     def synthesize(self, text: str, voice: str | None, settings: dict) -> object:
-        binary = shutil.which("piper")
-        if not binary:
-            raise RuntimeError("piper binary not found in PATH")
         model = settings.get("model_path") or self.model_path or voice
         if not model:
             raise RuntimeError("piper model_path or voice is required")
         length_scale = 1.0 / max(0.1, float(settings.get("rate", 1.0)))
+        audio: np.ndarray | None = None
+        sr = self.sample_rate
+        if self.backend in ("auto", "python"):
+            piper_voice = _load_piper_voice(str(model))
+            if piper_voice is not None:
+                audio, sr = _synthesize_in_process(piper_voice, text, length_scale)
+            elif self.backend == "python":
+                raise RuntimeError("piper Python bindings are not installed")
+        if audio is None:
+            binary = shutil.which("piper")
+            if not binary:
+                raise RuntimeError("piper binary not found in PATH")
+            if self.backend in ("auto", "server"):
+                pool = _server_pool(binary, str(model), length_scale, self.max_workers)
+                if not pool.broken:
+                    try:
+                        audio, sr = pool.synthesize(text)
+                    except Exception as exc:
+                        warnings.warn(
+                            f"piper server mode failed ({exc}); falling back to one process per line.",
+                            RuntimeWarning,
+                        )
+            if audio is None:
+                audio, sr = self._synthesize_subprocess(binary, str(model), text, length_scale)
+        if sr != self.sample_rate:
+            audio = resample_audio(audio, sr, self.sample_rate)
+        return audio
+
+    def _synthesize_subprocess(
+        self,
+        binary: str,
+        model: str,
+        text: str,
+        length_scale: float,
+    ) -> tuple[np.ndarray, int]:
         with tempfile.TemporaryDirectory() as tmpdir:
             output_path = Path(tmpdir) / "tts.wav"
             cmd = [
                 binary,
                 "--model",
-                str(model),
+                model,
                 "--output_file",
                 str(output_path),
                 "--length_scale",
@@ -39,6 +249,4 @@ class PiperTTSProvider:
             ]
             subprocess.run(cmd, input=text.encode("utf-8"), check=True)
             audio, sr = sf.read(output_path, dtype="float32")
-            if sr != self.sample_rate:
-                audio = resample_audio(audio, sr, self.sample_rate)
-            return audio
+            return audio, int(sr)
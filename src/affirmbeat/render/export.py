@@ -1,11 +1,170 @@
 from __future__ import annotations
 
 import json
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+import numpy as np
 import soundfile as sf
 
+from affirmbeat.render.timing import Profiler, span
+
+# A block source returns ``frames`` stereo float32 samples starting at ``start``.
+BlockSource = Callable[[int, int], np.ndarray]
+
+# Export format name -> libsndfile format, file extension and subtypes (the
+# first one is the default).
+EXPORT_CONTAINERS: dict[str, tuple[str, str, tuple[str, ...]]] = {
+    "wav": ("WAV", ".wav", ("PCM_16", "PCM_24", "FLOAT")),
+    "flac": ("FLAC", ".flac", ("PCM_16", "PCM_24")),
+    "ogg": ("OGG", ".ogg", ("VORBIS",)),
+    "opus": ("OGG", ".opus", ("OPUS",)),
+}
+EXPORT_SUBTYPES = ("PCM_16", "PCM_24", "FLOAT")
+OPUS_SAMPLE_RATES = (8_000, 12_000, 16_000, 24_000, 48_000)
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    container: str
+    format: str
+    subtype: str
+    extension: str
+
+
+DEFAULT_EXPORT = ExportFormat("wav", "WAV", "PCM_16", ".wav")
+
+
+def array_source(audio: object) -> BlockSource:
+    return lambda start, frames: np.asarray(audio[start : start + frames], dtype=np.float32)
+
+
+def write_report(output_dir: Path, report: dict[str, Any]) -> None:
+    report_path = output_dir / "render_report.json"
+    report_path.write_text(json.dumps(report, indent=2))
+
+
+def export_format(
+    container: str = "wav", subtype: str | None = None, sample_rate: int | None = None
+) -> ExportFormat:
+    if container not in EXPORT_CONTAINERS:
+        raise ValueError(f"Unknown export format '{container}'. Supported: {', '.join(EXPORT_CONTAINERS)}.")
+    sf_format, extension, subtypes = EXPORT_CONTAINERS[container]
+    if subtype is None:
+        subtype = subtypes[0]
+    elif subtype not in subtypes:
+        raise ValueError(f"Export format '{container}' supports subtypes: {', '.join(subtypes)}.")
+    if container == "opus" and sample_rate is not None and sample_rate not in OPUS_SAMPLE_RATES:
+        rates = ", ".join(str(rate) for rate in OPUS_SAMPLE_RATES)
+        raise ValueError(f"Opus export needs a sample rate of {rates} Hz, got {sample_rate}.")
+    return ExportFormat(container, sf_format, subtype, extension)
+
+
+def select_stems(names: list[str], selection: str | list[str]) -> list[str]:
+    if selection == "all":
+        return list(names)
+    if selection == "none":
+        return []
+    unknown = [name for name in selection if name not in names]
+    if unknown:
+        raise ValueError(f"Unknown stem(s): {', '.join(unknown)}. Available: {', '.join(names)}.")
+    return [name for name in names if name in selection]
+
+
+def clear_outputs(output_dir: Path) -> None:
+    # Drop audio from earlier renders so a changed format or stem selection
+    # doesn't leave stale files next to the new ones.
+    extensions = {extension for _, extension, _ in EXPORT_CONTAINERS.values()}
+    paths = [*output_dir.glob("final.*"), *(output_dir / "stems").glob("*")]
+    for path in paths:
+        if path.suffix in extensions and path.is_file():
+            path.unlink()
+
+
+class FileEncoder:
+    # Encodes one output file. With a pool, each block is written on the pool
+    # while the caller produces the next one; writes to one file stay in
+    # order because each waits for the previous. close() returns the file's
+    # size and the time spent encoding it.
+    def __init__(
+        self,
+        path: Path,
+        sample_rate: int,
+        export: ExportFormat = DEFAULT_EXPORT,
+        pool: Executor | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
+        self.path = path
+        self._handle = sf.SoundFile(
+            path, "w", sample_rate, 2, subtype=export.subtype, format=export.format
+        )
+        self._pool = pool
+        self._profiler = profiler
+        self._pending: Future | None = None
+        self._samples = 0
+        self._encode_sec = 0.0
+        self.stats: dict[str, Any] | None = None
+
+    def __enter__(self) -> "FileEncoder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _write(self, block: np.ndarray) -> None:
+        started = time.perf_counter()
+        with span(self._profiler, "export.write", len(block)):
+            self._handle.write(block)
+        self._encode_sec += time.perf_counter() - started
+        self._samples += len(block)
+
+    def _wait(self) -> None:
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def write(self, block: np.ndarray) -> None:
+        self._wait()
+        if self._pool is None:
+            self._write(block)
+        else:
+            self._pending = self._pool.submit(self._write, block)
+
+    def close(self) -> dict[str, Any]:
+        if self.stats is not None:
+            return self.stats
+        try:
+            self._wait()
+        finally:
+            started = time.perf_counter()
+            self._handle.close()
+            self._encode_sec += time.perf_counter() - started
+        self.stats = {
+            "bytes": self.path.stat().st_size,
+            "encode_sec": self._encode_sec,
+            "samples": self._samples,
+        }
+        return self.stats
+
+
+def write_source(
+    path: Path,
+    sample_rate: int,
+    total_samples: int,
+    source: BlockSource,
+    block_samples: int,
+    profiler: Profiler | None = None,
+    export: ExportFormat = DEFAULT_EXPORT,
+) -> dict[str, Any]:
+    block_samples = max(1, block_samples)
+    with FileEncoder(path, sample_rate, export, profiler=profiler) as encoder:
+        for start in range(0, total_samples, block_samples):
+            encoder.write(source(start, min(block_samples, total_samples - start)))
+    return encoder.stats
+
 
 def export_audio(
     output_dir: Path,
@@ -13,13 +172,44 @@ def export_audio(
     master: object,
     stems: dict[str, object],
     report: dict[str, Any],
+    total_samples: int | None = None,
+    block_samples: int = 1 << 18,
+    profiler: Profiler | None = None,
+    export: ExportFormat = DEFAULT_EXPORT,
+    workers: int = 4,
 ) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
-    master_path = output_dir / "final.wav"
-    sf.write(master_path, master, sample_rate)
     stems_dir = output_dir / "stems"
     stems_dir.mkdir(exist_ok=True)
-    for name, audio in stems.items():
-        sf.write(stems_dir / f"{name}.wav", audio, sample_rate)
-    report_path = output_dir / "render_report.json"
-    report_path.write_text(json.dumps(report, indent=2))
+    clear_outputs(output_dir)
+    files = {f"final{export.extension}": master}
+    files.update({f"stems/{name}{export.extension}": audio for name, audio in stems.items()})
+
+    def encode(relative: str, audio: object) -> dict[str, Any]:
+        if callable(audio):
+            length = total_samples if total_samples is not None else len(master)
+            source = audio
+        else:
+            length, source = len(audio), array_source(audio)
+        return write_source(
+            output_dir / relative, sample_rate, length, source, block_samples, profiler, export
+        )
+
+    # libsndfile releases the GIL while encoding, so files are written side by side.
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="export") as pool:
+        futures = {relative: pool.submit(encode, relative, audio) for relative, audio in files.items()}
+        written = {relative: future.result() for relative, future in futures.items()}
+    report["export"] = export_report(export, list(stems), workers, written)
+
+
+def export_report(
+    export: ExportFormat, stems: list[str], workers: int, files: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    return {
+        "format": export.container,
+        "subtype": export.subtype,
+        "stems": stems,
+        "workers": workers,
+        "files": files,
+        "bytes": sum(stats["bytes"] for stats in files.values()),
+    }
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+import uuid
+import warnings
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from affirmbeat.core.audio_cache import process_audio_cache
+from affirmbeat.core.hashing import hash_dict
+from affirmbeat.core.project import Project
+from affirmbeat.render.renderer import render_project, warm_up_providers
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+ACTIVE_STATES = ("queued", "running")
+# Progress is written to the job table at most this often (stage changes are
+# always written); cancellation is noticed on the same beat. Renders report
+# after every TTS batch and music chunk, so a cancel lands within one of those.
+PROGRESS_INTERVAL_SEC = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    project_path TEXT NOT NULL,
+    project_hash TEXT NOT NULL,
+    state TEXT NOT NULL,
+    stage TEXT NOT NULL DEFAULT '',
+    progress REAL NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    pid INTEGER,
+    output TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created_at);
+"""
+
+
+class RenderCancelled(Exception):
+    pass
+
+
+def project_hash(project_path: Path) -> str:
+    # The output folder sits next to the project file, so the same project
+    # saved under two paths is two different jobs.
+    return hash_dict(
+        {
+            "path": str(project_path.resolve()),
+            "project": json.loads(project_path.read_text()),
+        }
+    )
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class JobQueue:
+    # Render jobs in a SQLite table shared by every process on the box: the
+    # web UI submits and polls, worker processes claim and run them. At most
+    # ``concurrency`` jobs run at once however many workers are polling, and
+    # identical queued or running jobs (same project hash) are merged.
+    def __init__(self, db_path: Path, concurrency: int = 1) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.db_path = db_path
+        self.concurrency = concurrency
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front, so check-then-update
+        # sequences (dedup, claim) can't interleave across processes.
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _job(row: sqlite3.Row | None) -> dict[str, Any] | None:
+        if row is None:
+            return None
+        job = dict(row)
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def submit(self, project_path: Path) -> str:
+        digest = project_hash(project_path)
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE project_hash = ? AND state IN (?, ?) "
+                "AND cancel_requested = 0 ORDER BY created_at LIMIT 1",
+                (digest, *ACTIVE_STATES),
+            ).fetchone()
+            if row is not None:
+                return row["id"]
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, project_path, project_hash, state, created_at) "
+                "VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, str(project_path.resolve()), digest, time.time()),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with closing(self._connect()) as conn:
+            return self._job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def jobs(self, limit: int = 20) -> list[dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._job(row) for row in rows]
+
+    def cancel(self, job_id: str) -> bool:
+        # Queued jobs are cancelled at once; running ones are flagged and stop
+        # at their next progress update.
+        with self._transaction() as conn:
+            row = conn.execute("SELECT state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row["state"] not in ACTIVE_STATES:
+                return False
+            if row["state"] == "queued":
+                conn.execute(
+                    "UPDATE jobs SET state = 'cancelled', cancel_requested = 1, finished_at = ? "
+                    "WHERE id = ?",
+                    (time.time(), job_id),
+                )
+            else:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+        return True
+
+    def claim(self) -> dict[str, Any] | None:
+        with self._transaction() as conn:
+            # Jobs whose worker died can never finish; fail them so they stop
+            # counting against the concurrency limit.
+            for row in conn.execute("SELECT id, pid FROM jobs WHERE state = 'running'").fetchall():
+                if row["pid"] is None or not _pid_alive(row["pid"]):
+                    conn.execute(
+                        "UPDATE jobs SET state = 'failed', error = 'worker exited', finished_at = ? "
+                        "WHERE id = ?",
+                        (time.time(), row["id"]),
+                    )
+            running = conn.execute("SELECT COUNT(*) FROM jobs WHERE state = 'running'").fetchone()[0]
+            if running >= self.concurrency:
+                return None
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE state = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = 'running', pid = ?, started_at = ? WHERE id = ?",
+                (os.getpid(), time.time(), row["id"]),
+            )
+        return self.get(row["id"])
+
+    def update_progress(self, job_id: str, stage: str, fraction: float) -> bool:
+        # Returns whether the job has been asked to stop.
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, progress = ? WHERE id = ?", (stage, fraction, job_id)
+            )
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def finish(
+        self, job_id: str, state: str, output: str | None = None, error: str | None = None
+    ) -> None:
+        if state not in JOB_STATES or state in ACTIVE_STATES:
+            raise ValueError(f"Cannot finish a job as '{state}'.")
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, output = ?, error = ?, finished_at = ?, "
+                "progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END WHERE id = ?",
+                (state, output, error, time.time(), state, job_id),
+            )
+
+    def start_workers(
+        self, count: int | None = None, warm_up: Path | None = None
+    ) -> list[multiprocessing.Process]:
+        # Spawned rather than forked: the caller (Streamlit) is multi-threaded.
+        # ``warm_up`` names a project whose models each worker loads on start.
+        context = multiprocessing.get_context("spawn")
+        workers = []
+        for _ in range(count if count is not None else self.concurrency):
+            worker = context.Process(
+                target=run_worker,
+                args=(self.db_path, self.concurrency),
+                kwargs={"parent_pid": os.getpid(), "warm_up": warm_up},
+                daemon=True,
+            )
+            worker.start()
+            workers.append(worker)
+        return workers
+
+
+def run_job(queue: JobQueue, job: dict[str, Any]) -> None:
+    job_id = job["id"]
+    last = {"stage": None, "time": 0.0}
+
+    def progress(stage: str, fraction: float) -> None:
+        now = time.monotonic()
+        if stage == last["stage"] and now - last["time"] < PROGRESS_INTERVAL_SEC:
+            return
+        last["stage"], last["time"] = stage, now
+        if queue.update_progress(job_id, stage, fraction) and stage != "done":
+            raise RenderCancelled(job_id)
+
+    try:
+        output = render_project(
+            Path(job["project_path"]), audio_cache=process_audio_cache(), progress=progress
+        )
+    except RenderCancelled:
+        queue.finish(job_id, "cancelled")
+    except Exception as exc:
+        queue.finish(job_id, "failed", error=f"{type(exc).__name__}: {exc}")
+    else:
+        queue.finish(job_id, "done", output=str(output))
+
+
+def _warm_up(project_path: Path) -> None:
+    try:
+        warm_up_providers(Project.model_validate(json.loads(project_path.read_text())))
+    except Exception as exc:
+        warnings.warn(f"Could not warm up providers for {project_path}: {exc}", RuntimeWarning)
+
+
+def run_worker(
+    db_path: Path,
+    concurrency: int = 1,
+    poll_sec: float = 0.5,
+    stop_when_idle: bool = False,
+    parent_pid: int | None = None,
+    warm_up: Path | None = None,
+) -> None:
+    queue = JobQueue(db_path, concurrency)
+    # Models stay loaded for the life of the worker; without a project to
+    # warm up from, the first claimed job's project is used.
+    warmed = warm_up is not None
+    if warm_up is not None:
+        _warm_up(warm_up)
+    while parent_pid is None or os.getppid() == parent_pid:
+        job = queue.claim()
+        if job is not None:
+            if not warmed:
+                _warm_up(Path(job["project_path"]))
+                warmed = True
+            run_job(queue, job)
+            continue
+        if stop_when_idle:
+            return
+        time.sleep(poll_sec)
@@ -1,9 +1,46 @@
 from __future__ import annotations
 
+import math
+from typing import Any
+
 import numpy as np
 
-from affirmbeat.dsp.limiter import apply_peak_limiter
-from affirmbeat.dsp.loudness import apply_loudness
+from affirmbeat.dsp.limiter import LookaheadLimiter, limit_in_blocks
+from affirmbeat.dsp.loudness import loudness_gain, measure_loudness
+from affirmbeat.render.timing import Profiler, span
+
+
+def master_mix(
+    mix: np.ndarray,
+    master_peak_db: float,
+    sample_rate: int,
+    target_lufs: float | None,
+    lookahead_ms: float = 5.0,
+    release_ms: float = 100.0,
+    true_peak: bool = False,
+    report: dict[str, Any] | None = None,
+    profiler: Profiler | None = None,
+) -> np.ndarray:
+    if target_lufs is not None:
+        with span(profiler, "loudness", mix.shape[0]):
+            measured = measure_loudness(mix, sample_rate)
+            gain = loudness_gain(measured, target_lufs)
+            mix = (mix * np.float32(gain)).astype(np.float32)
+        if report is not None:
+            # Silence measures -inf, which is not valid JSON.
+            report["loudness"] = {
+                "measured_lufs": measured if math.isfinite(measured) else None,
+                "target_lufs": target_lufs,
+                "gain_db": 20.0 * math.log10(gain),
+            }
+    if mix.size == 0:
+        return mix.astype(np.float32)
+    with span(profiler, "limiter", mix.shape[0]):
+        limiter = LookaheadLimiter(sample_rate, master_peak_db, lookahead_ms, release_ms, true_peak)
+        mix = limit_in_blocks(limiter, mix)
+    if report is not None:
+        report["limiter"] = limiter.stats()
+    return mix
 
 
 def mix_tracks(
@@ -18,7 +55,4 @@ def mix_tracks(
     mix = np.zeros((total_samples, 2), dtype=np.float32)
     for track_audio in tracks.values():
         mix[: track_audio.shape[0]] += track_audio
-    if target_lufs is not None:
-        mix = apply_loudness(mix, sample_rate, target_lufs)
-    mix = apply_peak_limiter(mix, master_peak_db)
-    return mix.astype(np.float32)
+    return master_mix(mix, master_peak_db, sample_rate, target_lufs)
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from collections import OrderedDict, deque
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import numpy as np
-import soundfile as sf
 
+from affirmbeat.core.cache import CacheStore, open_cache
 from affirmbeat.core.hashing import hash_dict
-from affirmbeat.core.paths import cache_dir
 from affirmbeat.core.project import Project
 from affirmbeat.dsp.fades import equal_power_fade
+from affirmbeat.render.timing import Profiler, span
 
 
 def _ensure_stereo(audio: np.ndarray) -> np.ndarray:
@@ -33,19 +38,6 @@ def _pad_or_trim(audio: np.ndarray, target_samples: int) -> np.ndarray:
     return np.concatenate([audio, pad], axis=0)
 
 
-def _crossfade_two(a: np.ndarray, b: np.ndarray, fade_samples: int) -> np.ndarray:
-    if fade_samples <= 0:
-        return np.concatenate([a, b], axis=0)
-    fade = min(fade_samples, a.shape[0], b.shape[0])
-    if fade <= 0:
-        return np.concatenate([a, b], axis=0)
-    fade_in, fade_out = equal_power_fade(fade)
-    fade_in = fade_in[:, None]
-    fade_out = fade_out[:, None]
-    blended = a[-fade:] * fade_out + b[:fade] * fade_in
-    return np.concatenate([a[:-fade], blended, b[fade:]], axis=0)
-
-
 def _music_cache_key(
     project: Project,
     prompt: str,
@@ -53,88 +45,296 @@ def _music_cache_key(
     duration_sec: float,
     chunk_index: int,
 ) -> str:
-    return hash_dict(
-        {
-            "provider": project.music.provider,
-            "prompt": prompt,
-            "seed": seed,
-            "duration_sec": duration_sec,
-            "chunk_index": chunk_index,
-            "sample_rate": project.sample_rate,
-            "model_id": project.music.model_id,
-            "steps": project.music.steps,
-            "guidance_scale": project.music.guidance_scale,
-            "sigma_min": project.music.sigma_min,
-            "sigma_max": project.music.sigma_max,
-            "sampler": project.music.sampler,
-            "bpm": project.music.bpm,
+    payload: dict[str, Any] = {
+        "provider": project.music.provider,
+        "prompt": prompt,
+        "seed": seed,
+        "duration_sec": duration_sec,
+        "chunk_index": chunk_index,
+        "sample_rate": project.sample_rate,
+        "model_id": project.music.model_id,
+        "steps": project.music.steps,
+        "guidance_scale": project.music.guidance_scale,
+        "sigma_min": project.music.sigma_min,
+        "sigma_max": project.music.sigma_max,
+        "sampler": project.music.sampler,
+        "bpm": project.music.bpm,
+    }
+    if project.music.provider == "stable_audio_open":
+        # These change the numerics of the diffusion run.
+        payload["torch"] = {
+            "threads": project.music.torch_threads,
+            "inference_mode": project.music.inference_mode,
+            "precision": project.music.precision,
+            "compile": project.music.compile,
         }
-    )
+    return hash_dict(payload)
 
 
-def _load_or_generate_music_chunk(
-    project: Project,
-    project_path: Path,
-    provider,
-    duration_sec: float,
-    seed: int,
-    chunk_index: int,
-    report: dict[str, Any],
-) -> np.ndarray:
-    cache_root = cache_dir(project_path) / "music"
-    cache_root.mkdir(parents=True, exist_ok=True)
-    cache_key = _music_cache_key(project, project.music.prompt, seed, duration_sec, chunk_index)
-    cache_path = cache_root / f"{cache_key}.wav"
-    if cache_path.exists():
-        audio, _ = sf.read(cache_path, dtype="float32")
-        report["music_cached"].append(cache_path.name)
-        return audio
-    audio = provider.generate(
-        project.music.prompt,
-        duration_sec,
-        seed,
-        project.music.bpm,
-    )
-    sf.write(cache_path, audio, project.sample_rate)
-    report["music_generated"].append(cache_path.name)
-    return audio
-
-
-def build_music_bed(project: Project, project_path: Path, provider, report: dict[str, Any]) -> np.ndarray:
+@dataclass(frozen=True)
+class MusicChunkSpec:
+    index: int
+    seed: int
+    duration_sec: float
+    start: int
+    frames: int
+    fade_in: int
+    cache_key: str
+
+
+@dataclass
+class MusicPlan:
+    specs: list[MusicChunkSpec]
+    generated: set[int]
+
+
+def plan_music_chunks(project: Project) -> list[MusicChunkSpec]:
     total_samples = int(project.duration_sec * project.sample_rate)
     if total_samples <= 0:
-        return np.zeros((0, 2), dtype=np.float32)
+        return []
     chunk_sec = min(project.music.chunk_sec, project.duration_sec)
-    if chunk_sec <= 0:
-        return np.zeros((total_samples, 2), dtype=np.float32)
     fade_sec = max(0.0, project.music.crossfade_ms / 1000.0)
     if project.music.build_mode != "loop_crossfade":
         chunk_sec = project.duration_sec
         fade_sec = 0.0
     fade_samples = int(fade_sec * project.sample_rate)
 
-    output: np.ndarray | None = None
-    idx = 0
-    while output is None or output.shape[0] < total_samples:
+    # Chunk i > 0 is generated fade_sec longer and overlaps the tail of the bed
+    # by the crossfade, so every chunk after the first extends the bed by chunk_sec.
+    specs: list[MusicChunkSpec] = []
+    end = 0
+    while end < total_samples:
+        idx = len(specs)
         gen_sec = chunk_sec
-        if output is not None and fade_samples > 0:
+        if idx > 0 and fade_samples > 0:
             gen_sec = chunk_sec + fade_sec
+        frames = int(gen_sec * project.sample_rate)
+        fade = min(fade_samples, end, frames) if idx > 0 else 0
+        start = end - fade
         seed = project.music.seed + idx
-        chunk = _load_or_generate_music_chunk(
-            project,
-            project_path,
-            provider,
-            gen_sec,
-            seed,
-            idx,
-            report,
+        specs.append(
+            MusicChunkSpec(
+                index=idx,
+                seed=seed,
+                duration_sec=gen_sec,
+                start=start,
+                frames=frames,
+                fade_in=fade,
+                cache_key=_music_cache_key(project, project.music.prompt, seed, gen_sec, idx),
+            )
         )
-        chunk = _ensure_stereo(chunk)
-        chunk = _pad_or_trim(chunk, int(gen_sec * project.sample_rate))
-        if output is None:
-            output = chunk
-        else:
-            output = _crossfade_two(output, chunk, fade_samples)
-        idx += 1
-    output = _pad_or_trim(output, total_samples)
+        end = start + frames
+    return specs
+
+
+def _generate_chunks(
+    project: Project,
+    provider,
+    specs: list[MusicChunkSpec],
+    workers: int,
+    profiler: Profiler | None = None,
+    stop: threading.Event | None = None,
+) -> Iterator[tuple[MusicChunkSpec, np.ndarray]]:
+    prompt = project.music.prompt
+    bpm = project.music.bpm
+    if not getattr(provider, "parallel_safe", True):
+        workers = 1
+
+    def generate(spec: MusicChunkSpec) -> np.ndarray:
+        if stop is not None and stop.is_set():
+            raise CancelledError()
+        with span(profiler, "music.generate", spec.frames):
+            return provider.generate(prompt, spec.duration_sec, spec.seed, bpm)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(specs))))
+    try:
+        yield from zip(specs, pool.map(generate, specs))
+    finally:
+        # After a failure (e.g. a cancelled render) queued chunks are dropped.
+        pool.shutdown(cancel_futures=True)
+
+
+def prepare_music_chunks(
+    project: Project,
+    project_path: Path,
+    provider,
+    report: dict[str, Any],
+    cache: CacheStore | None = None,
+    workers: int = 1,
+    profiler: Profiler | None = None,
+    stop: threading.Event | None = None,
+) -> MusicPlan:
+    # ``stop`` ends generation before the next chunk (the render has failed).
+    if cache is None:
+        cache = open_cache(project, project_path)
+    specs = plan_music_chunks(project)
+    cached_files = {spec.index: cache.contains("music", spec.cache_key) for spec in specs}
+    missing = [spec for spec in specs if cached_files[spec.index] is None]
+    if missing:
+        # Chunks are written as they finish so only a few are held in memory.
+        for spec, audio in _generate_chunks(project, provider, missing, workers, profiler, stop):
+            cached_files[spec.index] = cache.write_audio(
+                "music", spec.cache_key, audio, project.sample_rate
+            ).name
+    generated = {spec.index for spec in missing}
+    for spec in specs:
+        key = "music_generated" if spec.index in generated else "music_cached"
+        report[key].append(cached_files[spec.index])
+    return MusicPlan(specs=specs, generated=generated)
+
+
+def _load_chunk(
+    project: Project,
+    provider,
+    spec: MusicChunkSpec,
+    cache: CacheStore,
+    profiler: Profiler | None = None,
+) -> np.ndarray:
+    with span(profiler, "music.load", spec.frames):
+        hit = cache.read_audio("music", spec.cache_key)
+    if hit is not None:
+        chunk = hit[0]
+    else:
+        # Evicted or corrupted since it was prepared; regenerate it.
+        with span(profiler, "music.generate", spec.frames):
+            chunk = provider.generate(project.music.prompt, spec.duration_sec, spec.seed, project.music.bpm)
+            cache.write_audio("music", spec.cache_key, chunk, project.sample_rate)
+    return _pad_or_trim(_ensure_stereo(chunk), spec.frames)
+
+
+def _iter_chunks(
+    project: Project,
+    provider,
+    specs: list[MusicChunkSpec],
+    cache: CacheStore,
+    workers: int,
+    profiler: Profiler | None = None,
+) -> Iterator[tuple[MusicChunkSpec, np.ndarray]]:
+    # Keep up to ``workers`` chunk reads in flight ahead of the consumer.
+    pending: deque[tuple[MusicChunkSpec, Future]] = deque()
+    remaining = iter(specs)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for spec in islice(remaining, max(1, workers)):
+            pending.append((spec, pool.submit(_load_chunk, project, provider, spec, cache, profiler)))
+        while pending:
+            spec, future = pending.popleft()
+            following = next(remaining, None)
+            if following is not None:
+                pending.append(
+                    (following, pool.submit(_load_chunk, project, provider, following, cache, profiler))
+                )
+            yield spec, future.result()
+
+
+def _place_chunk(output: np.ndarray, out_start: int, chunk: np.ndarray, spec: MusicChunkSpec) -> None:
+    # Writes the part of ``chunk`` that falls inside ``output`` (which begins at
+    # bed position ``out_start``), crossfading into what is already there.
+    lo = max(out_start, spec.start)
+    hi = min(out_start + output.shape[0], spec.start + spec.frames)
+    if hi <= lo:
+        return
+    fade_end = spec.start + spec.fade_in
+    if spec.fade_in > 0 and lo < fade_end:
+        fade_in, fade_out = equal_power_fade(spec.fade_in)
+        f_lo = lo - spec.start
+        f_hi = min(hi, fade_end) - spec.start
+        region = output[lo - out_start : lo - out_start + (f_hi - f_lo)]
+        region *= fade_out[f_lo:f_hi, None]
+        region += chunk[f_lo:f_hi] * fade_in[f_lo:f_hi, None]
+        lo = spec.start + f_hi
+    if hi > lo:
+        output[lo - out_start : hi - out_start] = chunk[lo - spec.start : hi - spec.start]
+
+
+def build_music_bed(
+    project: Project,
+    project_path: Path,
+    provider,
+    report: dict[str, Any],
+    cache: CacheStore | None = None,
+    plan: MusicPlan | None = None,
+    workers: int = 1,
+    profiler: Profiler | None = None,
+) -> np.ndarray:
+    if cache is None:
+        cache = open_cache(project, project_path)
+    if plan is None:
+        plan = prepare_music_chunks(project, project_path, provider, report, cache, workers)
+    total_samples = int(project.duration_sec * project.sample_rate)
+    if total_samples <= 0:
+        return np.zeros((0, 2), dtype=np.float32)
+    output = np.zeros((total_samples, 2), dtype=np.float32)
+    for spec, chunk in _iter_chunks(project, provider, plan.specs, cache, workers, profiler):
+        with span(profiler, "music.place", spec.frames):
+            _place_chunk(output, 0, chunk, spec)
     return output
+
+
+# Read-only, array-like view of the music bed that assembles windows from the
+# cached chunks on demand, so a streaming render never holds the whole bed.
+class MusicBed:
+    ndim = 2
+    dtype = np.dtype(np.float32)
+
+    def __init__(
+        self,
+        project: Project,
+        project_path: Path,
+        provider,
+        report: dict[str, Any],
+        cache: CacheStore | None = None,
+        plan: MusicPlan | None = None,
+        workers: int = 1,
+        profiler: Profiler | None = None,
+    ) -> None:
+        self._project = project
+        self._provider = provider
+        self._profiler = profiler
+        self._cache = cache if cache is not None else open_cache(project, project_path)
+        if plan is None:
+            plan = prepare_music_chunks(project, project_path, provider, report, self._cache, workers)
+        self._specs = plan.specs
+        self._starts = np.array([spec.start for spec in self._specs], dtype=np.int64)
+        self._loaded: OrderedDict[int, np.ndarray] = OrderedDict()
+        self.shape = (int(project.duration_sec * project.sample_rate), 2)
+
+    @property
+    def size(self) -> int:
+        return self.shape[0] * self.shape[1]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def _chunk(self, spec: MusicChunkSpec) -> np.ndarray:
+        chunk = self._loaded.get(spec.index)
+        if chunk is None:
+            chunk = _load_chunk(self._project, self._provider, spec, self._cache, self._profiler)
+            self._loaded[spec.index] = chunk
+            while len(self._loaded) > 2:
+                self._loaded.popitem(last=False)
+        return chunk
+
+    def read(self, start: int, frames: int) -> np.ndarray:
+        start = max(0, start)
+        frames = max(0, min(frames, self.shape[0] - start))
+        output = np.zeros((frames, 2), dtype=np.float32)
+        if frames == 0:
+            return output
+        first = max(0, int(np.searchsorted(self._starts, start, side="right")) - 2)
+        for spec in self._specs[first:]:
+            if spec.start >= start + frames:
+                break
+            if spec.start + spec.frames <= start:
+                continue
+            _place_chunk(output, start, self._chunk(spec), spec)
+        return output
+
+    def __getitem__(self, item) -> np.ndarray:
+        if not isinstance(item, slice) or item.step not in (None, 1):
+            raise TypeError("MusicBed only supports contiguous slices")
+        start, stop, _ = item.indices(self.shape[0])
+        return self.read(start, max(0, stop - start))
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        audio = self.read(0, self.shape[0])
+        return audio if dtype is None else audio.astype(dtype)
@@ -1,32 +1,55 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
-import soundfile as sf
 
+from affirmbeat.core.audio_cache import AudioLRUCache
+from affirmbeat.core.cache import CacheStore, open_cache
 from affirmbeat.core.hashing import hash_dict
-from affirmbeat.core.paths import cache_dir, output_dir
-from affirmbeat.core.project import Project
+from affirmbeat.core.paths import output_dir
+from affirmbeat.core.project import Project, ScriptConfig
 from affirmbeat.core.content_check import (
     find_content_warnings,
     find_content_warnings_for_texts,
 )
-from affirmbeat.dsp.binaural import generate_binaural
+from affirmbeat.dsp.binaural import BinauralOscillator
+from affirmbeat.dsp.limiter import LookaheadLimiter
 from affirmbeat.providers.music_file import FileMusicProvider
 from affirmbeat.providers.music_placeholder import PlaceholderMusicProvider
-from affirmbeat.providers.music_stable_audio import StableAudioOpenProvider
+from affirmbeat.providers.music_stable_audio import StableAudioOpenProvider, warm_up_stable_audio
 from affirmbeat.providers.tts_dummy import DummyTTSProvider
 from affirmbeat.providers.tts_espeak import EspeakTTSProvider
 from affirmbeat.providers.tts_piper1 import PiperTTSProvider
-from affirmbeat.render.export import export_audio
-from affirmbeat.render.mixer import mix_tracks
-from affirmbeat.render.music_bed import build_music_bed
-from affirmbeat.render.timeline import Clip, place_clips
-from affirmbeat.script.scheduler import build_utterance_plans
+from affirmbeat.render.export import (
+    BlockSource,
+    ExportFormat,
+    export_audio,
+    export_format,
+    select_stems,
+    write_report,
+)
+from affirmbeat.render.mixer import master_mix
+from affirmbeat.render.music_bed import (
+    MusicBed,
+    MusicPlan,
+    build_music_bed,
+    plan_music_chunks,
+    prepare_music_chunks,
+)
+from affirmbeat.render.stems import StemStore, stem_key
+from affirmbeat.render.streaming import render_streaming
+from affirmbeat.render.timing import TRACE_FORMATS, Profiler, span
+from affirmbeat.render.timeline import Clip, ClipTimeline, VoiceBus
+from affirmbeat.script.overlap_presets import OverlapVariant
+from affirmbeat.script.scheduler import UtterancePlan, build_utterance_plans
 
 
 def _load_project(path: Path) -> Project:
@@ -34,17 +57,22 @@ def _load_project(path: Path) -> Project:
     return Project.model_validate(data)
 
 
-def _tts_provider(project: Project):
+def _tts_provider(project: Project, workers: int = 1):
     if project.tts.provider == "piper1":
-        return PiperTTSProvider(project.sample_rate, project.tts.model_path)
+        return PiperTTSProvider(
+            project.sample_rate,
+            project.tts.model_path,
+            backend=project.tts.piper_backend,
+            max_workers=workers,
+        )
     if project.tts.provider == "espeak":
         return EspeakTTSProvider(project.sample_rate)
     return DummyTTSProvider(project.sample_rate)
 
 
-def _music_provider(project: Project):
+def _music_provider(project: Project, cache: CacheStore | None = None):
     if project.music.provider == "file":
-        return FileMusicProvider(project.sample_rate)
+        return FileMusicProvider(project.sample_rate, cache=cache)
     if project.music.provider == "stable_audio_open":
         model_id = project.music.model_id or "stabilityai/stable-audio-open-1.0"
         return StableAudioOpenProvider(
@@ -56,6 +84,10 @@ def _music_provider(project: Project):
             sigma_min=project.music.sigma_min,
             sigma_max=project.music.sigma_max,
             sampler=project.music.sampler,
+            torch_threads=project.music.torch_threads,
+            inference_mode=project.music.inference_mode,
+            precision=project.music.precision,
+            compile=project.music.compile,
         )
     if project.music.provider == "placeholder":
         return PlaceholderMusicProvider(project.sample_rate)
@@ -66,50 +98,402 @@ def _music_provider(project: Project):
     return PlaceholderMusicProvider(project.sample_rate)
 
 
+def warm_up_providers(project: Project) -> None:
+    # Loads heavyweight models into the process-wide registries ahead of the
+    # first render (web UI startup, long-running workers).
+    if project.music.provider == "stable_audio_open":
+        warm_up_stable_audio(
+            project.music.model_id or "stabilityai/stable-audio-open-1.0",
+            project.music.device,
+        )
+
+
 def _tts_cache_key(project: Project, text: str, voice: str | None) -> str:
-    return hash_dict(
-        {
-            "provider": project.tts.provider,
-            "voice": voice,
-            "rate": project.tts.rate,
-            "model_path": project.tts.model_path,
-            "text": text,
-            "sample_rate": project.sample_rate,
-        }
+    payload = {
+        "provider": project.tts.provider,
+        "voice": voice,
+        "rate": project.tts.rate,
+        "model_path": project.tts.model_path,
+        "text": text,
+        "sample_rate": project.sample_rate,
+    }
+    if project.tts.provider == "espeak":
+        # Older entries kept espeak's own edge silence on single lines but
+        # not on batched ones; keep them out of the cache.
+        payload["edges"] = "trimmed"
+    return hash_dict(payload)
+
+
+def _resolve_tts_jobs(
+    project: Project,
+    provider,
+    jobs: dict[str, tuple[str, str | None]],
+    workers: int,
+    audio_cache: AudioLRUCache,
+    cache: CacheStore,
+    report: dict[str, Any],
+    profiler: Profiler | None = None,
+) -> dict[str, np.ndarray]:
+    settings = {
+        "rate": project.tts.rate,
+        "model_path": project.tts.model_path,
+    }
+    resolved: dict[str, np.ndarray] = {}
+    misses: list[str] = []
+    for cache_key, (text, voice) in jobs.items():
+        started = time.perf_counter()
+        audio = audio_cache.get(cache_key)
+        if audio is not None:
+            path = cache.touch("tts", cache_key)
+            if path is None:
+                # Pruned from disk since it was loaded; store it again.
+                path = cache.write_audio("tts", cache_key, audio, project.sample_rate)
+            cache_file = path.name
+        else:
+            with span(profiler, "tts.cache_read") as record:
+                hit = cache.read_audio("tts", cache_key)
+                record.samples = len(hit[0]) if hit is not None else 0
+            if hit is None:
+                misses.append(cache_key)
+                continue
+            audio, cache_file = hit
+            audio = audio_cache.put(cache_key, audio)
+        resolved[cache_key] = audio
+        report["tts_cached"].append(cache_file)
+        report["tts_jobs"].append(
+            {
+                "cache_file": cache_file,
+                "text": text,
+                "voice": voice,
+                "cached": True,
+                "seconds": time.perf_counter() - started,
+            }
+        )
+
+    def synthesize(batch: list[str]) -> tuple[list[np.ndarray], list[str], float]:
+        started = time.perf_counter()
+        voice = jobs[batch[0]][1]
+        with span(profiler, "tts.synthesize") as record:
+            if len(batch) > 1:
+                audios = provider.synthesize_many([jobs[key][0] for key in batch], voice, settings)
+            else:
+                audios = [provider.synthesize(jobs[batch[0]][0], voice, settings)]
+            record.samples = sum(len(audio) for audio in audios)
+        with span(profiler, "tts.cache_write"):
+            names = [
+                cache.write_audio("tts", cache_key, audio, project.sample_rate).name
+                for cache_key, audio in zip(batch, audios)
+            ]
+        return audios, names, time.perf_counter() - started
+
+    batches: list[list[str]] = []
+    if hasattr(provider, "synthesize_many"):
+        # Batching providers render many lines per process; group by voice.
+        by_voice: dict[str | None, list[str]] = {}
+        for cache_key in misses:
+            by_voice.setdefault(jobs[cache_key][1], []).append(cache_key)
+        batch_size = getattr(provider, "batch_size", 32)
+        for keys in by_voice.values():
+            batches.extend(keys[i : i + batch_size] for i in range(0, len(keys), batch_size))
+    else:
+        batches = [[cache_key] for cache_key in misses]
+
+    if batches:
+        pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches))))
+        try:
+            for batch, (audios, names, seconds) in zip(batches, pool.map(synthesize, batches)):
+                for cache_key, audio, cache_file in zip(batch, audios, names):
+                    text, voice = jobs[cache_key]
+                    resolved[cache_key] = audio_cache.put(cache_key, audio)
+                    report["tts_generated"].append(cache_file)
+                    report["tts_jobs"].append(
+                        {
+                            "cache_file": cache_file,
+                            "text": text,
+                            "voice": voice,
+                            "cached": False,
+                            "seconds": seconds / len(batch),
+                            "batch_size": len(batch),
+                        }
+                    )
+        finally:
+            # After a failure (e.g. a cancelled render) queued batches are dropped.
+            pool.shutdown(cancel_futures=True)
+    return resolved
+
+
+@dataclass(frozen=True)
+class _VoiceSequence:
+    plans: list[UtterancePlan]
+    voice: str | None
+    start_sample: int
+    gap_samples: int
+    track_id: str | None = None
+    gain_db: float = 0.0
+    pan: float = 0.0
+
+
+def _plan_voice_sequences(project: Project) -> list[_VoiceSequence]:
+    allowed_modes = {"single", "triple_stack", "lead_whisper", "call_response"}
+    sequences: list[_VoiceSequence] = []
+    if not project.voice_tracks:
+        return [
+            _VoiceSequence(
+                plans=build_utterance_plans(
+                    [item.text for item in project.affirmations],
+                    project.script,
+                ),
+                voice=project.tts.voice,
+                start_sample=0,
+                gap_samples=int((project.script.gap_ms / 1000.0) * project.sample_rate),
+            )
+        ]
+    for track in project.voice_tracks:
+        if not track.lines:
+            continue
+        script_cfg = project.script
+        if track.mode:
+            if track.mode not in allowed_modes:
+                raise ValueError(
+                    f"Invalid track.mode '{track.mode}' for track '{track.id}'. "
+                    f"Supported modes: {', '.join(sorted(allowed_modes))}."
+                )
+            script_cfg = ScriptConfig.model_validate(
+                {**project.script.model_dump(), "mode": track.mode}
+            )
+        sequences.append(
+            _VoiceSequence(
+                plans=build_utterance_plans(track.lines, script_cfg),
+                voice=track.voice or project.tts.voice,
+                start_sample=int((track.start_offset_ms / 1000.0) * project.sample_rate),
+                gap_samples=int((script_cfg.gap_ms / 1000.0) * project.sample_rate),
+                track_id=track.id,
+                gain_db=track.gain_db,
+                pan=track.pan,
+            )
+        )
+    return sequences
+
+
+def _tts_jobs(
+    project: Project,
+    sequences: list[_VoiceSequence],
+) -> tuple[dict[str, tuple[str, str | None]], list[list[str]]]:
+    jobs: dict[str, tuple[str, str | None]] = {}
+    key_by_job: dict[tuple[str, str | None], str] = {}
+    sequence_keys: list[list[str]] = []
+    for sequence in sequences:
+        keys: list[str] = []
+        for plan in sequence.plans:
+            job = (plan.text, sequence.voice)
+            cache_key = key_by_job.get(job)
+            if cache_key is None:
+                cache_key = _tts_cache_key(project, plan.text, sequence.voice)
+                key_by_job[job] = cache_key
+                jobs[cache_key] = job
+            keys.append(cache_key)
+        sequence_keys.append(keys)
+    return jobs, sequence_keys
+
+
+def _sequence_tracks(sequence: _VoiceSequence) -> list[str]:
+    if sequence.track_id:
+        return [sequence.track_id]
+    tracks: dict[str, None] = {}
+    for plan in sequence.plans:
+        for variant in plan.variants:
+            tracks.setdefault(variant.track)
+    return list(tracks)
+
+
+def _voice_stem_keys(
+    project: Project,
+    sequences: list[_VoiceSequence],
+    total_samples: int,
+) -> dict[str, str]:
+    # A voice stem depends on the TTS audio of every utterance in the
+    # sequences feeding it (their lengths set the timing) and on the
+    # variants that land on that track.
+    _, sequence_keys = _tts_jobs(project, sequences)
+    payloads: dict[str, list[dict[str, Any]]] = {}
+    for sequence, keys in zip(sequences, sequence_keys):
+        for track in _sequence_tracks(sequence):
+            payloads.setdefault(track, []).append(
+                {
+                    "start_sample": sequence.start_sample,
+                    "gap_samples": sequence.gap_samples,
+                    "gain_db": sequence.gain_db,
+                    "pan": sequence.pan,
+                    "utterances": [
+                        [
+                            cache_key,
+                            [
+                                [variant.offset_ms, variant.gain_db, variant.pan]
+                                for variant in plan.variants
+                                if sequence.track_id or variant.track == track
+                            ],
+                        ]
+                        for plan, cache_key in zip(sequence.plans, keys)
+                    ],
+                }
+            )
+    return {
+        track: stem_key("voice", project.sample_rate, total_samples, {"track": track, "sequences": items})
+        for track, items in payloads.items()
+    }
+
+
+def _build_voice_clips(
+    project: Project,
+    project_path: Path,
+    tts,
+    total_samples: int,
+    report: dict[str, Any],
+    workers: int = 1,
+    audio_cache: AudioLRUCache | None = None,
+    cache: CacheStore | None = None,
+    sequences: list[_VoiceSequence] | None = None,
+    profiler: Profiler | None = None,
+) -> list[Clip]:
+    if cache is None:
+        cache = open_cache(project, project_path)
+    if audio_cache is None:
+        audio_cache = AudioLRUCache(project.render.audio_cache_mb * 1024 * 1024)
+    if sequences is None:
+        sequences = _plan_voice_sequences(project)
+    jobs, sequence_keys = _tts_jobs(project, sequences)
+    audio_by_key = _resolve_tts_jobs(
+        project,
+        tts,
+        jobs,
+        workers,
+        audio_cache,
+        cache,
+        report,
+        profiler,
     )
+    report["audio_cache"] = audio_cache.stats()
+
+    clips: list[Clip] = []
+    for sequence, keys in zip(sequences, sequence_keys):
+        # Utterances are placed once on a mono bus per set of overlap variants
+        # (one per sequence in practice); each variant is then a single
+        # delayed, panned and gained copy of the whole bus.
+        buses: dict[tuple[OverlapVariant, ...], list[tuple[int, np.ndarray]]] = {}
+        position = 0
+        for plan, cache_key in zip(sequence.plans, keys):
+            audio = audio_by_key[cache_key]
+            if audio.ndim > 1:
+                audio = audio[:, 0]
+            buses.setdefault(tuple(plan.variants), []).append((position, audio))
+            position += audio.shape[0] + sequence.gap_samples
+            if sequence.start_sample + position >= total_samples:
+                break
+        for variants, utterances in buses.items():
+            offsets = [int((variant.offset_ms / 1000.0) * project.sample_rate) for variant in variants]
+            length = max(start + audio.shape[0] for start, audio in utterances)
+            length = min(length, total_samples - sequence.start_sample - min(offsets))
+            bus = VoiceBus(length, utterances, reach=max(offsets) - min(offsets))
+            for variant, offset_samples in zip(variants, offsets):
+                clips.append(
+                    Clip(
+                        audio=bus,
+                        start_sample=sequence.start_sample + offset_samples,
+                        gain_db=variant.gain_db + sequence.gain_db,
+                        pan=variant.pan + sequence.pan,
+                        track=sequence.track_id or variant.track,
+                    )
+                )
+    return clips
 
 
-def _load_or_synthesize_tts(
+def _prepare_music(
     project: Project,
     project_path: Path,
     provider,
-    text: str,
-    voice: str | None,
     report: dict[str, Any],
-) -> np.ndarray:
-    cache_root = cache_dir(project_path) / "tts"
-    cache_root.mkdir(parents=True, exist_ok=True)
-    cache_key = _tts_cache_key(project, text, voice)
-    cache_path = cache_root / f"{cache_key}.wav"
-    if cache_path.exists():
-        audio, _ = sf.read(cache_path, dtype="float32")
-        report["tts_cached"].append(cache_path.name)
-        return audio
-    audio = provider.synthesize(
-        text,
-        voice,
-        {
-            "rate": project.tts.rate,
-            "model_path": project.tts.model_path,
-        },
-    )
-    sf.write(cache_path, audio, project.sample_rate)
-    report["tts_generated"].append(cache_path.name)
-    return audio
+    cache: CacheStore,
+    workers: int,
+    profiler: Profiler,
+    stop: threading.Event,
+) -> MusicPlan:
+    with profiler.span("music"):
+        return prepare_music_chunks(project, project_path, provider, report, cache, workers, profiler, stop)
+
+
+class _RenderProgress:
+    # Reports (stage, fraction) to render_project's ``progress`` callback.
+    # _render announces each stage with the samples it will process; the
+    # profiler spans named in ``spans`` count them off as they finish. Every
+    # other span (each TTS line or batch, each music chunk) repeats the
+    # current fraction, so the callback runs often enough to cancel a render.
+    def __init__(self, callback: Callable[[str, float], None] | None) -> None:
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._stage = ""
+        self._spans: tuple[str, ...] = ()
+        self._total = 0
+        self._done = 0
+
+    def stage(self, name: str, total: int = 0, spans: tuple[str, ...] = ()) -> None:
+        if self._callback is None:
+            return
+        with self._lock:
+            self._stage, self._spans, self._total, self._done = name, spans, total, 0
+        self._callback(name, 0.0)
 
+    def __call__(self, name: str, samples: int) -> None:
+        if self._callback is None:
+            return
+        with self._lock:
+            if name in self._spans:
+                self._done += samples
+            fraction = min(1.0, self._done / self._total) if self._total > 0 else 0.0
+            stage = self._stage
+        self._callback(stage, fraction)
 
-def render_project(project_path: Path) -> Path:
+
+def render_project(
+    project_path: Path,
+    streaming: bool | None = None,
+    block_sec: float | None = None,
+    tts_workers: int | None = None,
+    audio_cache: AudioLRUCache | None = None,
+    cache: CacheStore | None = None,
+    music_workers: int | None = None,
+    profile_memory: bool | None = None,
+    trace: str | None = None,
+    audio_format: str | None = None,
+    subtype: str | None = None,
+    stems: str | list[str] | None = None,
+    progress: Callable[[str, float], None] | None = None,
+) -> Path:
     project = _load_project(project_path)
+    if tts_workers is None:
+        tts_workers = project.render.tts_workers
+    if music_workers is None:
+        music_workers = project.render.music_workers
+    if cache is None:
+        cache = open_cache(project, project_path)
+    if streaming is None:
+        streaming = project.render.streaming
+    if block_sec is None:
+        block_sec = project.render.block_sec
+    if profile_memory is None:
+        profile_memory = project.render.profile_memory
+    if trace is None:
+        trace = project.render.trace
+    if trace is not None and trace not in TRACE_FORMATS:
+        raise ValueError(f"Unknown trace format '{trace}'. Supported: {', '.join(TRACE_FORMATS)}.")
+    if audio_format is not None:
+        project.export.format = audio_format
+        if subtype is None:
+            project.export.subtype = None
+    if subtype is not None:
+        project.export.subtype = subtype
+    if stems is not None:
+        project.export.stems = stems
+    export = export_format(project.export.format, project.export.subtype, project.sample_rate)
     content_warnings = find_content_warnings(project.affirmations)
     if project.voice_tracks:
         for track in project.voice_tracks:
@@ -120,6 +504,9 @@ def render_project(project_path: Path) -> Path:
         "project_id": project.project_id,
         "tts_cached": [],
         "tts_generated": [],
+        "tts_jobs": [],
+        "tts_workers": tts_workers,
+        "music_workers": music_workers,
         "music_cached": [],
         "music_generated": [],
         "seeds": {
@@ -135,130 +522,280 @@ def render_project(project_path: Path) -> Path:
     if project.textgen is not None:
         report["textgen"] = project.textgen.model_dump()
 
-    tts = _tts_provider(project)
+    tracker = _RenderProgress(progress)
+    profiler = Profiler(
+        memory=profile_memory,
+        trace=trace is not None,
+        listener=tracker if progress is not None else None,
+    )
+    with profiler, profiler.span("render"):
+        output = _render(
+            project,
+            project_path,
+            report,
+            profiler,
+            streaming,
+            block_sec,
+            tts_workers,
+            music_workers,
+            audio_cache,
+            cache,
+            export,
+            tracker,
+        )
+    report["timings"] = profiler.summary()
+    if trace is not None:
+        trace_path = output / ("render_trace.jsonl" if trace == "jsonl" else "render_trace.json")
+        profiler.write_trace(trace_path, trace)
+        report["trace"] = trace_path.name
+    write_report(output, report)
+    if progress is not None:
+        progress("done", 1.0)
+    return output
+
 
+def _render(
+    project: Project,
+    project_path: Path,
+    report: dict[str, Any],
+    profiler: Profiler,
+    streaming: bool,
+    block_sec: float,
+    tts_workers: int,
+    music_workers: int,
+    audio_cache: AudioLRUCache | None,
+    cache: CacheStore,
+    export: ExportFormat,
+    progress: _RenderProgress,
+) -> Path:
     total_samples = int(project.duration_sec * project.sample_rate)
-    allowed_modes = {"single", "triple_stack", "lead_whisper", "call_response"}
-    clips: list[Clip] = []
-    if project.voice_tracks:
-        for track in project.voice_tracks:
-            if not track.lines:
-                continue
-            script_cfg = project.script
-            if track.mode:
-                if track.mode not in allowed_modes:
-                    raise ValueError(
-                        f"Invalid track.mode '{track.mode}' for track '{track.id}'. "
-                        f"Supported modes: {', '.join(sorted(allowed_modes))}."
-                    )
-                script_cfg = project.script.model_copy(
-                    update={"mode": track.mode},
-                    validate=True,
-                )
-            utterance_plans = build_utterance_plans(track.lines, script_cfg)
-            current_start = int((track.start_offset_ms / 1000.0) * project.sample_rate)
-            gap_samples = int((script_cfg.gap_ms / 1000.0) * project.sample_rate)
-            for plan in utterance_plans:
-                audio = _load_or_synthesize_tts(
-                    project,
-                    project_path,
-                    tts,
-                    plan.text,
-                    track.voice or project.tts.voice,
-                    report,
-                )
-                if audio.ndim > 1:
-                    audio = audio[:, 0]
-                duration_samples = audio.shape[0]
-                for variant in plan.variants:
-                    offset_samples = int(
-                        (variant.offset_ms / 1000.0) * project.sample_rate
-                    )
-                    clips.append(
-                        Clip(
-                            audio=audio,
-                            start_sample=current_start + offset_samples,
-                            gain_db=variant.gain_db + track.gain_db,
-                            pan=variant.pan + track.pan,
-                            track=track.id,
-                        )
-                    )
-                current_start += duration_samples + gap_samples
-                if current_start >= total_samples:
-                    break
-    else:
-        utterance_plans = build_utterance_plans(
-            [item.text for item in project.affirmations],
-            project.script,
+    progress.stage("script")
+    with profiler.span("script"):
+        sequences = _plan_voice_sequences(project)
+        stem_keys = _voice_stem_keys(project, sequences, total_samples)
+        music_specs = plan_music_chunks(project)
+        stem_keys["music"] = stem_key(
+            "music",
+            project.sample_rate,
+            total_samples,
+            {
+                "chunks": [[spec.cache_key, spec.start, spec.frames, spec.fade_in] for spec in music_specs],
+                "gain_db": project.music.gain_db,
+            },
         )
-        current_start = 0
-        gap_samples = int((project.script.gap_ms / 1000.0) * project.sample_rate)
-        for plan in utterance_plans:
-            audio = _load_or_synthesize_tts(
+        if project.binaural.enabled:
+            stem_keys["binaural"] = stem_key(
+                "binaural",
+                project.sample_rate,
+                total_samples,
+                project.binaural.model_dump(),
+            )
+        stem_names = select_stems(list(stem_keys), project.export.stems)
+    stem_store = StemStore(cache, total_samples, enabled=project.render.reuse_stems)
+    reused: dict[str, BlockSource] = {}
+    for name, key in stem_keys.items():
+        source = stem_store.lookup(key)
+        if source is not None:
+            reused[name] = profiler.source("stems", source)
+    report["stems"] = {name: {"key": key, "reused": name in reused} for name, key in stem_keys.items()}
+    report["stems_reused"] = [name for name in stem_keys if name in reused]
+
+    tts = _tts_provider(project, tts_workers)
+    music = _music_provider(project, cache)
+
+    # Music chunks are generated (or checked in the cache) while the voice
+    # clips are synthesized; the two only meet at mixdown.
+    music_plan = None
+    stop_music = threading.Event()
+    if "music" not in reused:
+        music_pool = ThreadPoolExecutor(max_workers=1)
+        music_plan = music_pool.submit(
+            _prepare_music,
+            project,
+            project_path,
+            music,
+            report,
+            cache,
+            music_workers,
+            profiler,
+            stop_music,
+        )
+        music_pool.shutdown(wait=False)
+
+    plan = None
+    try:
+        # Only sequences feeding a stem that has to be rendered need their TTS.
+        pending = [
+            sequence
+            for sequence in sequences
+            if any(track not in reused for track in _sequence_tracks(sequence))
+        ]
+        progress.stage("tts")
+        with profiler.span("tts"):
+            clips = _build_voice_clips(
                 project,
                 project_path,
                 tts,
-                plan.text,
-                project.tts.voice,
+                total_samples,
                 report,
+                workers=tts_workers,
+                audio_cache=audio_cache,
+                cache=cache,
+                sequences=pending,
+                profiler=profiler,
             )
-            if audio.ndim > 1:
-                audio = audio[:, 0]
-            duration_samples = audio.shape[0]
-            for variant in plan.variants:
-                offset_samples = int((variant.offset_ms / 1000.0) * project.sample_rate)
-                clips.append(
-                    Clip(
-                        audio=audio,
-                        start_sample=current_start + offset_samples,
-                        gain_db=variant.gain_db,
-                        pan=variant.pan,
-                        track=variant.track,
-                    )
-                )
-            current_start += duration_samples + gap_samples
-            if current_start >= total_samples:
-                break
+        clips = [clip for clip in clips if clip.track not in reused]
+        if music_plan is not None:
+            progress.stage("music")
+            plan = music_plan.result()
+    finally:
+        if music_plan is not None and not music_plan.done():
+            # The render failed before the music was ready: stop at the next
+            # chunk and wait, so nothing writes to the cache or report (or
+            # overlaps a worker's next job) after render_project returns.
+            stop_music.set()
+            wait([music_plan])
 
-    music = _music_provider(project)
-    music_audio = build_music_bed(project, project_path, music, report)
-    clips.append(
-        Clip(
-            audio=music_audio,
-            start_sample=0,
-            gain_db=project.music.gain_db,
-            pan=0.0,
-            track="music",
-        )
-    )
-
-    if project.binaural.enabled:
-        binaural = generate_binaural(
-            project.duration_sec,
-            project.sample_rate,
-            project.binaural.carrier_hz,
-            project.binaural.beat_hz,
-            project.binaural.gain_db,
-            project.binaural.fade_in_ms,
-            project.binaural.fade_out_ms,
-        )
+    if plan is not None:
+        if streaming:
+            music_audio = MusicBed(
+                project,
+                project_path,
+                music,
+                report,
+                cache=cache,
+                plan=plan,
+                profiler=profiler,
+            )
+        else:
+            with profiler.span("music", total_samples):
+                music_audio = build_music_bed(
+                    project,
+                    project_path,
+                    music,
+                    report,
+                    cache=cache,
+                    plan=plan,
+                    workers=music_workers,
+                    profiler=profiler,
+                )
         clips.append(
             Clip(
-                audio=binaural,
+                audio=music_audio,
                 start_sample=0,
-                gain_db=0.0,
+                gain_db=project.music.gain_db,
                 pan=0.0,
-                track="binaural",
+                track="music",
             )
         )
 
-    tracks = place_clips(total_samples, clips, project.sample_rate)
-    master = mix_tracks(
-        tracks,
-        project.mix.master_peak_db,
-        project.sample_rate,
-        project.mix.target_lufs,
-    )
-    output = output_dir(project_path)
-    export_audio(output, project.sample_rate, master, tracks, report)
-    return output
+    cache.flush()
+    report["cache"] = cache.stats()
+
+    timeline = ClipTimeline(total_samples, clips)
+    # A streamed music bed reads its chunks while it is placed, so that time
+    # counts as music rather than placement.
+    fresh: dict[str, BlockSource] = {
+        track: profiler.source("music" if track == "music" else "placement", timeline.source(track))
+        for track in timeline.tracks
+    }
+    if project.binaural.enabled and "binaural" not in reused:
+        binaural_cfg = project.binaural
+        oscillator = BinauralOscillator(
+            project.sample_rate,
+            total_samples,
+            binaural_cfg.carrier_hz,
+            binaural_cfg.beat_hz,
+            binaural_cfg.gain_db,
+            binaural_cfg.fade_in_ms,
+            binaural_cfg.fade_out_ms,
+            binaural_cfg.ramps,
+        )
+        fresh["binaural"] = profiler.source("binaural", oscillator.render)
+    sources: dict[str, BlockSource] = {}
+    for name in dict.fromkeys([*stem_keys, *fresh]):
+        if name in reused:
+            sources[name] = reused[name]
+        elif name in stem_keys and name in fresh:
+            sources[name] = stem_store.record(stem_keys[name], fresh[name])
+        elif name in fresh:
+            sources[name] = fresh[name]
+
+    # A failed or cancelled render must not leave half-written stems behind.
+    try:
+        output = output_dir(project_path)
+        block_samples = int(block_sec * project.sample_rate)
+        progress.stage("mix", len(sources) * total_samples, ("mix",))
+        if streaming:
+            render_streaming(
+                output,
+                project.sample_rate,
+                total_samples,
+                sources,
+                LookaheadLimiter(
+                    project.sample_rate,
+                    project.mix.master_peak_db,
+                    project.mix.limiter_lookahead_ms,
+                    project.mix.limiter_release_ms,
+                    project.mix.true_peak,
+                ),
+                block_samples,
+                report,
+                target_lufs=project.mix.target_lufs,
+                profiler=profiler,
+                stems=[name for name in sources if name in stem_names],
+                export=export,
+                workers=project.export.workers,
+            )
+            progress.stage("export")
+            with profiler.span("export"):
+                stem_store.commit()
+                cache.flush()
+            return output
+
+        # Stems are rendered one at a time into the mix; freshly rendered ones are
+        # then exported from the stem cache instead of being rendered again.
+        mix = np.zeros((total_samples, 2), dtype=np.float32)
+        for source in sources.values():
+            block = source(0, total_samples)
+            with profiler.span("mix", total_samples):
+                mix += block
+        with profiler.span("export"):
+            stem_store.commit()
+            cache.flush()
+        for name in sources:
+            if name not in reused and name in stem_keys:
+                cached = stem_store.lookup(stem_keys[name])
+                if cached is not None:
+                    sources[name] = cached
+        progress.stage("master")
+        master = master_mix(
+            mix,
+            project.mix.master_peak_db,
+            project.sample_rate,
+            project.mix.target_lufs,
+            lookahead_ms=project.mix.limiter_lookahead_ms,
+            release_ms=project.mix.limiter_release_ms,
+            true_peak=project.mix.true_peak,
+            report=report,
+            profiler=profiler,
+        )
+        stems = {name: source for name, source in sources.items() if name in stem_names}
+        progress.stage("export", (1 + len(stems)) * total_samples, ("export.write",))
+        with profiler.span("export"):
+            export_audio(
+                output,
+                project.sample_rate,
+                master,
+                stems,
+                report,
+                total_samples=total_samples,
+                block_samples=block_samples,
+                profiler=profiler,
+                export=export,
+                workers=project.export.workers,
+            )
+        return output
+    except BaseException:
+        stem_store.discard()
+        raise
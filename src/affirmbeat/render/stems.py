@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import numpy as np
+
+from affirmbeat.core.cache import CacheStore
+from affirmbeat.core.hashing import hash_dict
+from affirmbeat.render.export import BlockSource, array_source
+
+STEM_NAMESPACE = "stems"
+# Bump when the DSP that renders a stem changes, so older stems are not reused.
+STEM_VERSION = 1
+
+
+def stem_key(kind: str, sample_rate: int, total_samples: int, payload: dict[str, Any]) -> str:
+    return hash_dict(
+        {
+            "kind": kind,
+            "version": STEM_VERSION,
+            "sample_rate": sample_rate,
+            "total_samples": total_samples,
+            **payload,
+        }
+    )
+
+
+class _StemRecorder:
+    # Wraps a block source and appends every block it produces to an .npy
+    # file that becomes the cached stem once the whole timeline has been
+    # written. Blocks go through a plain file handle in order, so nothing of
+    # the stem stays resident; out-of-order reads invalidate the file.
+    def __init__(self, store: "StemStore", key: str, source: BlockSource) -> None:
+        self._store = store
+        self._key = key
+        self._source = source
+        self._path = store.cache.entry_path(STEM_NAMESPACE, key, ".npy")
+        self._tmp_path = self._path.with_name(f"{key}.{os.getpid()}.tmp")
+        self._handle = self._tmp_path.open("wb")
+        np.lib.format.write_array_header_1_0(
+            self._handle,
+            {
+                "descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+                "fortran_order": False,
+                "shape": (store.total_samples, 2),
+            },
+        )
+        self._written = 0
+        self._valid = True
+
+    def __call__(self, start: int, frames: int) -> np.ndarray:
+        block = self._source(start, frames)
+        if self._handle is not None and self._valid:
+            if start == self._written:
+                self._handle.write(np.ascontiguousarray(block, dtype=np.float32).data)
+                self._written += block.shape[0]
+            else:
+                self._valid = False
+        return block
+
+    def commit(self, keep: bool = True) -> None:
+        if self._handle is None:
+            return
+        handle, self._handle = self._handle, None
+        handle.close()
+        if not keep or not self._valid or self._written != self._store.total_samples:
+            self._tmp_path.unlink(missing_ok=True)
+            return
+        os.replace(self._tmp_path, self._path)
+        # Stems are large and re-creatable; a size check is enough for verify.
+        self._store.cache.record_file(STEM_NAMESPACE, self._key, self._path, digest=False)
+
+
+class StemStore:
+    def __init__(self, cache: CacheStore, total_samples: int, enabled: bool = True) -> None:
+        self.cache = cache
+        self.total_samples = total_samples
+        self.enabled = enabled
+        self._recorders: list[_StemRecorder] = []
+
+    def lookup(self, key: str) -> BlockSource | None:
+        if not self.enabled or self.cache.contains(STEM_NAMESPACE, key) is None:
+            return None
+        path = self.cache.lookup(STEM_NAMESPACE, key)
+        try:
+            audio = np.load(path, mmap_mode="r")
+        except Exception:
+            self.cache.remove(STEM_NAMESPACE, key)
+            return None
+        if audio.shape != (self.total_samples, 2):
+            self.cache.remove(STEM_NAMESPACE, key)
+            return None
+        return array_source(audio)
+
+    def record(self, key: str, source: BlockSource) -> BlockSource:
+        if not self.enabled or self.total_samples <= 0:
+            return source
+        recorder = _StemRecorder(self, key, source)
+        self._recorders.append(recorder)
+        return recorder
+
+    def commit(self) -> None:
+        recorders, self._recorders = self._recorders, []
+        for recorder in recorders:
+            recorder.commit()
+
+    def discard(self) -> None:
+        recorders, self._recorders = self._recorders, []
+        for recorder in recorders:
+            recorder.commit(keep=False)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+from affirmbeat.dsp.limiter import LookaheadLimiter
+from affirmbeat.dsp.loudness import LoudnessMeter, loudness_gain
+from affirmbeat.render.export import (
+    DEFAULT_EXPORT,
+    BlockSource,
+    ExportFormat,
+    FileEncoder,
+    clear_outputs,
+    export_report,
+)
+from affirmbeat.render.timing import Profiler, span
+
+
+def render_streaming(
+    output_dir: Path,
+    sample_rate: int,
+    total_samples: int,
+    sources: dict[str, BlockSource],
+    limiter: LookaheadLimiter,
+    block_samples: int,
+    report: dict[str, Any],
+    target_lufs: float | None = None,
+    profiler: Profiler | None = None,
+    stems: list[str] | None = None,
+    export: ExportFormat = DEFAULT_EXPORT,
+    workers: int = 4,
+) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stems_dir = output_dir / "stems"
+    stems_dir.mkdir(exist_ok=True)
+    clear_outputs(output_dir)
+    premaster_path = output_dir / ".premaster.wav"
+    block_samples = max(1, block_samples)
+    meter = LoudnessMeter(sample_rate) if target_lufs is not None else None
+    stems = list(sources) if stems is None else stems
+    final_name = f"final{export.extension}"
+    encoders: dict[str, FileEncoder] = {}
+
+    def finish(final: FileEncoder, blocks, gain: np.float32) -> None:
+        for mix in blocks:
+            with span(profiler, "loudness", len(mix)):
+                if gain != 1.0:
+                    mix = mix * gain
+            with span(profiler, "limiter", len(mix)):
+                limited = limiter.process(mix)
+            with span(profiler, "export", len(limited)):
+                final.write(limited)
+        if total_samples > 0:
+            with span(profiler, "limiter", limiter.latency):
+                limited = limiter.flush()
+            with span(profiler, "export", len(limited)):
+                final.write(limited)
+
+    # Pass one mixes block by block and writes the stems. Without a loudness
+    # target the master goes straight through the limiter into the final
+    # file; with one, it is kept in a float premaster while it is measured.
+    # Blocks are encoded on the pool while the next block is mixed.
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="export") as pool:
+            with ExitStack() as stack:
+                stem_files: dict[str, FileEncoder] = {}
+                for name in stems:
+                    path = stems_dir / f"{name}{export.extension}"
+                    stem_files[name] = stack.enter_context(
+                        FileEncoder(path, sample_rate, export, pool, profiler)
+                    )
+                    encoders[f"stems/{path.name}"] = stem_files[name]
+                if meter is None:
+                    sink = stack.enter_context(
+                        FileEncoder(output_dir / final_name, sample_rate, export, pool, profiler)
+                    )
+                    encoders[final_name] = sink
+                else:
+                    # RF64: a float WAV passes the 4 GB RIFF limit after about
+                    # 3 hours of 48 kHz stereo.
+                    premaster = stack.enter_context(
+                        sf.SoundFile(premaster_path, "w", sample_rate, 2, subtype="FLOAT", format="RF64")
+                    )
+
+                def mixed_blocks():
+                    for start in range(0, total_samples, block_samples):
+                        frames = min(block_samples, total_samples - start)
+                        mix = np.zeros((frames, 2), dtype=np.float32)
+                        for name, source in sources.items():
+                            block = source(start, frames)
+                            if name in stem_files:
+                                with span(profiler, "export", frames):
+                                    stem_files[name].write(block)
+                            with span(profiler, "mix", frames):
+                                mix += block
+                        yield mix
+
+                if meter is None:
+                    finish(sink, mixed_blocks(), np.float32(1.0))
+                else:
+                    for mix in mixed_blocks():
+                        with span(profiler, "loudness", len(mix)):
+                            meter.process(mix)
+                        with span(profiler, "export", len(mix)):
+                            premaster.write(mix)
+
+            if meter is not None:
+                # Pass two applies the loudness gain and the limiter while
+                # copying the premaster to the final file.
+                measured = meter.integrated_loudness()
+                gain = np.float32(loudness_gain(measured, target_lufs))
+                with sf.SoundFile(premaster_path) as src, FileEncoder(
+                    output_dir / final_name, sample_rate, export, pool, profiler
+                ) as dst:
+                    encoders[final_name] = dst
+
+                    def premaster_blocks():
+                        blocks = src.blocks(blocksize=block_samples, dtype="float32", always_2d=True)
+                        while True:
+                            with span(profiler, "export") as record:
+                                block = next(blocks, None)
+                                record.samples = len(block) if block is not None else 0
+                            if block is None:
+                                return
+                            yield block
+
+                    finish(dst, premaster_blocks(), gain)
+                report["loudness"] = {
+                    "measured_lufs": measured if math.isfinite(measured) else None,
+                    "target_lufs": target_lufs,
+                    "gain_db": float(20.0 * np.log10(gain)),
+                }
+    finally:
+        premaster_path.unlink(missing_ok=True)
+    files = {final_name: encoders[final_name].stats}
+    files.update({name: encoder.stats for name, encoder in encoders.items() if name != final_name})
+    report["export"] = export_report(export, stems, workers, files)
+    report["streaming"] = {"block_samples": block_samples}
+    report["limiter"] = limiter.stats()
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Callable, Iterable
 
 import numpy as np
 
-from affirmbeat.dsp.pan import apply_pan
+from affirmbeat.dsp.pan import pan_gains
 from affirmbeat.dsp.limiter import db_to_linear
 
 
 @dataclass(frozen=True)
 class Clip:
+    # Any array-like with ``shape``/``size`` and contiguous slicing works here,
+    # e.g. the lazily assembled ``MusicBed``.
     audio: np.ndarray
     start_sample: int
     gain_db: float
@@ -18,30 +21,185 @@ class Clip:
     track: str
 
 
+_SCRATCH_FRAMES = 1 << 16
+
+
+def _coefficients(clip: Clip) -> tuple[float, float]:
+    if clip.audio.ndim not in (1, 2) or (clip.audio.ndim == 2 and clip.audio.shape[1] != 2):
+        raise ValueError("Audio must be mono or stereo")
+    gain = db_to_linear(clip.gain_db)
+    left, right = pan_gains(clip.pan, stereo=clip.audio.ndim == 2)
+    return left * gain, right * gain
+
+
+class _TrackIndex:
+    def __init__(self, clips: list[Clip]) -> None:
+        clips = sorted(clips, key=lambda clip: max(0, clip.start_sample))
+        self.clips = clips
+        self.starts = np.array([max(0, clip.start_sample) for clip in clips], dtype=np.int64)
+        self.ends = self.starts + np.array([clip.audio.shape[0] for clip in clips], dtype=np.int64)
+        # Running max of clip ends lets a window find its first overlapping clip
+        # with a binary search even when long clips start before short ones.
+        self.max_ends = np.maximum.accumulate(self.ends)
+        # Pan and gain folded into one (left, right) coefficient pair per clip.
+        self.coeffs = np.array(
+            [_coefficients(clip) for clip in clips], dtype=np.float32
+        ).reshape(len(clips), 2)
+        self.max_length = int((self.ends - self.starts).max()) if clips else 0
+
+    def overlapping(self, start: int, end: int) -> np.ndarray:
+        lo = int(np.searchsorted(self.max_ends, start, side="right"))
+        hi = int(np.searchsorted(self.starts, end, side="left"))
+        if hi <= lo:
+            return np.zeros(0, dtype=np.int64)
+        candidates = np.arange(lo, hi)
+        return candidates[self.ends[lo:hi] > start]
+
+
+class ClipTimeline:
+    def __init__(self, total_samples: int, clips: Iterable[Clip]) -> None:
+        self.total_samples = total_samples
+        grouped: dict[str, list[Clip]] = {}
+        for clip in clips:
+            if clip.audio.size == 0:
+                continue
+            start = max(0, clip.start_sample)
+            if min(total_samples, start + clip.audio.shape[0]) <= start:
+                continue
+            grouped.setdefault(clip.track, []).append(clip)
+        self._tracks = {track: _TrackIndex(items) for track, items in grouped.items()}
+        self._scratch = threading.local()
+
+    @property
+    def tracks(self) -> list[str]:
+        return list(self._tracks)
+
+    def render(self, track: str, start: int, frames: int) -> np.ndarray:
+        frames = max(0, min(frames, self.total_samples - start))
+        output = np.zeros((frames, 2), dtype=np.float32)
+        index = self._tracks.get(track)
+        if index is None or frames == 0:
+            return output
+        self._accumulate(index, output, start)
+        return output
+
+    def source(self, track: str) -> Callable[[int, int], np.ndarray]:
+        return lambda start, frames: self.render(track, start, frames)
+
+    def mixdown(self) -> np.ndarray:
+        mix = np.zeros((self.total_samples, 2), dtype=np.float32)
+        for index in self._tracks.values():
+            self._accumulate(index, mix, 0)
+        return mix
+
+    def _buffer(self, frames: int) -> np.ndarray:
+        # One scratch buffer per thread, grown as needed and reused for every
+        # clip, so placing a clip allocates nothing.
+        scratch = getattr(self._scratch, "buffer", None)
+        if scratch is None or scratch.shape[0] < frames:
+            scratch = np.empty((frames, 2), dtype=np.float32)
+            self._scratch.buffer = scratch
+        return scratch
+
+    def _accumulate(self, index: _TrackIndex, output: np.ndarray, start: int) -> None:
+        end = start + output.shape[0]
+        positions = index.overlapping(start, end)
+        if positions.size == 0:
+            return
+        scratch = self._buffer(min(output.shape[0], index.max_length, _SCRATCH_FRAMES))
+        step = scratch.shape[0]
+        for position in positions:
+            clip = index.clips[position]
+            clip_start = int(index.starts[position])
+            coeffs = index.coeffs[position]
+            lo = max(start, clip_start)
+            hi = min(end, int(index.ends[position]))
+            audio, audio_start = clip.audio, clip_start
+            if isinstance(audio, VoiceBus):
+                # The whole block is read up front so every variant (and every
+                # track) of the block shares one bus window, however many
+                # scratch pieces it is placed in.
+                audio, audio_start = audio.read(lo - clip_start, hi - lo), lo
+            # Long clips (the music bed) go through the scratch in pieces.
+            for piece in range(lo, hi, step):
+                piece_end = min(hi, piece + step)
+                segment = audio[piece - audio_start : piece_end - audio_start]
+                placed = scratch[: piece_end - piece]
+                # One strided multiply per channel is several times faster
+                # than broadcasting against the coefficient pair.
+                for channel in range(2):
+                    source = segment if segment.ndim == 1 else segment[:, channel]
+                    np.multiply(source, coeffs[channel], out=placed[:, channel], casting="same_kind")
+                target = output[piece - start : piece_end - start]
+                np.add(target, placed, out=target)
+
+
+# Mono dry bus of one voice sequence: every utterance is placed once, and the
+# overlap variants read it back as delayed, panned and gained copies. Windows
+# are assembled on demand; each one is widened by ``reach`` (the spread of the
+# variant offsets) and kept, so every variant of a block reads the same window.
+class VoiceBus:
+    ndim = 1
+    dtype = np.dtype(np.float32)
+
+    def __init__(self, length: int, utterances: Iterable[tuple[int, np.ndarray]], reach: int = 0) -> None:
+        clips = [
+            Clip(audio=audio, start_sample=start, gain_db=0.0, pan=0.0, track="bus")
+            for start, audio in utterances
+            if audio.size and start < length
+        ]
+        self.shape = (max(0, length),)
+        self._index = _TrackIndex(clips)
+        self._reach = max(0, reach)
+        self._lock = threading.Lock()
+        self._window = np.zeros(0, dtype=np.float32)
+        self._window_start = 0
+
+    @property
+    def size(self) -> int:
+        return self.shape[0]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def _render(self, start: int, end: int) -> np.ndarray:
+        output = np.zeros(end - start, dtype=np.float32)
+        for position in self._index.overlapping(start, end):
+            audio = self._index.clips[position].audio
+            clip_start = int(self._index.starts[position])
+            lo = max(start, clip_start)
+            hi = min(end, int(self._index.ends[position]))
+            target = output[lo - start : hi - start]
+            np.add(target, audio[lo - clip_start : hi - clip_start], out=target, casting="same_kind")
+        return output
+
+    def read(self, start: int, frames: int) -> np.ndarray:
+        start = max(0, start)
+        end = min(self.shape[0], start + max(0, frames))
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        with self._lock:
+            window_end = self._window_start + self._window.shape[0]
+            if start < self._window_start or end > window_end:
+                self._window_start = max(0, start - self._reach)
+                self._window = self._render(self._window_start, min(self.shape[0], end + self._reach))
+            return self._window[start - self._window_start : end - self._window_start]
+
+    def __getitem__(self, item) -> np.ndarray:
+        if not isinstance(item, slice) or item.step not in (None, 1):
+            raise TypeError("VoiceBus only supports contiguous slices")
+        start, stop, _ = item.indices(self.shape[0])
+        return self.read(start, max(0, stop - start))
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        audio = self.read(0, self.shape[0]).copy()
+        return audio if dtype is None else audio.astype(dtype)
+
+
 def place_clips(
     total_samples: int,
     clips: Iterable[Clip],
     sample_rate: int,
 ) -> dict[str, np.ndarray]:
-    tracks: dict[str, np.ndarray] = {}
-    for clip in clips:
-        if clip.audio.size == 0:
-            continue
-        start = max(0, clip.start_sample)
-        audio = clip.audio
-        if audio.ndim == 1:
-            stereo = apply_pan(audio, clip.pan)
-        else:
-            stereo = apply_pan(audio, clip.pan)
-        gain = db_to_linear(clip.gain_db)
-        stereo = stereo * gain
-        end = min(total_samples, start + stereo.shape[0])
-        if end <= start:
-            continue
-        segment = stereo[: end - start]
-        buffer = tracks.setdefault(
-            clip.track,
-            np.zeros((total_samples, 2), dtype=np.float32),
-        )
-        buffer[start:end] += segment
-    return tracks
+    timeline = ClipTimeline(total_samples, clips)
+    return {track: timeline.render(track, 0, total_samples) for track in timeline.tracks}
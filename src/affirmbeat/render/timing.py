@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+TRACE_FORMATS = ("chrome", "jsonl")
+
+
+@dataclass(eq=False)
+class _OpenSpan:
+    name: str
+    start_wall: float
+    start_cpu: float
+    samples: int = 0
+    start_memory: int = 0
+    peak_memory: int = 0
+
+
+class Profiler:
+    # Collects named spans: wall time, process CPU time and sample counts are
+    # summed per name; with ``memory`` the peak traced allocation above the
+    # span's starting point is kept (tracemalloc slows the render down, so it
+    # is off by default). With ``trace`` every span is also kept as an event
+    # for write_trace(). ``listener`` is called with the name and samples of
+    # every finished span, on the thread that ran it. Spans may be opened from
+    # any thread.
+    def __init__(
+        self,
+        memory: bool = False,
+        trace: bool = False,
+        listener: Callable[[str, int], None] | None = None,
+    ) -> None:
+        self.memory = memory
+        self.trace = trace
+        self.listener = listener
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+        self._events: list[dict[str, Any]] = []
+        self._open: list[_OpenSpan] = []
+        self._owns_tracing = False
+
+    def __enter__(self) -> "Profiler":
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def _begin(self, name: str, samples: int = 0) -> _OpenSpan:
+        record = _OpenSpan(name, time.perf_counter(), time.process_time(), samples)
+        if self.memory and tracemalloc.is_tracing():
+            with self._lock:
+                # tracemalloc has a single peak counter; hand the peak seen so
+                # far to every open span before resetting it for this one.
+                current, peak = tracemalloc.get_traced_memory()
+                for other in self._open:
+                    other.peak_memory = max(other.peak_memory, peak)
+                tracemalloc.reset_peak()
+                record.start_memory = record.peak_memory = current
+                self._open.append(record)
+        return record
+
+    def _end(self, record: _OpenSpan) -> None:
+        wall = time.perf_counter() - record.start_wall
+        cpu = time.process_time() - record.start_cpu
+        with self._lock:
+            memory = None
+            if record in self._open:
+                _, peak = tracemalloc.get_traced_memory()
+                for other in self._open:
+                    other.peak_memory = max(other.peak_memory, peak)
+                self._open.remove(record)
+                memory = record.peak_memory - record.start_memory
+            stats = self._stats.get(record.name)
+            if stats is None:
+                stats = {"calls": 0, "wall_sec": 0.0, "cpu_sec": 0.0, "samples": 0}
+                if self.memory:
+                    stats["peak_memory_bytes"] = 0
+                self._stats[record.name] = stats
+            stats["calls"] += 1
+            stats["wall_sec"] += wall
+            stats["cpu_sec"] += cpu
+            stats["samples"] += record.samples
+            if memory is not None:
+                stats["peak_memory_bytes"] = max(stats["peak_memory_bytes"], memory)
+            if self.trace:
+                event = {
+                    "name": record.name,
+                    "start_sec": record.start_wall - self._origin,
+                    "wall_sec": wall,
+                    "cpu_sec": cpu,
+                    "samples": record.samples,
+                    "thread": threading.current_thread().name,
+                    "tid": threading.get_ident(),
+                }
+                if memory is not None:
+                    event["peak_memory_bytes"] = memory
+                self._events.append(event)
+        if self.listener is not None:
+            self.listener(record.name, record.samples)
+
+    @contextmanager
+    def span(self, name: str, samples: int = 0) -> Iterator[_OpenSpan]:
+        # The yielded record's ``samples`` can be set once the count is known.
+        record = self._begin(name, samples)
+        try:
+            yield record
+        finally:
+            self._end(record)
+
+    def source(
+        self, name: str, source: Callable[[int, int], np.ndarray]
+    ) -> Callable[[int, int], np.ndarray]:
+        def read(start: int, frames: int) -> np.ndarray:
+            record = self._begin(name, frames)
+            try:
+                block = source(start, frames)
+            finally:
+                self._end(record)
+            return block
+
+        return read
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def write_trace(self, path: Path, trace_format: str = "chrome") -> None:
+        with self._lock:
+            events = list(self._events)
+        if trace_format == "jsonl":
+            with path.open("w", encoding="utf-8") as handle:
+                for event in events:
+                    handle.write(json.dumps(event) + "\n")
+            return
+        # Chrome trace event format, viewable in chrome://tracing or Perfetto.
+        pid = os.getpid()
+        trace_events = [
+            {
+                "name": event["name"],
+                "cat": event["name"].split(".")[0],
+                "ph": "X",
+                "ts": event["start_sec"] * 1e6,
+                "dur": event["wall_sec"] * 1e6,
+                "pid": pid,
+                "tid": event["tid"],
+                "args": {
+                    key: value
+                    for key, value in event.items()
+                    if key not in ("name", "start_sec", "wall_sec", "tid")
+                },
+            }
+            for event in events
+        ]
+        path.write_text(json.dumps({"traceEvents": trace_events, "displayTimeUnit": "ms"}))
+
+
+def span(profiler: Profiler | None, name: str, samples: int = 0) -> AbstractContextManager[_OpenSpan]:
+    if profiler is None:
+        return nullcontext(_OpenSpan(name, 0.0, 0.0, samples))
+    return profiler.span(name, samples)
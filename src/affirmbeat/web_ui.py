@@ -1,11 +1,13 @@
 import json
+import os
+import time
 import uuid
 from pathlib import Path
 import streamlit as st
 import pandas as pd
 
 from affirmbeat.core.project import Project, Affirmation, VoiceTrack
-from affirmbeat.render.renderer import render_project
+from affirmbeat.render.jobs import ACTIVE_STATES, JobQueue
 
 st.set_page_config(
     page_title="AffirmBeat Studio",
@@ -29,6 +31,17 @@ def save_project(project: Project, path: Path):
     path.write_text(json.dumps(project.model_dump(), indent=2))
     st.toast(f"Project saved to {path}")
 
+@st.cache_resource
+def render_queue(_warm_up: Path | None = None) -> JobQueue:
+    # Once per server: renders run in worker processes that load the models
+    # of ``_warm_up`` on start and keep them loaded between jobs. The job
+    # table is shared, so several servers on one box still run at most
+    # AFFIRMBEAT_RENDER_CONCURRENCY renders at a time.
+    concurrency = int(os.getenv("AFFIRMBEAT_RENDER_CONCURRENCY", "1"))
+    queue = JobQueue(Path("projects") / "jobs.sqlite", concurrency=concurrency)
+    queue.start_workers(warm_up=_warm_up)
+    return queue
+
 def get_project_files():
     projects_dir = Path("projects")
     projects_dir.mkdir(exist_ok=True)
@@ -117,6 +130,13 @@ with tabs[1]:
         
         if provider == "piper1":
             project.tts.model_path = st.text_input("Model Path", value=project.tts.model_path or "")
+            backends = ["auto", "python", "server", "subprocess"]
+            project.tts.piper_backend = st.selectbox(
+                "Piper Backend",
+                backends,
+                index=backends.index(project.tts.piper_backend),
+                help="auto keeps the voice model loaded between lines (Python bindings, then a resident piper process) and falls back to one process per line.",
+            )
         
         project.tts.voice = st.text_input("Default Voice", value=project.tts.voice or "")
         project.tts.rate = st.slider("Speech Rate", 0.5, 2.0, float(project.tts.rate))
@@ -239,22 +259,39 @@ with tabs[4]:
 
     st.write("---")
     
+    queue = render_queue(selected_file)
+    job_key = f"render_job:{selected_file}"
     if st.button("Save & Render Project", type="primary"):
         save_project(project, selected_file)
-        with st.spinner("Rendering audio... This may take a moment."):
-            try:
-                output_dir = render_project(selected_file)
-                st.success(f"Render complete! Output saved to: {output_dir}")
-                
-                final_wav = output_dir / "final.wav"
-                if final_wav.exists():
-                    st.audio(str(final_wav))
-                else:
-                    st.warning("Render finished but 'final.wav' was not found.")
-                    
-            except Exception as e:
-                st.error(f"Render failed: {e}")
-                st.exception(e)
+        # Clicking again while the same project is queued or rendering
+        # returns the job that is already there.
+        st.session_state[job_key] = queue.submit(selected_file)
+
+    job = queue.get(st.session_state[job_key]) if job_key in st.session_state else None
+    if job is not None:
+        if job["state"] in ACTIVE_STATES:
+            if job["state"] == "queued":
+                label = "Waiting for a free render slot..."
+            elif job["cancel_requested"]:
+                label = "Cancelling..."
+            else:
+                label = f"Rendering: {job['stage'] or 'starting'} ({job['progress']:.0%})"
+            st.progress(min(1.0, job["progress"]), text=label)
+            if st.button("Cancel Render"):
+                queue.cancel(job["id"])
+                st.rerun()
+        elif job["state"] == "done":
+            output_dir = Path(job["output"])
+            st.success(f"Render complete! Output saved to: {output_dir}")
+            final_audio = output_dir / f"final.{project.export.format}"
+            if final_audio.exists():
+                st.audio(str(final_audio))
+            else:
+                st.warning(f"Render finished but '{final_audio.name}' was not found.")
+        elif job["state"] == "failed":
+            st.error(f"Render failed: {job['error']}")
+        else:
+            st.info("Render cancelled.")
 
 # Auto-save on widget change is not default in Streamlit, but we save explicitly or via callbacks above.
 # To ensure changes persist if user switches tabs without explicit save, we can auto-save at the end.
@@ -266,3 +303,8 @@ if st.session_state.get("autosave", True):
 with st.sidebar:
     if st.button("Save Changes"):
         save_project(project, selected_file)
+
+# Poll the render job until it finishes.
+if job is not None and job["state"] in ACTIVE_STATES:
+    time.sleep(1.0)
+    st.rerun()
@@ -0,0 +1,36 @@
+import json
+import uuid
+from pathlib import Path
+from typing import Any
+
+from affirmbeat.core.project import (
+    BinauralConfig,
+    MusicConfig,
+    Project,
+    ScriptConfig,
+    TTSConfig,
+    VoiceTrack,
+)
+
+
+def write_project(path: Path, project: Project) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(project.model_dump(), indent=2), encoding="utf-8")
+    return path
+
+
+def make_project(**overrides: Any) -> Project:
+    # A short dummy-TTS, placeholder-music project; tests override the fields
+    # they exercise.
+    fields: dict[str, Any] = {
+        "project_id": str(uuid.uuid4()),
+        "sample_rate": 16_000,
+        "duration_sec": 2,
+        "voice_tracks": [VoiceTrack(id="t1", lines=["I am calm.", "I rest."])],
+        "script": ScriptConfig(repeat_each=1, gap_ms=100),
+        "tts": TTSConfig(provider="dummy"),
+        "music": MusicConfig(provider="placeholder", chunk_sec=1, crossfade_ms=200),
+        "binaural": BinauralConfig(enabled=True, fade_in_ms=200, fade_out_ms=200),
+    }
+    fields.update(overrides)
+    return Project(**fields)
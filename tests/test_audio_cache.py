@@ -0,0 +1,58 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import soundfile as sf
+
+from affirmbeat.core.audio_cache import AudioLRUCache
+from affirmbeat.core.project import Affirmation, MusicConfig, Project, ScriptConfig, TTSConfig
+from affirmbeat.render.renderer import render_project
+
+
+class AudioLRUCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used_within_budget(self) -> None:
+        cache = AudioLRUCache(max_bytes=3 * 400)
+        for key in ("a", "b", "c"):
+            cache.put(key, np.zeros(100, dtype=np.float32))
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("d", np.zeros(100, dtype=np.float32))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes"], 1200)
+
+    def test_entries_are_read_only(self) -> None:
+        cache = AudioLRUCache(max_bytes=1 << 20)
+        audio = cache.put("a", np.ones(10, dtype=np.float32))
+        with self.assertRaises(ValueError):
+            audio[0] = 2.0
+
+    def test_shared_cache_skips_disk_reads_across_renders(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            project = Project(
+                project_id="cache",
+                duration_sec=2,
+                affirmations=[Affirmation(id="a1", text="I am calm.")],
+                script=ScriptConfig(repeat_each=3),
+                tts=TTSConfig(provider="dummy"),
+                music=MusicConfig(provider="placeholder", chunk_sec=1, crossfade_ms=0),
+            )
+            project.binaural.enabled = False
+            project_path = Path(td) / "project.json"
+            project_path.write_text(json.dumps(project.model_dump()))
+            cache = AudioLRUCache(max_bytes=1 << 24)
+            render_project(project_path, audio_cache=cache)
+            with mock.patch("soundfile.read", wraps=sf.read) as read:
+                output_dir = render_project(project_path, audio_cache=cache)
+            tts_reads = [call for call in read.call_args_list if "tts" in Path(call.args[0]).parts]
+            self.assertEqual(tts_reads, [])
+            report = json.loads((output_dir / "render_report.json").read_text())
+            self.assertEqual(report["audio_cache"]["hits"], 1)
+            self.assertEqual(report["tts_cached"], [path.name for path in (Path(td) / "cache" / "tts").iterdir()])
+            # Memory hits still count as uses of the disk entry.
+            index = json.loads((Path(td) / "cache" / "index.json").read_text())["entries"]
+            self.assertEqual([entry["hits"] for key, entry in index.items() if key.startswith("tts/")], [1])
@@ -0,0 +1,14 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from affirmbeat.bench.render import REFERENCE_PROJECTS, reference_project
+
+
+class ReferenceProjectTests(unittest.TestCase):
+    def test_fractional_scale_gives_whole_second_durations(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            for name, spec in REFERENCE_PROJECTS.items():
+                project = reference_project(name, Path(td), scale=0.333)
+                self.assertEqual(project.duration_sec, round(spec["duration_sec"] * 0.333))
+            self.assertEqual(reference_project("single_10min", Path(td), scale=0.0001).duration_sec, 1)
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from affirmbeat.core.project import BinauralRamp
+from affirmbeat.dsp.binaural import BinauralOscillator, generate_binaural
+
+
+def _oscillator(total: int, sample_rate: int, ramps=(), **overrides) -> BinauralOscillator:
+    settings = {"carrier_hz": 200.0, "beat_hz": 6.0, "gain_db": 0.0, "fade_in_ms": 0, "fade_out_ms": 0}
+    settings.update(overrides)
+    return BinauralOscillator(sample_rate, total, ramps=ramps, **settings)
+
+
+class BinauralOscillatorTests(unittest.TestCase):
+    def test_constant_tone_matches_sine(self) -> None:
+        sample_rate = 8_000
+        audio = generate_binaural(1.5, sample_rate, 200.0, 6.0, 0.0, 0, 0)
+        t = np.arange(audio.shape[0]) / sample_rate
+        np.testing.assert_allclose(audio[:, 0], np.sin(2 * np.pi * 197.0 * t), atol=1e-6)
+        np.testing.assert_allclose(audio[:, 1], np.sin(2 * np.pi * 203.0 * t), atol=1e-6)
+
+    def test_phase_stays_exact_hours_in(self) -> None:
+        sample_rate = 48_000
+        start = 6 * 3600 * sample_rate + 123
+        oscillator = _oscillator(start + 4_800, sample_rate, carrier_hz=220.0, beat_hz=6.0)
+        block = oscillator.render(start, 4_800)
+        index = np.arange(start, start + 4_800, dtype=np.int64)
+        # Exact integer phase for the 217 Hz / 223 Hz channels.
+        for channel, freq in enumerate((217, 223)):
+            expected = np.sin(2 * np.pi * ((freq * index) % sample_rate) / sample_rate)
+            np.testing.assert_allclose(block[:, channel], expected, atol=1e-6)
+
+    def test_ramp_keeps_phase_continuous(self) -> None:
+        sample_rate = 8_000
+        total = 4 * sample_rate
+        ramps = [BinauralRamp(start_sec=1.0, duration_sec=2.0, beat_hz=2.0, carrier_hz=260.0)]
+        oscillator = _oscillator(total, sample_rate, ramps)
+        whole = oscillator.render(0, total)
+        t = np.arange(total + 1) / sample_rate
+        progress = np.clip((t - 1.0) / 2.0, 0.0, 1.0)
+        carrier = 200.0 + 60.0 * progress
+        beat = 6.0 - 4.0 * progress
+        for channel, freq in enumerate((carrier - beat / 2, carrier + beat / 2)):
+            # Trapezoidal integration is exact for a piecewise-linear frequency.
+            cycles = np.concatenate([[0.0], np.cumsum((freq[1:] + freq[:-1]) / 2 / sample_rate)])
+            np.testing.assert_allclose(whole[:, channel], np.sin(2 * np.pi * cycles[:total]), atol=1e-5)
+
+        blocks = [oscillator.render(start, 997) for start in range(0, total, 997)]
+        np.testing.assert_allclose(np.concatenate(blocks), whole, atol=1e-6)
+
+    def test_later_ramp_starts_from_current_value(self) -> None:
+        ramps = [
+            BinauralRamp(start_sec=0.0, duration_sec=10.0, beat_hz=10.0),
+            BinauralRamp(start_sec=5.0, duration_sec=0.0, beat_hz=4.0),
+        ]
+        sample_rate = 1_000
+        oscillator = _oscillator(8 * sample_rate, sample_rate, ramps, carrier_hz=100.0)
+        early = _oscillator(8 * sample_rate, sample_rate, ramps[:1], carrier_hz=100.0)
+        np.testing.assert_array_equal(oscillator.render(0, 5_000), early.render(0, 5_000))
+        held = _oscillator(3 * sample_rate, sample_rate, carrier_hz=100.0, beat_hz=4.0)
+        # After the jump both channels run at the held frequencies.
+        late = oscillator.render(6_000, 1_000)
+        reference = held.render(0, 1_000)
+        spectrum = np.abs(np.fft.rfft(late[:, 0]))
+        self.assertEqual(int(np.argmax(spectrum)), int(np.argmax(np.abs(np.fft.rfft(reference[:, 0])))))
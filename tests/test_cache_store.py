@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import soundfile as sf
+from typer.testing import CliRunner
+
+from affirmbeat.cli.main import app
+from affirmbeat.core.cache import CacheStore
+from affirmbeat.core.project import Project
+
+
+def _tone(samples: int = 4_800) -> np.ndarray:
+    return np.full(samples, 0.1, dtype=np.float32)
+
+
+class CacheStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name) / "cache"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_round_trip_uses_index_and_counts_hits(self) -> None:
+        store = CacheStore(self.root)
+        self.assertIsNone(store.read_audio("tts", "abc"))
+        store.write_audio("tts", "abc", _tone(), 48_000)
+        store.flush()
+
+        reopened = CacheStore(self.root)
+        audio, name = reopened.read_audio("tts", "abc")
+        self.assertEqual(name, "abc.wav")
+        self.assertEqual(audio.shape[0], 4_800)
+        with mock.patch.object(Path, "exists", side_effect=AssertionError("exists() called")):
+            self.assertIsNone(reopened.read_audio("tts", "missing"))
+        stats = reopened.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["namespaces"]["tts"]["entries"], 1)
+
+    def test_lru_eviction_respects_budget(self) -> None:
+        store = CacheStore(self.root)
+        for key in ("a", "b", "c"):
+            store.write_audio("music", key, _tone(), 48_000)
+            time.sleep(0.01)
+        store.read_audio("music", "a")
+        entry_size = store.stats()["bytes"] // 3
+        result = store.prune(max_bytes=2 * entry_size)
+        self.assertEqual(result["evicted"], 1)
+        self.assertIsNone(store.read_audio("music", "b"))
+        self.assertIsNotNone(store.read_audio("music", "a"))
+        self.assertFalse((self.root / "music" / "b.wav").exists())
+
+    def test_adopts_legacy_files_and_verifies(self) -> None:
+        (self.root / "tts").mkdir(parents=True)
+        sf.write(self.root / "tts" / "old.wav", _tone(), 48_000)
+        store = CacheStore(self.root)
+        self.assertIsNotNone(store.read_audio("tts", "old"))
+
+        store.write_audio("tts", "new", _tone(), 48_000)
+        store.flush()
+        with (self.root / "tts" / "new.wav").open("r+b") as handle:
+            handle.seek(100)
+            handle.write(b"\xff\xff\xff\xff")
+        sf.write(self.root / "tts" / "orphan.wav", _tone(), 48_000)
+        (self.root / "tts" / "old.wav").unlink()
+        result = store.verify()
+        self.assertEqual(result, {"missing": ["tts/old"], "corrupt": ["tts/new"], "orphans": ["tts/orphan"]})
+        store.verify(fix=True)
+        self.assertEqual(CacheStore(self.root).verify(), {"missing": [], "corrupt": [], "orphans": []})
+
+    def test_encodings_read_older_entries(self) -> None:
+        CacheStore(self.root).write_audio("tts", "legacy", _tone(), 48_000)
+        store = CacheStore(self.root, encoding="flac")
+        audio, name = store.read_audio("tts", "legacy")
+        self.assertEqual(name, "legacy.wav")
+        path = store.write_audio("tts", "legacy", audio, 48_000)
+        self.assertEqual(path.name, "legacy.flac")
+        self.assertFalse((self.root / "tts" / "legacy.wav").exists())
+        np.testing.assert_allclose(store.read_audio("tts", "legacy")[0], audio, atol=1e-4)
+
+        npy_store = CacheStore(self.root, encoding="npy")
+        stereo = np.random.default_rng(0).normal(size=(1_000, 2)).astype(np.float32)
+        npy_store.write_audio("music", "chunk", stereo, 48_000)
+        loaded, name = npy_store.read_audio("music", "chunk")
+        self.assertEqual(name, "chunk.npy")
+        self.assertIsInstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, stereo)
+
+
+class CacheCliTests(unittest.TestCase):
+    def test_stats_and_prune_commands(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            project_path = Path(td) / "project.json"
+            project_path.write_text(json.dumps(Project(project_id="p").model_dump()))
+            store = CacheStore(Path(td) / "cache")
+            store.write_audio("tts", "a", _tone(48_000), 48_000)
+            store.flush()
+            runner = CliRunner()
+            with mock.patch.dict(os.environ, {}, clear=False):
+                os.environ.pop("AFFIRMBEAT_CACHE_DIR", None)
+                stats = runner.invoke(app, ["cache", "stats", str(project_path)])
+                self.assertEqual(stats.exit_code, 0, stats.output)
+                self.assertEqual(json.loads(stats.output)["entries"], 1)
+                pruned = runner.invoke(app, ["cache", "prune", str(project_path), "--max-mb", "0.01"])
+                self.assertEqual(pruned.exit_code, 0, pruned.output)
+                self.assertIn("Evicted 1 entries", pruned.output)
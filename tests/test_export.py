@@ -0,0 +1,77 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+from pydantic import ValidationError
+
+from affirmbeat.core.project import ExportConfig, Project, VoiceTrack
+from affirmbeat.render.export import export_format
+from affirmbeat.render.renderer import render_project
+from conftest import make_project, write_project
+
+
+def _project() -> Project:
+    return make_project(
+        voice_tracks=[
+            VoiceTrack(id="t1", lines=["I am calm."]),
+            VoiceTrack(id="t2", lines=["I rest."]),
+        ]
+    )
+
+
+class ExportTests(unittest.TestCase):
+    def _check_formats(self, streaming: bool) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            project_path = write_project(Path(td) / "project.json", _project())
+            output = render_project(project_path, streaming=streaming, block_sec=0.3)
+            reference, _ = sf.read(output / "stems" / "t1.wav", dtype="float32")
+
+            output = render_project(
+                project_path,
+                streaming=streaming,
+                block_sec=0.3,
+                audio_format="flac",
+                subtype="PCM_24",
+                stems=["t1", "music"],
+            )
+            self.assertEqual(sorted(p.name for p in (output / "stems").iterdir()), ["music.flac", "t1.flac"])
+            self.assertFalse((output / "final.wav").exists())
+            self.assertEqual(sf.info(str(output / "final.flac")).subtype, "PCM_24")
+            stem, _ = sf.read(output / "stems" / "t1.flac", dtype="float32")
+            np.testing.assert_allclose(stem, reference, atol=1.0 / 32768)
+
+            report = json.loads((output / "render_report.json").read_text())
+            export = report["export"]
+            self.assertEqual((export["format"], export["subtype"]), ("flac", "PCM_24"))
+            self.assertEqual(export["stems"], ["t1", "music"])
+            self.assertEqual(list(export["files"]), ["final.flac", "stems/t1.flac", "stems/music.flac"])
+            for relative, stats in export["files"].items():
+                self.assertEqual(stats["bytes"], (output / relative).stat().st_size)
+                self.assertEqual(stats["samples"], 2 * 16_000)
+                self.assertGreaterEqual(stats["encode_sec"], 0.0)
+
+            output = render_project(
+                project_path, streaming=streaming, block_sec=0.3, audio_format="ogg", stems="none"
+            )
+            self.assertEqual(list((output / "stems").iterdir()), [])
+            self.assertEqual(sf.info(str(output / "final.ogg")).subtype, "VORBIS")
+            self.assertFalse((output / "final.flac").exists())
+
+    def test_in_memory_export_formats(self) -> None:
+        self._check_formats(streaming=False)
+
+    def test_streaming_export_formats(self) -> None:
+        self._check_formats(streaming=True)
+
+    def test_rejects_unsupported_combinations(self) -> None:
+        with self.assertRaises(ValidationError):
+            ExportConfig(format="flac", subtype="FLOAT")
+        with self.assertRaises(ValueError):
+            export_format("opus", sample_rate=44_100)
+        with tempfile.TemporaryDirectory() as td:
+            project_path = write_project(Path(td) / "project.json", _project())
+            with self.assertRaises(ValueError):
+                render_project(project_path, stems=["t3"])
@@ -0,0 +1,161 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from affirmbeat.render.jobs import JobQueue, RenderCancelled, run_job, run_worker
+from affirmbeat.render.renderer import render_project
+from conftest import make_project, write_project
+
+
+class JobQueueTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.queue = JobQueue(self.root / "jobs.sqlite", concurrency=1)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_identical_pending_jobs_are_merged(self) -> None:
+        project = make_project()
+        path = write_project(self.root / "a" / "project.json", project)
+        first = self.queue.submit(path)
+        self.assertEqual(self.queue.submit(path), first)
+
+        project.mix.master_peak_db = -3.0
+        write_project(path, project)
+        second = self.queue.submit(path)
+        self.assertNotEqual(second, first)
+
+        self.assertTrue(self.queue.cancel(second))
+        self.assertEqual(self.queue.get(second)["state"], "cancelled")
+        self.assertFalse(self.queue.cancel(second))
+        self.assertNotEqual(self.queue.submit(path), second)
+
+    def test_claims_respect_concurrency_limit(self) -> None:
+        first = self.queue.submit(write_project(self.root / "a" / "project.json", make_project()))
+        second = self.queue.submit(write_project(self.root / "b" / "project.json", make_project()))
+        self.assertEqual(self.queue.claim()["id"], first)
+        self.assertIsNone(self.queue.claim())
+        self.assertEqual(self.queue.get(second)["state"], "queued")
+
+        # A job whose worker is gone no longer holds a slot.
+        with mock.patch("affirmbeat.render.jobs._pid_alive", return_value=False):
+            claimed = self.queue.claim()
+        self.assertEqual(claimed["id"], second)
+        self.assertEqual(self.queue.get(first)["state"], "failed")
+
+    def test_worker_renders_queued_jobs(self) -> None:
+        path = write_project(self.root / "a" / "project.json", make_project())
+        job_id = self.queue.submit(path)
+        run_worker(self.queue.db_path, stop_when_idle=True)
+        job = self.queue.get(job_id)
+        self.assertEqual(job["state"], "done")
+        self.assertEqual((job["stage"], job["progress"]), ("done", 1.0))
+        self.assertTrue((Path(job["output"]) / "final.wav").exists())
+
+    def test_worker_warms_up_once(self) -> None:
+        first = self.queue.submit(write_project(self.root / "a" / "project.json", make_project()))
+        self.queue.submit(write_project(self.root / "b" / "project.json", make_project()))
+        with mock.patch("affirmbeat.render.jobs.warm_up_providers") as warm_up:
+            run_worker(self.queue.db_path, stop_when_idle=True)
+        warm_up.assert_called_once()
+        self.assertEqual(warm_up.call_args.args[0].project_id, json.loads(
+            Path(self.queue.get(first)["project_path"]).read_text())["project_id"])
+
+    def test_cancelling_a_running_job_stops_the_render(self) -> None:
+        path = write_project(self.root / "a" / "project.json", make_project())
+        job_id = self.queue.submit(path)
+        job = self.queue.claim()
+        self.assertTrue(self.queue.cancel(job_id))
+        self.assertEqual(self.queue.get(job_id)["state"], "running")
+        run_job(self.queue, job)
+        self.assertEqual(self.queue.get(job_id)["state"], "cancelled")
+        self.assertFalse((path.parent / "output" / "final.wav").exists())
+
+
+class RenderProgressTests(unittest.TestCase):
+    def test_reports_stages_in_order(self) -> None:
+        for streaming in (False, True):
+            with tempfile.TemporaryDirectory() as td:
+                path = write_project(Path(td) / "project.json", make_project())
+                updates: list[tuple[str, float]] = []
+                render_project(
+                    path,
+                    streaming=streaming,
+                    block_sec=0.25,
+                    progress=lambda stage, fraction: updates.append((stage, fraction)),
+                )
+                stages = list(dict.fromkeys(stage for stage, _ in updates))
+                self.assertEqual(stages[:2], ["script", "tts"])
+                self.assertEqual(stages[-2:], ["export", "done"])
+                self.assertIn("mix", stages)
+                mix = [fraction for stage, fraction in updates if stage == "mix"]
+                self.assertEqual(mix, sorted(mix))
+                self.assertAlmostEqual(mix[-1], 1.0)
+                if not streaming:
+                    exported = [fraction for stage, fraction in updates if stage == "export"]
+                    self.assertAlmostEqual(exported[-1], 1.0)
+                self.assertEqual(updates[-1], ("done", 1.0))
+
+    def test_cancel_is_noticed_within_tts_and_music(self) -> None:
+        project = make_project()
+        project.voice_tracks[0].lines = [f"Line {i}." for i in range(12)]
+        project.duration_sec = 8
+        for stage in ("tts", "music"):
+            stages: list[str] = []
+
+            def progress(current: str, fraction: float) -> None:
+                stages.append(current)
+                if stages.count(stage) == 2:
+                    raise RenderCancelled()
+
+            with tempfile.TemporaryDirectory() as td:
+                path = write_project(Path(td) / "project.json", project)
+                with self.assertRaises(RenderCancelled):
+                    render_project(path, tts_workers=1, music_workers=1, progress=progress)
+            # The render stopped inside the stage rather than at its end.
+            self.assertEqual(stages[-1], stage)
+
+    def test_failed_render_stops_music_generation(self) -> None:
+        generated: list[int] = []
+
+        class SlowMusic:
+            def generate(self, prompt, duration_sec, seed, bpm):
+                time.sleep(0.05)
+                generated.append(seed)
+                return np.zeros((int(duration_sec * 16_000), 2), dtype=np.float32)
+
+        def progress(stage: str, fraction: float) -> None:
+            if stage == "tts":
+                raise RenderCancelled()
+
+        project = make_project(duration_sec=20)
+        project.music.crossfade_ms = 0
+        with tempfile.TemporaryDirectory() as td, mock.patch(
+            "affirmbeat.render.renderer._music_provider", return_value=SlowMusic()
+        ):
+            path = write_project(Path(td) / "project.json", project)
+            with self.assertRaises(RenderCancelled):
+                render_project(path, music_workers=1, progress=progress)
+            finished = len(generated)
+            time.sleep(0.2)
+        self.assertEqual(len(generated), finished)
+        self.assertLess(finished, 20)
+
+    def test_interrupted_render_leaves_no_partial_stems(self) -> None:
+        def progress(stage: str, fraction: float) -> None:
+            if stage == "mix" and fraction > 0:
+                raise RenderCancelled()
+
+        with tempfile.TemporaryDirectory() as td:
+            path = write_project(Path(td) / "project.json", make_project())
+            with self.assertRaises(RenderCancelled):
+                render_project(path, streaming=True, block_sec=0.25, progress=progress)
+            self.assertEqual([p.name for p in (Path(td) / "cache").rglob("*.tmp")], [])
+            self.assertEqual(list((Path(td) / "cache").rglob("stems/*.npy")), [])
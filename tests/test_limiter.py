@@ -0,0 +1,65 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from affirmbeat.dsp.limiter import LookaheadLimiter, apply_peak_limiter, db_to_linear, limit_in_blocks
+
+
+def _signal(sample_rate: int) -> np.ndarray:
+    t = np.arange(sample_rate * 4) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    audio = np.stack([tone, tone * 0.8], axis=1).astype(np.float32)
+    # A short transient well above the ceiling in the middle of the session.
+    audio[2 * sample_rate : 2 * sample_rate + 40] *= 5.0
+    return audio
+
+
+class LookaheadLimiterTests(unittest.TestCase):
+    def test_transient_is_limited_without_touching_the_rest(self) -> None:
+        sample_rate = 16_000
+        audio = _signal(sample_rate)
+        limit = db_to_linear(-1.0)
+        for true_peak in (False, True):
+            out = apply_peak_limiter(audio, -1.0, sample_rate, release_ms=50.0, true_peak=true_peak)
+            self.assertEqual(out.shape, audio.shape)
+            self.assertLessEqual(float(np.abs(out).max()), limit + 1e-6)
+            # Outside the look-ahead and release the original level survives.
+            np.testing.assert_allclose(out[: sample_rate], audio[: sample_rate], atol=1e-6)
+            np.testing.assert_allclose(out[3 * sample_rate :], audio[3 * sample_rate :], atol=1e-6)
+
+    def test_blocks_match_single_pass(self) -> None:
+        sample_rate = 16_000
+        audio = _signal(sample_rate)
+        expected = apply_peak_limiter(audio, -3.0, sample_rate, true_peak=True)
+        limiter = LookaheadLimiter(sample_rate, -3.0, true_peak=True)
+        rng = np.random.default_rng(0)
+        parts = []
+        pos = 0
+        while pos < audio.shape[0]:
+            size = int(rng.integers(1, 3_000))
+            parts.append(limiter.process(audio[pos : pos + size]))
+            pos += size
+        parts.append(limiter.flush())
+        np.testing.assert_array_equal(np.concatenate(parts), expected)
+        self.assertGreater(limiter.stats()["max_gain_reduction_db"], 3.0)
+
+    def test_whole_session_limiting_stays_block_sized(self) -> None:
+        sample_rate = 16_000
+        audio = np.tile(_signal(sample_rate), (8, 1))
+        expected = apply_peak_limiter(audio[: 4 * sample_rate], -3.0, sample_rate)
+        small = limit_in_blocks(LookaheadLimiter(sample_rate, -3.0), audio[: 4 * sample_rate], 1_000)
+        np.testing.assert_array_equal(small, expected)
+
+        def peak_bytes(session: np.ndarray) -> int:
+            tracemalloc.start()
+            try:
+                limit_in_blocks(LookaheadLimiter(sample_rate, -3.0, true_peak=True), session)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        # Doubling the session only adds the extra output, not several copies
+        # of it in float64 temporaries.
+        half = audio[: audio.shape[0] // 2]
+        self.assertLess(peak_bytes(audio) - peak_bytes(half), 1.5 * half.nbytes)
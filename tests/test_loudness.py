@@ -0,0 +1,73 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from affirmbeat.dsp.limiter import LookaheadLimiter
+from affirmbeat.dsp.loudness import LoudnessMeter, apply_loudness, measure_loudness
+from affirmbeat.render.mixer import master_mix
+from affirmbeat.render.streaming import render_streaming
+
+try:
+    import pyloudnorm
+except Exception:  # pragma: no cover - reference implementation is optional
+    pyloudnorm = None
+
+
+def _signal(sample_rate: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(sample_rate * 7) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 440 * t) * (t < 3)
+    noise = 0.05 * rng.standard_normal(t.shape[0])
+    return np.stack([tone, noise], axis=1).astype(np.float32)
+
+
+class LoudnessMeterTests(unittest.TestCase):
+    def test_blocks_match_single_pass(self) -> None:
+        audio = _signal(16_000)
+        meter = LoudnessMeter(16_000)
+        rng = np.random.default_rng(1)
+        pos = 0
+        while pos < audio.shape[0]:
+            size = int(rng.integers(1, 9_000))
+            meter.process(audio[pos : pos + size])
+            pos += size
+        self.assertAlmostEqual(meter.integrated_loudness(), measure_loudness(audio, 16_000), places=9)
+
+    @unittest.skipIf(pyloudnorm is None, "pyloudnorm not installed")
+    def test_matches_pyloudnorm(self) -> None:
+        for sample_rate in (16_000, 44_100, 48_000):
+            audio = _signal(sample_rate).astype(np.float64)
+            expected = pyloudnorm.Meter(sample_rate).integrated_loudness(audio)
+            self.assertAlmostEqual(measure_loudness(audio, sample_rate), expected, places=3)
+
+    def test_normalizes_to_target_and_ignores_silence(self) -> None:
+        audio = _signal(16_000)
+        normalized = apply_loudness(audio, 16_000, -23.0)
+        self.assertAlmostEqual(measure_loudness(normalized, 16_000), -23.0, places=2)
+        silence = np.zeros((16_000, 2), dtype=np.float32)
+        np.testing.assert_array_equal(apply_loudness(silence, 16_000, -23.0), silence)
+
+    def test_silent_mix_reports_valid_json(self) -> None:
+        silence = np.zeros((16_000, 2), dtype=np.float32)
+        report: dict = {}
+        master_mix(silence, -1.0, 16_000, -23.0, report=report)
+        self.assertIsNone(report["loudness"]["measured_lufs"])
+        json.dumps(report, allow_nan=False)
+
+        report = {}
+        with tempfile.TemporaryDirectory() as td:
+            render_streaming(
+                Path(td),
+                16_000,
+                16_000,
+                {"voice": lambda start, frames: np.zeros((frames, 2), dtype=np.float32)},
+                LookaheadLimiter(16_000, -1.0),
+                4_000,
+                report,
+                target_lufs=-23.0,
+            )
+        self.assertIsNone(report["loudness"]["measured_lufs"])
+        json.dumps(report, allow_nan=False)
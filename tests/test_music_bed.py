@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from affirmbeat.core.cache import CacheStore
+from affirmbeat.core.project import MusicConfig, Project
+from affirmbeat.dsp.fades import equal_power_fade
+from affirmbeat.providers.music_placeholder import PlaceholderMusicProvider
+from affirmbeat.render.music_bed import MusicBed, build_music_bed, prepare_music_chunks
+
+
+def _reference_bed(project: Project) -> np.ndarray:
+    # The original concatenate-and-crossfade assembly, kept as an oracle.
+    provider = PlaceholderMusicProvider(project.sample_rate)
+    sr = project.sample_rate
+    total = int(project.duration_sec * sr)
+    chunk_sec = min(project.music.chunk_sec, project.duration_sec)
+    fade_sec = project.music.crossfade_ms / 1000.0
+    fade = int(fade_sec * sr)
+    output = None
+    idx = 0
+    while output is None or output.shape[0] < total:
+        gen_sec = chunk_sec + fade_sec if output is not None and fade > 0 else chunk_sec
+        chunk = provider.generate("", gen_sec, project.music.seed + idx, None)
+        chunk = chunk[: int(gen_sec * sr)]
+        if output is None:
+            output = chunk
+        elif fade > 0:
+            fade_in, fade_out = equal_power_fade(fade)
+            blended = output[-fade:] * fade_out[:, None] + chunk[:fade] * fade_in[:, None]
+            output = np.concatenate([output[:-fade], blended, chunk[fade:]])
+        else:
+            output = np.concatenate([output, chunk])
+        idx += 1
+    return output[:total]
+
+
+class MusicBedTests(unittest.TestCase):
+    def _project(self, crossfade_ms: int) -> Project:
+        return Project(
+            project_id="bed",
+            sample_rate=8_000,
+            duration_sec=7,
+            music=MusicConfig(provider="placeholder", chunk_sec=2, crossfade_ms=crossfade_ms, seed=5),
+        )
+
+    def test_in_place_assembly_matches_reference(self) -> None:
+        for crossfade_ms in (0, 250, 2_000):
+            project = self._project(crossfade_ms)
+            with tempfile.TemporaryDirectory() as td:
+                cache = CacheStore(Path(td))
+                report = {"music_cached": [], "music_generated": []}
+                bed = build_music_bed(
+                    project,
+                    Path(td) / "project.json",
+                    PlaceholderMusicProvider(project.sample_rate),
+                    report,
+                    cache=cache,
+                )
+                np.testing.assert_allclose(bed, _reference_bed(project), atol=1e-4)
+
+    def test_lazy_windows_match_full_bed(self) -> None:
+        project = self._project(500)
+        with tempfile.TemporaryDirectory() as td:
+            cache = CacheStore(Path(td), encoding="npy")
+            provider = PlaceholderMusicProvider(project.sample_rate)
+            report = {"music_cached": [], "music_generated": []}
+            full = build_music_bed(project, Path(td) / "p.json", provider, report, cache=cache)
+            lazy = MusicBed(project, Path(td) / "p.json", provider, report, cache=cache)
+            self.assertEqual(lazy.shape, full.shape)
+            for start, frames in [(0, 100), (15_500, 1_000), (15_990, 30), (40_000, 20_000)]:
+                np.testing.assert_array_equal(lazy[start : start + frames], full[start : start + frames])
+
+    def test_parallel_generation_reports_each_chunk_once(self) -> None:
+        project = self._project(250)
+        with tempfile.TemporaryDirectory() as td:
+            provider = PlaceholderMusicProvider(project.sample_rate)
+            report = {"music_cached": [], "music_generated": []}
+            bed = build_music_bed(
+                project, Path(td) / "p.json", provider, report, cache=CacheStore(Path(td)), workers=3
+            )
+            np.testing.assert_allclose(bed, _reference_bed(project), atol=1e-4)
+            self.assertEqual(len(report["music_generated"]), 4)
+            self.assertEqual(report["music_cached"], [])
+
+            again = {"music_cached": [], "music_generated": []}
+            plan = prepare_music_chunks(project, Path(td) / "p.json", provider, again, CacheStore(Path(td)))
+            self.assertEqual(plan.generated, set())
+            self.assertEqual(again["music_cached"], report["music_generated"])
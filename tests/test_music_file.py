@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from affirmbeat.core.cache import CacheStore
+from affirmbeat.dsp.resample import resample_audio
+from affirmbeat.providers.music_file import FileMusicProvider
+
+
+def _reference(audio: np.ndarray, sr: int, target_sr: int, duration_sec: float) -> np.ndarray:
+    # The original whole-file read, resample and tile.
+    if audio.ndim == 1:
+        audio = np.stack([audio, audio], axis=1)
+    if sr != target_sr:
+        audio = resample_audio(audio, sr, target_sr)
+    target = int(duration_sec * target_sr)
+    audio = np.tile(audio, (target // audio.shape[0] + 1, 1))
+    return audio[:target]
+
+
+class FileMusicProviderTests(unittest.TestCase):
+    def test_loops_native_rate_file_from_disk(self) -> None:
+        rng = np.random.default_rng(1)
+        audio = (rng.standard_normal(3_001) * 0.1).astype(np.float32)
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "bed.wav"
+            sf.write(path, audio, 8_000, subtype="FLOAT")
+            provider = FileMusicProvider(8_000)
+            chunk = provider.generate(str(path), 2.3, 0)
+        np.testing.assert_array_equal(chunk, _reference(audio, 8_000, 8_000, 2.3))
+
+    def test_resampled_file_is_cached_once(self) -> None:
+        rng = np.random.default_rng(2)
+        audio = (rng.standard_normal((4_410, 2)) * 0.1).astype(np.float32)
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            path = root / "bed.wav"
+            sf.write(path, audio, 44_100, subtype="FLOAT")
+            cache = CacheStore(root / "cache")
+            first = FileMusicProvider(48_000, cache=cache).generate(str(path), 0.25, 0)
+            self.assertEqual(cache.stats()["namespaces"]["music_file"]["entries"], 1)
+
+            again = FileMusicProvider(48_000, cache=cache)
+            second = again.generate(str(path), 0.25, 1)
+            again.generate(str(path), 0.3, 2)
+            self.assertEqual(cache.hits, 1)
+        np.testing.assert_array_equal(first, second)
+        np.testing.assert_allclose(first, _reference(audio, 44_100, 48_000, 0.25), atol=1e-6)
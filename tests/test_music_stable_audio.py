@@ -0,0 +1,113 @@
+import contextlib
+import sys
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from affirmbeat.providers.music_stable_audio import (
+    StableAudioOpenProvider,
+    evict_idle_models,
+    loaded_models,
+    shutdown_stable_audio_models,
+    warm_up_stable_audio,
+)
+
+
+def _fake_modules(calls: list[dict], loads: list[str] | None = None) -> dict[str, types.ModuleType]:
+    class FakeModel:
+        def to(self, device):
+            return self
+
+        def eval(self):
+            return self
+
+    def generate_diffusion_cond(
+        model,
+        steps=100,
+        conditioning=None,
+        batch_size=1,
+        seed=-1,
+        device="cpu",
+        sampler_type=None,
+    ):
+        calls.append({"conditioning": conditioning, "batch_size": batch_size, "seed": seed, "steps": steps})
+        rng = np.random.default_rng(seed)
+        length = int(max(item["seconds_total"] for item in conditioning) * 1_000)
+        return rng.standard_normal((batch_size, 2, length)).astype(np.float32)
+
+    torch = types.ModuleType("torch")
+    torch.cuda = types.SimpleNamespace(is_available=lambda: False)
+    torch.bfloat16 = "bfloat16"
+    torch.inference_mode = contextlib.nullcontext
+    torch.set_num_threads = lambda count: calls.append({"threads": count})
+
+    def autocast(device_type, dtype):
+        calls.append({"autocast": (device_type, dtype)})
+        return contextlib.nullcontext()
+
+    torch.autocast = autocast
+    sat = types.ModuleType("stable_audio_tools")
+
+    def get_pretrained_model(model_id):
+        if loads is not None:
+            loads.append(model_id)
+        return FakeModel(), {"sample_rate": 1_000}
+
+    sat.get_pretrained_model = get_pretrained_model
+    inference = types.ModuleType("stable_audio_tools.inference")
+    generation = types.ModuleType("stable_audio_tools.inference.generation")
+    generation.generate_diffusion_cond = generate_diffusion_cond
+    return {
+        "torch": torch,
+        "stable_audio_tools": sat,
+        "stable_audio_tools.inference": inference,
+        "stable_audio_tools.inference.generation": generation,
+    }
+
+
+class StableAudioProviderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        shutdown_stable_audio_models()
+        self.addCleanup(shutdown_stable_audio_models)
+
+    def test_each_chunk_is_diffused_with_its_own_seed(self) -> None:
+        calls: list[dict] = []
+        with mock.patch.dict(sys.modules, _fake_modules(calls)):
+            provider = StableAudioOpenProvider(1_000, model_id="fake", steps=8)
+            chunks = [provider.generate("calm", duration, seed, 60) for duration, seed in ((2.0, 3), (2.5, 4))]
+            again = provider.generate("calm", 2.5, 4, 60)
+
+        self.assertEqual([chunk.shape for chunk in chunks], [(2_000, 2), (2_500, 2)])
+        self.assertEqual([call["seed"] for call in calls], [3, 4, 4])
+        self.assertEqual(calls[0]["steps"], 8)
+        self.assertEqual(calls[0]["conditioning"], [{"prompt": "calm", "seconds_total": 2.0, "bpm": 60}])
+        np.testing.assert_array_equal(chunks[1], again)
+
+    def test_registry_keeps_models_resident_across_providers(self) -> None:
+        calls: list[dict] = []
+        loads: list[str] = []
+        with mock.patch.dict(sys.modules, _fake_modules(calls, loads)):
+            warm_up_stable_audio("fake")
+            for _ in range(3):
+                StableAudioOpenProvider(1_000, model_id="fake").generate("calm", 1.0, 1, None)
+            self.assertEqual(loads, ["fake"])
+            self.assertEqual(loaded_models(), [("fake", "cpu")])
+
+            StableAudioOpenProvider(1_000, model_id="other").generate("calm", 1.0, 1, None)
+            self.assertEqual(loaded_models(), [("other", "cpu")])
+
+            self.assertEqual(evict_idle_models(idle_sec=0.0), 1)
+            self.assertEqual(loaded_models(), [])
+
+    def test_torch_settings_are_applied_around_generation(self) -> None:
+        calls: list[dict] = []
+        with mock.patch.dict(sys.modules, _fake_modules(calls)):
+            provider = StableAudioOpenProvider(
+                1_000, model_id="fake", torch_threads=3, precision="bf16"
+            )
+            provider.generate("calm", 1.0, 1, None)
+        self.assertEqual(calls[0], {"threads": 3})
+        self.assertEqual(calls[1], {"autocast": ("cpu", "bfloat16")})
+        self.assertIn("conditioning", calls[2])
@@ -7,13 +7,16 @@ from pathlib import Path
 import numpy as np
 import soundfile as sf
 
-from affirmbeat.core.project import Affirmation, MusicConfig, Project, TTSConfig
+from affirmbeat.core.project import (
+    Affirmation,
+    MusicConfig,
+    Project,
+    ScriptConfig,
+    TTSConfig,
+    VoiceTrack,
+)
 from affirmbeat.render.renderer import render_project
-
-
-def _write_project(path: Path, project: Project) -> Path:
-    path.write_text(json.dumps(project.model_dump(), indent=2), encoding="utf-8")
-    return path
+from conftest import write_project
 
 
 class RenderSmokeTests(unittest.TestCase):
@@ -33,11 +36,15 @@ class RenderSmokeTests(unittest.TestCase):
                 ),
             )
             project.binaural.enabled = False
-            project_path = _write_project(root / "project.json", project)
+            project_path = write_project(root / "project.json", project)
             output_dir = render_project(project_path)
             self.assertTrue((output_dir / "final.wav").exists())
             self.assertTrue((output_dir / "render_report.json").exists())
             self.assertTrue((output_dir / "stems").exists())
+            report = json.loads((output_dir / "render_report.json").read_text())
+            for name in ("render", "script", "tts", "music", "placement", "mix", "limiter", "export"):
+                self.assertIn(name, report["timings"])
+            self.assertEqual(report["timings"]["mix"]["samples"], 2 * project.sample_rate)
 
     def test_render_file_music(self) -> None:
         with tempfile.TemporaryDirectory() as td:
@@ -62,6 +69,36 @@ class RenderSmokeTests(unittest.TestCase):
                 ),
             )
             project.binaural.enabled = False
-            project_path = _write_project(root / "project.json", project)
+            project_path = write_project(root / "project.json", project)
             output_dir = render_project(project_path)
             self.assertTrue((output_dir / "final.wav").exists())
+
+    def test_render_voice_tracks_parallel_tts(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            project = Project(
+                project_id=str(uuid.uuid4()),
+                duration_sec=4,
+                voice_tracks=[
+                    VoiceTrack(id="t1", lines=["I am calm.", "I am kind."]),
+                    VoiceTrack(id="t2", lines=["I am calm.", "I rest."], mode="lead_whisper"),
+                ],
+                script=ScriptConfig(repeat_each=2, gap_ms=100),
+                tts=TTSConfig(provider="dummy"),
+                music=MusicConfig(provider="placeholder", chunk_sec=1, crossfade_ms=0),
+            )
+            project.binaural.enabled = False
+            project_path = write_project(root / "project.json", project)
+            output_dir = render_project(project_path, tts_workers=3)
+            report = json.loads((output_dir / "render_report.json").read_text())
+            self.assertEqual(len(report["tts_jobs"]), 3)
+            self.assertTrue(all(not job["cached"] for job in report["tts_jobs"]))
+            self.assertEqual(
+                sorted(p.stem for p in (output_dir / "stems").iterdir()),
+                ["music", "t1", "t2"],
+            )
+
+            render_project(project_path, tts_workers=3)
+            report = json.loads((output_dir / "render_report.json").read_text())
+            self.assertEqual(len(report["tts_cached"]), 3)
+            self.assertEqual(report["tts_generated"], [])
@@ -0,0 +1,47 @@
+import math
+import unittest
+
+import numpy as np
+from scipy.signal import resample_poly
+
+from affirmbeat.dsp.resample import StreamingResampler, resample_audio
+
+
+def _reference(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    gcd = math.gcd(orig_sr, target_sr)
+    channels = audio[:, None] if audio.ndim == 1 else audio
+    out = np.stack(
+        [resample_poly(channels[:, ch], target_sr // gcd, orig_sr // gcd) for ch in range(channels.shape[1])],
+        axis=1,
+    )
+    return out[:, 0] if audio.ndim == 1 else out
+
+
+class ResampleTests(unittest.TestCase):
+    RATES = [(22_050, 48_000), (44_100, 48_000), (48_000, 44_100), (16_000, 48_000)]
+
+    def test_whole_signal_matches_resample_poly(self) -> None:
+        rng = np.random.default_rng(0)
+        for orig_sr, target_sr in self.RATES:
+            for shape in [(1,), (9_001,), (5_000, 2)]:
+                audio = rng.standard_normal(shape).astype(np.float32)
+                out = resample_audio(audio, orig_sr, target_sr)
+                self.assertEqual(out.dtype, np.float32)
+                np.testing.assert_allclose(out, _reference(audio, orig_sr, target_sr), atol=2e-6)
+
+    def test_streaming_blocks_match_whole_signal(self) -> None:
+        rng = np.random.default_rng(1)
+        for orig_sr, target_sr in self.RATES:
+            for shape in [(7_777,), (12_345, 2)]:
+                audio = rng.standard_normal(shape).astype(np.float32)
+                resampler = StreamingResampler(orig_sr, target_sr)
+                parts = []
+                pos = 0
+                while pos < audio.shape[0]:
+                    size = int(rng.integers(1, 2_000))
+                    parts.append(resampler.process(audio[pos : pos + size]))
+                    pos += size
+                parts.append(resampler.flush())
+                out = np.concatenate(parts)
+                self.assertEqual(out.shape[0], resampler.output_frames(audio.shape[0]))
+                np.testing.assert_allclose(out, resample_audio(audio, orig_sr, target_sr), atol=2e-6)
@@ -0,0 +1,84 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from affirmbeat.core.project import (
+    BinauralConfig,
+    Project,
+    RenderConfig,
+    ScriptConfig,
+    VoiceTrack,
+)
+from affirmbeat.render.renderer import render_project
+from conftest import make_project, write_project
+
+
+def _project() -> Project:
+    return make_project(
+        duration_sec=3,
+        voice_tracks=[
+            VoiceTrack(id="t1", lines=["I am calm.", "I am kind."]),
+            VoiceTrack(id="t2", lines=["I rest."], mode="lead_whisper"),
+        ],
+        script=ScriptConfig(repeat_each=2, gap_ms=100),
+        binaural=BinauralConfig(enabled=True, fade_in_ms=500, fade_out_ms=500),
+        render=RenderConfig(reuse_stems=True),
+    )
+
+
+class StemReuseTests(unittest.TestCase):
+    def _check_rerender(self, streaming: bool) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            project = _project()
+            project_path = write_project(root / "project.json", project)
+            output = render_project(project_path, streaming=streaming, block_sec=0.37)
+            report = json.loads((output / "render_report.json").read_text())
+            self.assertEqual(report["stems_reused"], [])
+            stem_files = list((root / "cache" / "stems").glob("*.npy"))
+            self.assertEqual(len(stem_files), 4)
+            for path in stem_files:
+                self.assertEqual(np.load(path, mmap_mode="r").shape, (3 * 16_000, 2))
+
+            project.voice_tracks[1].gain_db = -6.0
+            project.mix.master_peak_db = -3.0
+            write_project(project_path, project)
+            output = render_project(project_path, streaming=streaming, block_sec=0.37)
+            report = json.loads((output / "render_report.json").read_text())
+            self.assertEqual(report["stems_reused"], ["t1", "music", "binaural"])
+            self.assertFalse(report["stems"]["t2"]["reused"])
+            self.assertEqual(report["tts_generated"], [])
+            self.assertEqual(report["music_generated"], [])
+            final, _ = sf.read(output / "final.wav", dtype="float32")
+            stems = {p.stem: sf.read(p, dtype="float32")[0] for p in (output / "stems").iterdir()}
+
+            project.render.reuse_stems = False
+            fresh_dir = root / "fresh"
+            fresh_dir.mkdir()
+            fresh_out = render_project(
+                write_project(fresh_dir / "project.json", project),
+                streaming=streaming,
+                block_sec=0.37,
+            )
+            expected, _ = sf.read(fresh_out / "final.wav", dtype="float32")
+            np.testing.assert_allclose(final, expected, atol=1.0 / 32768)
+            for path in (fresh_out / "stems").iterdir():
+                expected_stem, _ = sf.read(path, dtype="float32")
+                np.testing.assert_allclose(stems[path.stem], expected_stem, atol=1.0 / 32768)
+
+    def test_rerender_reuses_unchanged_stems(self) -> None:
+        self._check_rerender(streaming=False)
+
+    def test_streaming_rerender_reuses_unchanged_stems(self) -> None:
+        self._check_rerender(streaming=True)
+
+    def test_stems_are_not_cached_by_default(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            project = _project()
+            project.render = RenderConfig()
+            render_project(write_project(Path(td) / "project.json", project))
+            self.assertEqual(list((Path(td) / "cache").rglob("stems/*")), [])
@@ -0,0 +1,126 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import soundfile as sf
+
+from affirmbeat.core.project import (
+    Affirmation,
+    BinauralConfig,
+    Project,
+    ScriptConfig,
+)
+from affirmbeat.render.renderer import render_project
+from affirmbeat.render.timeline import VoiceBus
+from conftest import make_project, write_project
+
+
+def _project() -> Project:
+    return make_project(
+        duration_sec=3,
+        voice_tracks=[],
+        affirmations=[
+            Affirmation(id="a1", text="I am calm."),
+            Affirmation(id="a2", text="I breathe slowly and deeply."),
+        ],
+        script=ScriptConfig(mode="triple_stack", repeat_each=2, gap_ms=100),
+        binaural=BinauralConfig(enabled=True, fade_in_ms=500, fade_out_ms=500),
+    )
+
+
+class StreamingRenderTests(unittest.TestCase):
+    def test_streaming_matches_in_memory(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            memory_dir = root / "memory"
+            stream_dir = root / "stream"
+            memory_dir.mkdir()
+            stream_dir.mkdir()
+            project = _project()
+            memory_out = render_project(write_project(memory_dir / "project.json", project))
+            stream_out = render_project(
+                write_project(stream_dir / "project.json", project),
+                streaming=True,
+                block_sec=0.37,
+            )
+
+            expected, _ = sf.read(memory_out / "final.wav", dtype="float32")
+            actual, _ = sf.read(stream_out / "final.wav", dtype="float32")
+            self.assertEqual(expected.shape, actual.shape)
+            np.testing.assert_allclose(actual, expected, atol=2.0 / 32768)
+
+            memory_stems = sorted(p.name for p in (memory_out / "stems").iterdir())
+            stream_stems = sorted(p.name for p in (stream_out / "stems").iterdir())
+            self.assertEqual(memory_stems, stream_stems)
+            self.assertFalse((stream_out / ".premaster.wav").exists())
+            report = json.loads((stream_out / "render_report.json").read_text())
+            self.assertIn("streaming", report)
+
+    def test_each_voice_bus_is_summed_once(self) -> None:
+        # 5 s blocks at 48 kHz are several scratch pieces long, and the
+        # lead_whisper variants sit on two tracks.
+        for mode in ("triple_stack", "lead_whisper"):
+            for streaming in (False, True):
+                project = _project()
+                project.sample_rate = 48_000
+                project.duration_sec = 20
+                project.script.mode = mode
+                buses: list[VoiceBus] = []
+                summed: list[int] = []
+                init, render = VoiceBus.__init__, VoiceBus._render
+
+                def track_init(bus, *args, **kwargs):
+                    init(bus, *args, **kwargs)
+                    buses.append(bus)
+
+                def track_render(bus, start, end):
+                    summed.append(end - start)
+                    return render(bus, start, end)
+
+                with tempfile.TemporaryDirectory() as td, mock.patch.object(
+                    VoiceBus, "__init__", track_init
+                ), mock.patch.object(VoiceBus, "_render", track_render):
+                    render_project(
+                        write_project(Path(td) / "project.json", project),
+                        streaming=streaming,
+                        block_sec=5.0,
+                    )
+                self.assertTrue(buses)
+                # Windows overlap by the variant spread at block edges only.
+                self.assertLess(sum(summed), 1.1 * sum(bus.size for bus in buses), (mode, streaming))
+
+    def test_streaming_loudness_target_matches_in_memory(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            project = _project()
+            project.mix.target_lufs = -20.0
+            outputs = []
+            opened = mock.patch("affirmbeat.render.streaming.sf.SoundFile", wraps=sf.SoundFile)
+            for name, streaming in (("memory", False), ("stream", True)):
+                (root / name).mkdir()
+                with opened as soundfile:
+                    outputs.append(
+                        render_project(
+                            write_project(root / name / "project.json", project),
+                            streaming=streaming,
+                            block_sec=0.37,
+                        )
+                    )
+            # The premaster has no 4 GB limit.
+            premaster = [
+                call.kwargs.get("format")
+                for call in soundfile.call_args_list
+                if Path(call.args[0]).name == ".premaster.wav" and call.args[1:2] == ("w",)
+            ]
+            self.assertEqual(premaster, ["RF64"])
+
+            expected, _ = sf.read(outputs[0] / "final.wav", dtype="float32")
+            actual, _ = sf.read(outputs[1] / "final.wav", dtype="float32")
+            np.testing.assert_allclose(actual, expected, atol=2.0 / 32768)
+            self.assertFalse((outputs[1] / ".premaster.wav").exists())
+            report = json.loads((outputs[1] / "render_report.json").read_text())
+            self.assertEqual(report["loudness"]["target_lufs"], -20.0)
+            self.assertIn("streaming", report)
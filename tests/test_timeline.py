@@ -0,0 +1,119 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from affirmbeat.dsp.limiter import db_to_linear
+from affirmbeat.dsp.pan import apply_pan
+from affirmbeat.render.timeline import Clip, ClipTimeline, VoiceBus, place_clips
+
+
+def _clips() -> list[Clip]:
+    rng = np.random.default_rng(0)
+    clips = [
+        Clip(audio=rng.normal(size=500).astype(np.float32), start_sample=0, gain_db=-3.0, pan=-0.5, track="voice"),
+        Clip(audio=rng.normal(size=(40, 2)).astype(np.float32), start_sample=700, gain_db=0.0, pan=0.2, track="voice"),
+        Clip(audio=rng.normal(size=60).astype(np.float32), start_sample=120, gain_db=-6.0, pan=0.4, track="voice"),
+        Clip(audio=rng.normal(size=80).astype(np.float32), start_sample=950, gain_db=0.0, pan=0.0, track="whisper"),
+        Clip(audio=np.zeros(0, dtype=np.float32), start_sample=10, gain_db=0.0, pan=0.0, track="empty"),
+    ]
+    return clips
+
+
+def _dense(total_samples: int, clips: list[Clip]) -> dict[str, np.ndarray]:
+    tracks: dict[str, np.ndarray] = {}
+    for clip in clips:
+        if clip.audio.size == 0:
+            continue
+        start = max(0, clip.start_sample)
+        end = min(total_samples, start + clip.audio.shape[0])
+        if end <= start:
+            continue
+        buffer = tracks.setdefault(clip.track, np.zeros((total_samples, 2), dtype=np.float32))
+        timeline = ClipTimeline(total_samples, [clip])
+        buffer += timeline.render(clip.track, 0, total_samples)
+    return tracks
+
+
+class ClipTimelineTests(unittest.TestCase):
+    def test_windows_match_dense_placement(self) -> None:
+        total = 1_000
+        clips = _clips()
+        timeline = ClipTimeline(total, clips)
+        dense = _dense(total, clips)
+        self.assertEqual(timeline.tracks, ["voice", "whisper"])
+        for track, expected in dense.items():
+            for start, frames in [(0, 1_000), (100, 50), (450, 300), (990, 64)]:
+                window = timeline.render(track, start, frames)
+                np.testing.assert_allclose(window, expected[start : start + frames], atol=1e-6)
+        np.testing.assert_allclose(timeline.mixdown(), sum(dense.values()), atol=1e-6)
+        placed = place_clips(total, clips, 48_000)
+        self.assertEqual(list(placed), ["voice", "whisper"])
+
+    def test_long_clip_is_found_from_later_window(self) -> None:
+        timeline = ClipTimeline(1_000, _clips())
+        window = timeline.render("voice", 300, 10)
+        self.assertTrue(np.any(window != 0))
+        self.assertFalse(np.any(timeline.render("voice", 600, 50)))
+
+    def test_matches_pan_then_gain(self) -> None:
+        # The fused kernel against the original per-clip apply_pan and gain.
+        total = 200_000
+        rng = np.random.default_rng(3)
+        clips = [
+            Clip(audio=rng.normal(size=150_000).astype(np.float32), start_sample=10, gain_db=-4.0, pan=0.3, track="bed"),
+            Clip(audio=rng.normal(size=(90_000, 2)).astype(np.float32), start_sample=5_000, gain_db=2.0, pan=-0.7, track="bed"),
+        ]
+        expected = np.zeros((total, 2), dtype=np.float32)
+        for clip in clips:
+            end = clip.start_sample + clip.audio.shape[0]
+            expected[clip.start_sample : end] += apply_pan(clip.audio, clip.pan) * db_to_linear(clip.gain_db)
+        rendered = ClipTimeline(total, clips).render("bed", 0, total)
+        self.assertEqual(rendered.dtype, np.float32)
+        np.testing.assert_allclose(rendered, expected, rtol=1e-6, atol=1e-6)
+
+    def test_placement_does_not_allocate_per_clip(self) -> None:
+        total = 48_000
+        audio = np.ones(20_000, dtype=np.float32)
+        clips = [
+            Clip(audio=audio, start_sample=(i * 37) % (total - 20_000), gain_db=-6.0, pan=0.1, track="voice")
+            for i in range(200)
+        ]
+        timeline = ClipTimeline(total, clips)
+        timeline.render("voice", 0, total)
+        tracemalloc.start()
+        try:
+            timeline.render("voice", 0, total)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # The output window plus ufunc buffers; no per-clip stereo copies.
+        self.assertLess(peak, total * 2 * 4 + 128 * 1024)
+
+    def test_voice_bus_variants_match_per_utterance_clips(self) -> None:
+        rng = np.random.default_rng(4)
+        total = 5_000
+        utterances = [(0, 700), (900, 400), (1_500, 1_200), (3_000, 900), (4_200, 1_000)]
+        audio = [(start, rng.normal(size=length).astype(np.float32)) for start, length in utterances]
+        variants = [(-0.6, -2.0, 0, "voice"), (0.0, 0.0, 30, "voice"), (0.4, -10.0, 60, "whisper")]
+        per_clip = [
+            Clip(audio=samples, start_sample=200 + start + offset, gain_db=gain, pan=pan, track=track)
+            for start, samples in audio
+            for pan, gain, offset, track in variants
+        ]
+        bus = VoiceBus(total - 200, audio, reach=60)
+        bused = [
+            Clip(audio=bus, start_sample=200 + offset, gain_db=gain, pan=pan, track=track)
+            for pan, gain, offset, track in variants
+        ]
+        expected = ClipTimeline(total, per_clip)
+        actual = ClipTimeline(total, bused)
+        self.assertEqual(actual.tracks, expected.tracks)
+        for track in expected.tracks:
+            for block in (total, 333):
+                for start in range(0, total, block):
+                    np.testing.assert_allclose(
+                        actual.render(track, start, block),
+                        expected.render(track, start, block),
+                        atol=1e-6,
+                    )
@@ -0,0 +1,94 @@
+import json
+import tempfile
+import threading
+import unittest
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from affirmbeat.core.project import Affirmation, MusicConfig, Project, TTSConfig
+from affirmbeat.render.renderer import render_project
+from affirmbeat.render.timing import Profiler, span
+
+
+class ProfilerTests(unittest.TestCase):
+    def test_spans_aggregate_by_name(self) -> None:
+        profiler = Profiler()
+        for _ in range(3):
+            with profiler.span("work", 10):
+                pass
+        with profiler.span("count") as record:
+            record.samples = 7
+        source = profiler.source("source", lambda start, frames: np.zeros((frames, 2), np.float32))
+        source(0, 5)
+        source(5, 4)
+        summary = profiler.summary()
+        self.assertEqual(summary["work"]["calls"], 3)
+        self.assertEqual(summary["work"]["samples"], 30)
+        self.assertEqual(summary["count"]["samples"], 7)
+        self.assertEqual(summary["source"]["samples"], 9)
+        self.assertNotIn("peak_memory_bytes", summary["work"])
+        with span(None, "ignored") as record:
+            record.samples = 1
+
+    def test_memory_peak_includes_nested_spans(self) -> None:
+        with Profiler(memory=True) as profiler:
+            with profiler.span("outer"):
+                with profiler.span("inner"):
+                    block = np.ones(1_000_000, dtype=np.float64)
+                    del block
+                with profiler.span("after"):
+                    pass
+        summary = profiler.summary()
+        self.assertGreaterEqual(summary["inner"]["peak_memory_bytes"], 8_000_000)
+        self.assertGreaterEqual(summary["outer"]["peak_memory_bytes"], 8_000_000)
+        self.assertLess(summary["after"]["peak_memory_bytes"], 1_000_000)
+
+    def test_trace_formats(self) -> None:
+        profiler = Profiler(trace=True)
+
+        def work() -> None:
+            with profiler.span("worker"):
+                pass
+
+        with profiler.span("main"):
+            worker = threading.Thread(target=work)
+            worker.start()
+            worker.join()
+            with profiler.span("child", 3):
+                pass
+        with tempfile.TemporaryDirectory() as td:
+            chrome = Path(td) / "trace.json"
+            profiler.write_trace(chrome, "chrome")
+            events = json.loads(chrome.read_text())["traceEvents"]
+            self.assertEqual([event["name"] for event in events], ["worker", "child", "main"])
+            self.assertTrue(all(event["ph"] == "X" for event in events))
+            self.assertNotEqual(events[0]["tid"], events[2]["tid"])
+            self.assertEqual(events[1]["args"]["samples"], 3)
+
+            lines = Path(td) / "trace.jsonl"
+            profiler.write_trace(lines, "jsonl")
+            rows = [json.loads(line) for line in lines.read_text().splitlines()]
+            self.assertEqual(len(rows), 3)
+            self.assertGreaterEqual(rows[2]["wall_sec"], rows[1]["wall_sec"])
+
+    def test_render_writes_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            project = Project(
+                project_id=str(uuid.uuid4()),
+                sample_rate=16_000,
+                duration_sec=1,
+                affirmations=[Affirmation(id="a1", text="I am calm.")],
+                tts=TTSConfig(provider="dummy"),
+                music=MusicConfig(provider="placeholder", chunk_sec=1, crossfade_ms=0),
+            )
+            project_path = root / "project.json"
+            project_path.write_text(json.dumps(project.model_dump()), encoding="utf-8")
+            output = render_project(project_path, profile_memory=True, trace="chrome")
+            report = json.loads((output / "render_report.json").read_text())
+            self.assertEqual(report["trace"], "render_trace.json")
+            self.assertIn("peak_memory_bytes", report["timings"]["render"])
+            events = json.loads((output / "render_trace.json").read_text())["traceEvents"]
+            self.assertIn("tts.synthesize", {event["name"] for event in events})
@@ -0,0 +1,106 @@
+import json
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from affirmbeat.core.project import Affirmation, MusicConfig, Project, TTSConfig
+from affirmbeat.providers.tts_espeak import EspeakTTSProvider
+from affirmbeat.render.renderer import render_project
+
+_FAKE_ESPEAK = textwrap.dedent(
+    """
+    #!{python}
+    import os
+    import re
+    import sys
+
+    import numpy as np
+    import soundfile as sf
+
+    args = sys.argv[1:]
+    with open(os.environ["FAKE_ESPEAK_LOG"], "a") as log:
+        log.write("start\\n")
+    output = args[args.index("-w") + 1]
+    if "--stdin" in args:
+        document = sys.stdin.read()
+        body = re.sub(r"</?speak>", "", document)
+        lines = re.split(r'<break time="2000ms"/>', body)
+    else:
+        lines = [args[-1]]
+    pieces = []
+    for idx, line in enumerate(lines):
+        if idx:
+            pieces.append(np.zeros(44_100, dtype=np.float32))
+        pieces.append(np.full(len(line) * 100, 0.2, dtype=np.float32))
+    sf.write(output, np.concatenate(pieces), 22_050)
+    """
+).lstrip()
+
+
+class EspeakBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        script = root / "espeak"
+        script.write_text(_FAKE_ESPEAK.format(python=sys.executable))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        self.log = root / "log.txt"
+        self.env = mock.patch.dict(
+            os.environ,
+            {"PATH": f"{root}{os.pathsep}{os.environ['PATH']}", "FAKE_ESPEAK_LOG": str(self.log)},
+        )
+        self.env.start()
+
+    def tearDown(self) -> None:
+        self.env.stop()
+        self._tmp.cleanup()
+
+    def test_batch_uses_one_process_and_splits_lines(self) -> None:
+        provider = EspeakTTSProvider(22_050)
+        texts = ["I am calm.", "I rest & recover.", "Peace."]
+        audios = provider.synthesize_many(texts, None, {"rate": 1.0})
+        self.assertEqual(self.log.read_text().count("start"), 1)
+        self.assertEqual(len(audios), 3)
+        pad = int(0.05 * 22_050)
+        self.assertEqual(audios[0].shape[0], len(texts[0]) * 100 + 2 * pad)
+        self.assertEqual(audios[1].shape[0], len("I rest &amp; recover.") * 100 + 2 * pad)
+        self.assertEqual(audios[2].shape[0], len(texts[2]) * 100 + 2 * pad)
+
+    def test_single_lines_match_batched_lines(self) -> None:
+        provider = EspeakTTSProvider(22_050)
+        texts = ["I am calm.", "Peace."]
+        batched = provider.synthesize_many(texts, None, {"rate": 1.0})
+        for text, audio in zip(texts, batched):
+            np.testing.assert_array_equal(provider.synthesize(text, None, {"rate": 1.0}), audio)
+
+    def test_batch_resamples_once(self) -> None:
+        provider = EspeakTTSProvider(44_100)
+        audios = provider.synthesize_many(["One.", "Two two."], None, {"rate": 1.0})
+        self.assertEqual(self.log.read_text().count("start"), 1)
+        # Resampler ringing around the hard edges of the fake speech is kept.
+        self.assertAlmostEqual(audios[1].shape[0], 800 * 2 + 2 * int(0.05 * 44_100), delta=32)
+
+    def test_renderer_batches_cache_misses(self) -> None:
+        project = Project(
+            project_id="espeak-batch",
+            sample_rate=22_050,
+            duration_sec=2,
+            affirmations=[Affirmation(id=f"a{i}", text=f"Line {i}.") for i in range(5)],
+            tts=TTSConfig(provider="espeak"),
+            music=MusicConfig(provider="placeholder", chunk_sec=1, crossfade_ms=0),
+        )
+        project.binaural.enabled = False
+        project_path = Path(self._tmp.name) / "project.json"
+        project_path.write_text(json.dumps(project.model_dump()))
+        output_dir = render_project(project_path, tts_workers=1)
+        report = json.loads((output_dir / "render_report.json").read_text())
+        self.assertEqual(self.log.read_text().count("start"), 1)
+        self.assertEqual(len(report["tts_generated"]), 5)
+        self.assertTrue(all(job["batch_size"] == 5 for job in report["tts_jobs"]))
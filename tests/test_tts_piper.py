@@ -0,0 +1,76 @@
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from affirmbeat.providers import tts_piper1
+from affirmbeat.providers.tts_piper1 import PiperTTSProvider, shutdown_piper_workers
+
+_FAKE_PIPER = textwrap.dedent(
+    """
+    #!{python}
+    import json
+    import os
+    import sys
+
+    import numpy as np
+    import soundfile as sf
+
+    args = sys.argv[1:]
+    with open(os.environ["FAKE_PIPER_LOG"], "a") as log:
+        log.write("start\\n")
+
+    def write(path, text):
+        audio = np.full(len(text) * 10, 0.1, dtype=np.float32)
+        sf.write(path, audio, 22050)
+
+    if "--json-input" in args:
+        for line in sys.stdin:
+            request = json.loads(line)
+            write(request["output_file"], request["text"])
+            print(request["output_file"], flush=True)
+    else:
+        write(args[args.index("--output_file") + 1], sys.stdin.read())
+    """
+).lstrip()
+
+
+class PiperProviderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        script = root / "piper"
+        script.write_text(_FAKE_PIPER.format(python=sys.executable))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        self.log = root / "log.txt"
+        self.env = mock.patch.dict(
+            os.environ,
+            {"PATH": f"{root}{os.pathsep}{os.environ['PATH']}", "FAKE_PIPER_LOG": str(self.log)},
+        )
+        self.env.start()
+        self.no_bindings = mock.patch.object(tts_piper1, "_load_piper_voice", return_value=None)
+        self.no_bindings.start()
+
+    def tearDown(self) -> None:
+        shutdown_piper_workers()
+        self.no_bindings.stop()
+        self.env.stop()
+        self._tmp.cleanup()
+
+    def test_server_mode_reuses_one_process(self) -> None:
+        provider = PiperTTSProvider(22050, "voice.onnx", backend="server")
+        first = provider.synthesize("I am calm.", None, {"rate": 1.0})
+        second = provider.synthesize("I rest.", None, {"rate": 1.0})
+        self.assertEqual(first.shape[0], 100)
+        self.assertEqual(second.shape[0], 70)
+        self.assertEqual(self.log.read_text().count("start"), 1)
+
+    def test_subprocess_backend_spawns_per_line(self) -> None:
+        provider = PiperTTSProvider(22050, "voice.onnx", backend="subprocess")
+        provider.synthesize("I am calm.", None, {"rate": 1.0})
+        provider.synthesize("I rest.", None, {"rate": 1.0})
+        self.assertEqual(self.log.read_text().count("start"), 2)